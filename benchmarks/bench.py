@@ -0,0 +1,312 @@
+"""
+Benchmarks of the board primitives, the searches and whole games.
+
+Every benchmark reports the time of one operation (the best of several
+repeats, so background noise only makes a run slower), the operations
+per second and the peak memory allocated while it runs. The searches also
+report the positions searched (nodes) and nodes per second.
+
+Save a run, then compare later runs against it:
+
+    python -m benchmarks.bench --output baseline.json
+    python -m benchmarks.bench --output current.json --compare baseline.json --threshold 0.25
+
+The comparison exits with status 1 if a metric got worse by more than the
+threshold (25% here): "seconds" and "peak_memory_kb" may not grow, the
+"..._per_second" metrics may not shrink.
+"""
+
+# File: bench.py
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Callable, Union
+
+# The searches log a debug message per move, which would be benchmarked too
+# (it must be set before the src modules are imported)
+os.environ.setdefault("LOG_LEVEL", "INFO")
+
+from src.ai_player import AIPlayer
+from src.bit_board import BitBoard
+from src.game_board import GameBoard
+from src.game_controller import GameController
+from src.logger import configure_logging, getLogger
+from src.player import Player
+from src.self_play import STRATEGIES
+
+log = getLogger(__name__)
+
+# Positions the searches start from, row-major, "." for an empty cell. The
+# player to move is O if X has more symbols, X otherwise.
+SEARCH_POSITIONS = {
+    "empty": ".........",
+    # Every first move
+    **{f"first_{cell}": "." * cell + "X" + "." * (8 - cell) for cell in range(9)},
+    "midgame_fork": "X...O...X",
+    "midgame_block": "XX..O....",
+    "midgame_corner": "X.O.X....",
+    "midgame_late": "OXO.X...X",
+}
+
+# Metrics where a higher value is better, for the others lower is better
+HIGHER_IS_BETTER = ("ops_per_second", "nodes_per_second")
+
+
+def board_from_string(position: str, board_class: type = BitBoard) -> GameBoard:
+    """
+    Build a 3x3 board from a row-major string like "X...O....".
+
+    Parameters:
+        position (str): The cells, "X", "O" or ".".
+        board_class (type): GameBoard or one of its subclasses.
+
+    Returns:
+        GameBoard: The board.
+    """
+
+    board = board_class()
+    for cell, symbol in enumerate(position):
+        if symbol != ".":
+            board.make_move(cell // 3, cell % 3, symbol)
+    return board
+
+
+def measure(operation: Callable[[], object], number: int, repeat: int) -> dict:
+    """
+    Time an operation and measure the memory it allocates.
+
+    Parameters:
+        operation (Callable): The operation, called without arguments.
+        number (int): Calls per timing.
+        repeat (int): Timings, the best one is kept.
+
+    Returns:
+        dict: seconds (per call), ops_per_second and peak_memory_kb.
+    """
+
+    seconds = min(timeit.repeat(operation, number=number, repeat=repeat)) / number
+
+    # Measured apart, tracemalloc slows every allocation down
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": seconds, "ops_per_second": 1 / seconds, "peak_memory_kb": peak / 1024}
+
+
+def count_nodes(strategy, board: GameBoard, player: Player) -> Union[int, None]:
+    """
+    Count the positions a search visits, from its search report.
+
+    Parameters:
+        strategy (MoveStrategy): A fresh strategy.
+        board (GameBoard): The position.
+        player (Player): The player to move.
+
+    Returns:
+        Union[int, None]: The number of positions visited, None for a strategy
+            that doesn't report its searches (e.g. the tablebase).
+    """
+
+    strategy.collect_report = True
+    strategy.find_best_move(board, player)
+    report = strategy.last_report
+    return report.nodes if report is not None else None
+
+
+def bench_board(results: dict, number: int, repeat: int) -> None:
+    """
+    Benchmark the board primitives of GameBoard and BitBoard.
+    """
+
+    for board_class in (GameBoard, BitBoard):
+        name = board_class.__name__
+        board = board_from_string("XO..X.O..", board_class)
+
+        def make_and_undo():
+            board.make_move(2, 2, "X")
+            board.unmake_move()
+
+        operations = {
+            "make_move+unmake_move": make_and_undo,
+            "is_winner": lambda: board.is_winner("X"),
+            "is_full": board.is_full,
+            "get_empty_cells": board.get_empty_cells,
+            "__str__": board.__str__,
+        }
+
+        for operation_name, operation in operations.items():
+            results[f"board/{name}/{operation_name}"] = measure(operation, number, repeat)
+
+
+def bench_search(results: dict, strategies: list[str], repeat: int) -> None:
+    """
+    Benchmark find_best_move from every search position, each time with a
+    fresh strategy so nothing is found in a warm transposition table.
+    """
+
+    for strategy_name in strategies:
+        for position_name, position in SEARCH_POSITIONS.items():
+            player = Player("O" if position.count("X") > position.count("O") else "X")
+
+            def search():
+                STRATEGIES[strategy_name]().find_best_move(board_from_string(position), player)
+
+            result = measure(search, 1, repeat)
+            nodes = count_nodes(STRATEGIES[strategy_name](), board_from_string(position), player)
+            if nodes is not None:
+                result["nodes"] = nodes
+                result["nodes_per_second"] = nodes / result["seconds"]
+            results[f"search/{strategy_name}/{position_name}"] = result
+
+
+def bench_games(results: dict, strategies: list[str], games: int, repeat: int) -> None:
+    """
+    Benchmark whole AI-vs-AI games run through a GameController, a game at a
+    time, each with fresh strategies so every timing starts from cold tables.
+    """
+
+    for strategy_name in strategies:
+        # The moves of every game played, games can end before the board is full
+        moves_played = []
+
+        def play():
+            x_player = AIPlayer("X", STRATEGIES[strategy_name]())
+            o_player = AIPlayer("O", STRATEGIES[strategy_name]())
+            controller = GameController(x_player, o_player, BitBoard())
+            while True:
+                row, col = controller.current_player.find_best_move(controller.board, controller.time_limit)
+                controller.board.make_move(row, col, controller.current_player.symbol)
+                if controller.check_game_over()[0]:
+                    moves_played.append(controller.board.move_count)
+                    return
+                controller.switch_player()
+
+        result = measure(play, games, repeat)
+        result["moves_per_game"] = sum(moves_played) / len(moves_played)
+        result["seconds_per_move"] = result["seconds"] / result["moves_per_game"]
+        results[f"game/{strategy_name}"] = result
+
+
+def compare(results: dict, baseline: dict, metrics: list[str], threshold: float) -> list[str]:
+    """
+    Compare a run against a saved run.
+
+    Parameters:
+        results (dict): The benchmarks of this run.
+        baseline (dict): The benchmarks of the saved run.
+        metrics (list[str]): The metrics to compare.
+        threshold (float): The allowed relative change, 0.25 for 25%.
+
+    Returns:
+        list[str]: A message for every regression, empty if there is none.
+    """
+
+    regressions = []
+
+    for name, before in baseline.items():
+        after = results.get(name)
+        if after is None:
+            continue
+
+        for metric in metrics:
+            if metric not in before or metric not in after or before[metric] == 0:
+                continue
+
+            change = (after[metric] - before[metric]) / before[metric]
+            # Turns the change into "how much worse", whichever way is better
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > threshold:
+                regressions.append(f"{name} {metric}: {before[metric]:.4g} -> {after[metric]:.4g} "
+                                   f"({worse:+.0%} worse)")
+
+    return regressions
+
+
+def run(groups: list[str], strategies: list[str], number: int, repeat: int, games: int) -> dict:
+    """
+    Run the benchmark groups.
+
+    Parameters:
+        groups (list[str]): "board", "search" and/or "game".
+        strategies (list[str]): The strategies of the search and game benchmarks.
+        number (int): Calls per timing of the board primitives.
+        repeat (int): Timings per benchmark, the best one is kept.
+        games (int): Games per timing of the game benchmarks.
+
+    Returns:
+        dict: The report: "meta" about the run, and "results" of each benchmark.
+    """
+
+    results = {}
+
+    if "board" in groups:
+        bench_board(results, number, repeat)
+    if "search" in groups:
+        bench_search(results, strategies, repeat)
+    if "game" in groups:
+        bench_games(results, strategies, games, repeat)
+
+    return {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "number": number,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the board, the searches and whole games.")
+    parser.add_argument("--groups", nargs="+", default=["board", "search", "game"],
+                        choices=["board", "search", "game"], help="benchmark groups to run")
+    parser.add_argument("--strategies", nargs="+", default=["minimax", "alphabeta"], choices=sorted(STRATEGIES),
+                        help="strategies of the search and game benchmarks")
+    parser.add_argument("--number", type=int, default=10000, help="calls per timing of the board primitives")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per benchmark, the best is kept")
+    parser.add_argument("--games", type=int, default=3, help="games per timing of the game benchmarks")
+    parser.add_argument("--output", help="JSON file to save the results to")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--metrics", nargs="+", default=["seconds"], help="metrics compared with --compare")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args()
+
+    configure_logging(log_to_file=False)
+
+    report = run(args.groups, args.strategies, args.number, args.repeat, args.games)
+
+    for name, result in report["results"].items():
+        nodes = f", {result['nodes_per_second']:,.0f} nodes/s" if "nodes" in result else ""
+        log.info(f"{name:<45} {result['seconds'] * 1e6:12.2f} us{nodes}, {result['peak_memory_kb']:.1f} KiB")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        log.info(f"Saved the results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+
+        regressions = compare(report["results"], baseline, args.metrics, args.threshold)
+        for regression in regressions:
+            log.error(f"Regression: {regression}")
+        if regressions:
+            return 1
+        log.info(f"No regression beyond {args.threshold:.0%} against {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
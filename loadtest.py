@@ -0,0 +1,33 @@
+# File: loadtest.py
+import argparse
+import asyncio
+import os
+
+os.environ.setdefault("LOG_LEVEL", "INFO")
+
+from src.load_client import run_load
+from src.logger import configure_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many games against the game server and report the move latency.")
+    parser.add_argument("--host", default="127.0.0.1", help="server address")
+    parser.add_argument("--port", type=int, default=8765, help="server port")
+    parser.add_argument("--clients", type=int, default=100, help="connections playing at once")
+    parser.add_argument("--games", type=int, default=10, help="games per connection")
+    parser.add_argument("--size", type=int, default=3, help="rows (and columns) of the board")
+    parser.add_argument("--win-length", type=int, default=None, help="symbols in a row needed to win (default: size)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random moves")
+    args = parser.parse_args()
+
+    configure_logging(log_to_file=False)
+
+    result = asyncio.run(run_load(args.host, args.port, args.clients, args.games, args.size, args.win_length, args.seed))
+
+    print(f"{result['games']} games, {result['moves']} moves in {result['elapsed']:.2f}s "
+          f"({result['moves_per_second']:.0f} moves/s), {result['errors']} errors ({result['busy']} busy)")
+    print(f"move latency: p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,61 @@
 # File: main.py
-from src.game_board import GameBoard
+import argparse
+import os
+
+from src.bit_board import BitBoard
 from src.human_player import HumanPlayer
 from src.ai_player import AIPlayer
+from src.logger import configure_logging
+from src.mcts_strategy import MCTSStrategy
 from src.minimax_strategy import MinimaxStrategy
 from src.game_controller import GameController
-from src.gui import TicTacToeGUI
+from src.game_record import GameRecordWriter
+from src.search_cache import SearchCache
 
 
 def main():
-    board = GameBoard()
+    parser = argparse.ArgumentParser(description="Play Tic-Tac-Toe against the AI.")
+    parser.add_argument("--size", type=int, default=3, help="rows (and columns) of the board")
+    parser.add_argument("--win-length", type=int, default=None, help="symbols in a row needed to win (default: size)")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds the AI may think per move (default: no limit)")
+    parser.add_argument("--strategy", choices=["minimax", "mcts"], default="minimax",
+                        help="how the AI picks its moves, mcts for boards too big to search to the end")
+    parser.add_argument("--record", default=None, help="game record file to append the games to")
+    parser.add_argument("--cache-dir", default=None, help="directory of the minimax search cache, kept for the next runs")
+    parser.add_argument("--search-report", action="store_true", help="log how much work the AI searches did after each game")
+    args = parser.parse_args()
+
+    configure_logging()
+
+    # Qt is only loaded once the window is really wanted
+    from src.gui import TicTacToeGUI
+
+    board = BitBoard(args.size, args.win_length)
     human = HumanPlayer("X")
-    ai = AIPlayer("O", MinimaxStrategy())
-    controller = GameController(human, ai, board)
+    cache = None
+    if args.strategy == "mcts":
+        strategy = MCTSStrategy(collect_report=args.search_report)
+    else:
+        if args.cache_dir is not None:
+            cache = SearchCache(os.path.join(args.cache_dir, f"minimax-{board.size}x{board.size}-{board.win_length}.cache"))
+        strategy = MinimaxStrategy(transposition_table=cache, collect_report=args.search_report)
+    ai = AIPlayer("O", strategy)
+    controller = GameController(human, ai, board, args.time_limit)
+
+    recorder = None
+    if args.record is not None:
+        recorder = GameRecordWriter(args.record, board.size, board.win_length, "human", type(strategy).__name__)
+        controller.attach_recorder(recorder)
+
     gui = TicTacToeGUI(controller)
-    gui.run()
+    try:
+        gui.run()
+    finally:
+        # An unfinished game is closed as such, so the file stays readable
+        if recorder is not None:
+            recorder.close()
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+# File: selfplay.py
+import argparse
+import os
+
+# Self-play runs millions of searches, so the per-move debug messages are off
+# unless LOG_LEVEL is set (it must be set before the src modules are imported)
+os.environ.setdefault("LOG_LEVEL", "INFO")
+
+from src.logger import configure_logging
+from src.self_play import STRATEGIES, run_self_play
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI games without the GUI and save them.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--x", default="alphabeta",
+                        help=f"strategy of X: {', '.join(STRATEGIES)} or package.module:ClassName")
+    parser.add_argument("--o", default="alphabeta", help="strategy of O, like --x")
+    parser.add_argument("--size", type=int, default=3, help="rows (and columns) of the board")
+    parser.add_argument("--win-length", type=int, default=None, help="symbols in a row needed to win (default: size)")
+    parser.add_argument("--random-plies", type=int, default=0, help="opening moves played at random")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per move (default: no limit)")
+    parser.add_argument("--workers", type=int, default=None, help="processes to use (default: number of CPUs)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random openings")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="games per task sent to a process")
+    parser.add_argument("--output", default="selfplay.rec", help="game record file to append to")
+    args = parser.parse_args()
+
+    # Only the console, a batch job doesn't need a log file per run
+    configure_logging(log_to_file=False)
+
+    run_self_play(args.output, args.games, args.x, args.o, args.size, args.win_length,
+                  args.random_plies, args.time_limit, args.workers, args.seed, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# File: server.py
+import argparse
+import asyncio
+import os
+
+# A busy server makes thousands of searches, so the per-move debug messages
+# are off unless LOG_LEVEL is set (it must be set before the src modules are imported)
+os.environ.setdefault("LOG_LEVEL", "INFO")
+
+from src.game_server import GameServer
+from src.logger import configure_logging
+from src.self_play import STRATEGIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve games over TCP with a line-delimited JSON protocol.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--strategy", default="alphabeta", choices=list(STRATEGIES), help="strategy of the AI")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per AI move (default: no limit, minimax and alphabeta then only play 3x3)")
+    parser.add_argument("--max-sessions", type=int, default=10000, help="sessions open at once")
+    parser.add_argument("--workers", type=int, default=None, help="AI searches at once (default: number of CPUs)")
+    parser.add_argument("--max-queue", type=int, default=1000, help="AI searches waiting for a worker")
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="seconds before an idle connection is closed")
+    parser.add_argument("--cache-dir", default=None, help="directory of the search cache files, kept across restarts")
+    parser.add_argument("--cache-mb", type=int, default=64, help="size of the search cache of each board variant in MiB")
+    parser.add_argument("--tree-nodes", type=int, default=10000, help="positions in the MCTS tree of each session")
+    args = parser.parse_args()
+
+    configure_logging()
+
+    server = GameServer(args.host, args.port, args.strategy, args.time_limit, args.max_sessions,
+                        args.workers, args.max_queue, args.idle_timeout,
+                        args.cache_dir, args.cache_mb << 20, args.tree_nodes)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
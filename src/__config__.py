@@ -11,10 +11,21 @@ import time
 LOG_DIR = os.path.join(os.path.dirname(__file__), "..", "logs")
 LOG_FILE = f'{LOG_DIR}/TicTacToe_{time.strftime("%Y%m%d%H%M%S")}.log'
 
+# --------------------------------------------------------------
+# Search tracing
+# TRACE is a log level below DEBUG, used for the per-position messages of
+# the AI searches. It is switched on separately from the game logging:
+#   SEARCH_TRACE=1 python main.py
+# --------------------------------------------------------------
+TRACE = 5
+SEARCH_TRACE = os.getenv("SEARCH_TRACE", "0") == "1"
+SEARCH_LOG_LEVEL = TRACE if SEARCH_TRACE else os.getenv("LOG_LEVEL", "DEBUG")
+
 # --------------------------------------------------------------
 # Define log colors
 log_colors_config = {
     "RESET": "reset",
+    "TRACE": "blue",
     "DEBUG": "cyan",
     "INFO": "green",
     "WARNING": "yellow",
@@ -45,7 +56,7 @@ log_config = {
     "handlers": {
         "stream": {
             "class": "colorlog.StreamHandler",
-            "level": "DEBUG",
+            "level": TRACE,
             "formatter": "colored",
         },
         "file_handler": {
@@ -57,7 +68,7 @@ log_config = {
             "encoding": "utf-8",
             "delay": False,
             "utc": False,
-            "level": "DEBUG",
+            "level": TRACE,
             "formatter": "standard",
         },
     },
@@ -65,4 +76,10 @@ log_config = {
         "handlers": ["stream", "file_handler"],
         "level": "DEBUG",
     },
-}
\ No newline at end of file
+}
+
+# --------------------------------------------------------------
+# Precomputed perfect-play table (build it with: python -m src.tablebase)
+# --------------------------------------------------------------
+TABLEBASE_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+TABLEBASE_FILE = f"{TABLEBASE_DIR}/tictactoe_3x3.tb"
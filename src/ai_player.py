@@ -1,5 +1,5 @@
 # File: ai_player.py
-from typing import overload
+from typing import overload, Union
 
 from src.game_board import GameBoard
 from src.player import Player
@@ -28,15 +28,16 @@ class AIPlayer(Player):
         super().__init__(symbol)
         self.strategy = strategy
 
-    def find_best_move(self, board: GameBoard) -> tuple[int, int]:
+    def find_best_move(self, board: GameBoard, time_limit: Union[float, None] = None) -> tuple[int, int]:
         """
         Use the strategy to pick and make a move.
 
         Parameters:
             board (GameBoard): The game board instance.
+            time_limit (float): The time budget in seconds, None for no limit.
 
         Returns:
             tuple[int, int]: (row, col) of the chosen move.
         """
 
-        return self.strategy.find_best_move(board, self)
+        return self.strategy.find_best_move(board, self, time_limit)
@@ -0,0 +1,84 @@
+# File: ai_search_worker.py
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from src.game_controller import GameController
+from src.logger import getLogger
+from src.move_strategy import SearchCancelled
+
+log = getLogger(__name__)
+
+
+class AISearchWorker(QThread):
+    """
+    Finds the AI move in a background thread, so the window keeps responding
+    while the AI thinks.
+
+    The search runs on a copy of the board. The result is posted back to the
+    GUI thread with the move_found signal, tagged with the search id, so the
+    GUI can drop the answer of a search it has given up on.
+
+    Example:
+    ========
+    >>> worker = AISearchWorker(controller, search_id=1)
+    >>> worker.move_found.connect(self.ai_move_found)
+    >>> worker.start()
+    >>> # On reset or close
+    >>> worker.cancel()
+    >>> worker.wait()
+    """
+
+    # (search id, row, col) of the AI move
+    move_found = pyqtSignal(int, int, int)
+
+    # (search id, error message) if the search failed
+    search_failed = pyqtSignal(int, str)
+
+    def __init__(self, controller: GameController, search_id: int):
+        """
+        Prepare a search of the current position.
+
+        Parameters:
+            controller (GameController): The game controller instance.
+            search_id (int): Sent back with the result.
+        """
+
+        super().__init__()
+        self.controller = controller
+        self.search_id = search_id
+
+        # Copied in the GUI thread, before the search starts
+        self.board = controller.board.copy()
+
+        # The search report of the move, if the strategy makes one
+        self.report = None
+
+        # Clears any earlier cancel, in the GUI thread, so a cancel() made
+        # before the thread runs is not lost
+        self.controller.ai.strategy.reset_cancel()
+
+    def run(self) -> None:
+        """
+        Search the move, this runs in the worker thread.
+        """
+
+        try:
+            row, col = self.controller.ai.find_best_move(self.board, self.controller.time_limit)
+            self.report = self.controller.ai.strategy.last_report
+
+        # The GUI asked the search to stop, nothing is sent back
+        except SearchCancelled:
+            log.debug(f"AI search {self.search_id} cancelled")
+            return None
+
+        except Exception as e:
+            log.exception(f"AI search {self.search_id} failed")
+            self.search_failed.emit(self.search_id, str(e))
+            return None
+
+        self.move_found.emit(self.search_id, row, col)
+
+    def cancel(self) -> None:
+        """
+        Ask the search to stop as soon as possible.
+        """
+        self.controller.ai.strategy.cancel()
@@ -0,0 +1,291 @@
+"""
+Alpha-beta pruning gives the same result as Minimax while skipping branches
+that cannot change the result.
+
+alpha: the best score the maximizing player is already sure of.
+beta:  the best score the minimizing player is already sure of.
+
+alphabeta(board, depth, is_maximizing, alpha, beta):
+    if the game is over:
+        return the Minimax score
+
+    if is_maximizing:
+        for each empty cell (most promising first):
+            score = alphabeta(child, depth + 1, false, alpha, beta)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break       # The minimizing player will never allow this line
+    else:
+        for each empty cell (most promising first):
+            score = alphabeta(child, depth + 1, true, alpha, beta)
+            beta = min(beta, score)
+            if alpha >= beta:
+                break       # The maximizing player will never allow this line
+
+Trying the best moves first (winning moves, blocks, the centre, the corners)
+makes the cutoffs happen as early as possible.
+"""
+
+# File: alpha_beta_strategy.py
+import time
+from functools import lru_cache
+from typing import Union
+
+from src.evaluation import LineEvaluation
+from src.game_board import GameBoard, cell_coordinates
+from src.minimax_strategy import MinimaxStrategy
+from src.move_strategy import SearchCancelled, SearchTimeout
+from src.player import Player
+from src.tactics import line_masks, mask_cells, symbol_mask, winning_mask
+from src.__config__ import SEARCH_LOG_LEVEL, TRACE
+from src.logger import getLogger
+from src.transposition_table import EXACT, LOWER_BOUND, UPPER_BOUND
+
+# The search logs per-position messages at TRACE level, see SEARCH_TRACE in __config__
+log = getLogger(__name__, SEARCH_LOG_LEVEL)
+
+# Move ordering priorities
+WIN_PRIORITY = 4
+BLOCK_PRIORITY = 3
+CENTRE_PRIORITY = 2
+CORNER_PRIORITY = 1
+
+
+@lru_cache(maxsize=None)
+def static_order(size: int) -> tuple[int, ...]:
+    """
+    Return the cell indexes of a board by their priority without wins or blocks.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board.
+
+    Returns:
+        tuple[int, ...]: The centre cells (the four centre cells on an even board),
+            then the corners, then the other cells, each group in row-major order.
+    """
+
+    last = size - 1
+    middle = (last // 2, (last + 1) // 2)
+
+    def priority(index: int) -> int:
+        row, col = divmod(index, size)
+        if row in middle and col in middle:
+            return CENTRE_PRIORITY
+        if row in (0, last) and col in (0, last):
+            return CORNER_PRIORITY
+        return 0
+
+    # sorted() is stable, so cells with the same priority keep their order
+    return tuple(sorted(range(size * size), key=priority, reverse=True))
+
+
+class AlphaBetaStrategy(MinimaxStrategy):
+    """
+    Implements Minimax with alpha-beta pruning and move ordering.
+
+    It scores positions exactly like MinimaxStrategy and picks exactly the
+    same moves, it just searches far fewer positions to find them.
+
+    Example:
+    ========
+    >>> from src.alpha_beta_strategy import AlphaBetaStrategy
+    >>> ai = AIPlayer("O", AlphaBetaStrategy())
+    """
+
+    def _score_root_move(self,
+                         board: GameBoard,
+                         player: Player,
+                         opponent: Player,
+                         bound: float,
+                         max_depth: Union[int, None]) -> int:
+        """
+        Score the position after a move of the AI player with alpha-beta.
+
+        Only scores below the bound can change the best move, so the bound is
+        the beta of the search. A score at or above it is only a lower bound.
+
+        Parameters:
+            board (GameBoard): The board, with the move made.
+            player (Player): The AI player (minimizing).
+            opponent (Player): The human player (maximizing).
+            bound (float): The best score so far (plus one if this move wins ties).
+            max_depth (int): Stop searching this many moves below the root, None to search to the end.
+
+        Returns:
+            int: The score of the move, exact if it is below the bound.
+        """
+        return self.alphabeta(board, 0, True, player, opponent, -float("inf"), bound, max_depth)[0]
+
+    def alphabeta(self,
+                  board: GameBoard,
+                  depth: int,
+                  is_maximizing_turn: bool,
+                  player: Player,
+                  opponent: Player,
+                  alpha: float,
+                  beta: float,
+                  max_depth: Union[int, None] = None) -> tuple[int, Union[Player, None]]:
+        """
+        Recursively evaluate board states with alpha-beta pruning.
+
+        The score is exact when it lies between alpha and beta. Otherwise it
+        is a bound: at least the score if it is >= beta, at most the score
+        if it is <= alpha.
+
+        Parameters:
+            board (GameBoard): Current board state.
+            depth (int): Depth in the game tree (moves made).
+            is_maximizing_turn (bool): True if maximizing (X), False if minimizing (O).
+            player (Player): The AI player (minimizing).
+            opponent (Player): The human player (maximizing).
+            alpha (float): The score the maximizing player is already sure of.
+            beta (float): The score the minimizing player is already sure of.
+            max_depth (int): Score the positions this deep with the evaluation, None to search to the end.
+
+        Returns:
+            tuple[int, Union[Player, None]]: Score of the board state and the predicted winner.
+        """
+
+        # Counts the position and calls the hooks, only if asked for
+        if self._instrumented:
+            self._visit_node(board, depth)
+
+        # Checks if the player (maximizing) is a winner returns score
+        if board.is_winner(opponent.symbol):
+            return 10 + depth, opponent
+
+        # Checks if the opponent (minimizing) is a winner returns score
+        if board.is_winner(player.symbol):
+            return 10 - depth, player
+
+        # Checks if there are no more moves to be played and if there are no wins
+        if board.is_full():
+            return 0, None
+
+        # Stops here if the search was cancelled from another thread
+        if self.cancel_requested:
+            raise SearchCancelled()
+
+        # Stops here if the time budget is spent
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        # Stops here at the depth limit, the position is scored by the evaluation
+        if max_depth is not None and depth >= max_depth:
+            self._horizon_reached = True
+            return self._horizon_score(board, opponent), None
+
+        # Looks the position up, a stored bound is enough if it falls outside the window
+        key = (board.canonical_hash(), player.symbol, is_maximizing_turn)
+        entry = self.transposition_table.lookup(key)
+        if entry is not None and (max_depth is None or entry.depth == depth):
+            score, winner_player = self._score_from_entry(entry, depth, player, opponent)
+            if entry.flag == EXACT \
+                    or (entry.flag == LOWER_BOUND and score >= beta) \
+                    or (entry.flag == UPPER_BOUND and score <= alpha):
+                if self._instrumented:
+                    self._report.tt_hits += 1
+                return score, winner_player
+
+        window_alpha, window_beta = alpha, beta
+        best_winner = None
+
+        if is_maximizing_turn:
+            best_score = -float("inf")
+
+            for row, col in self.order_moves(board, opponent.symbol, player.symbol):
+                # The maximizing player makes a move
+                board.make_move(row, col, opponent.symbol)
+                score, winner_player = self.alphabeta(board, depth + 1, False, player, opponent, alpha, beta, max_depth)
+
+                # Undoes the move made by the player
+                board.unmake_move()
+
+                if score > best_score:
+                    best_score, best_winner = score, winner_player
+
+                # The minimizing player already has a better option elsewhere
+                alpha = max(alpha, best_score)
+                if alpha >= beta:
+                    if self._trace:
+                        log.log(TRACE, "Depth %d, cutoff after %s at (%d, %d): %s >= %s", depth, opponent.symbol, row, col, alpha, beta)
+                    if self._instrumented:
+                        self._report.cutoffs += 1
+                    break
+
+        else:
+            best_score = float("inf")
+
+            for row, col in self.order_moves(board, player.symbol, opponent.symbol):
+                # The minimizing player makes a move
+                board.make_move(row, col, player.symbol)
+                score, winner_player = self.alphabeta(board, depth + 1, True, player, opponent, alpha, beta, max_depth)
+
+                # Undoes the move made by the player
+                board.unmake_move()
+
+                if score < best_score:
+                    best_score, best_winner = score, winner_player
+
+                # The maximizing player already has a better option elsewhere
+                beta = min(beta, best_score)
+                if alpha >= beta:
+                    if self._trace:
+                        log.log(TRACE, "Depth %d, cutoff after %s at (%d, %d): %s >= %s", depth, player.symbol, row, col, alpha, beta)
+                    if self._instrumented:
+                        self._report.cutoffs += 1
+                    break
+
+        # Stores the score together with what it means for the original window
+        if best_score <= window_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= window_beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.transposition_table.store(key, best_score, depth, best_winner.symbol if best_winner else "", flag,
+                                       board.size * board.size - board.move_count)
+
+        return best_score, best_winner
+
+    @staticmethod
+    def order_moves(board: GameBoard, symbol: str, other_symbol: str) -> list[tuple[int, int]]:
+        """
+        Return the empty cells, most promising first.
+
+        Winning moves come first, then moves that block the other player's
+        win, then the centre, then the corners, then the edges.
+
+        The wins and blocks come from the line masks (see tactics), and when
+        a LineEvaluation is attached and counts no threat for either player
+        the lines aren't looked at at all, so ordering a node of a 15x15
+        board costs about as much as listing its empty cells.
+
+        Parameters:
+            board (GameBoard): The game board instance.
+            symbol (str): The symbol of the player to move.
+            other_symbol (str): The symbol of the other player.
+
+        Returns:
+            list[tuple[int, int]]: The empty cells, sorted by priority.
+        """
+
+        evaluation = board.evaluation
+        if isinstance(evaluation, LineEvaluation) and not evaluation.threats(symbol) \
+                and not evaluation.threats(other_symbol):
+            wins = blocks = 0
+        else:
+            lines = line_masks(board.size, board.win_length)
+            own = symbol_mask(board, symbol)
+            other = symbol_mask(board, other_symbol)
+            wins = winning_mask(lines, own, other)
+            # A cell that also wins is only a win
+            blocks = winning_mask(lines, other, own) & ~wins
+
+        moves = mask_cells(wins, board.size) + mask_cells(blocks, board.size) if wins | blocks else []
+
+        # The other empty cells, centre and corners first, each group in row-major order
+        empty = board.empty_mask & ~(wins | blocks)
+        coordinates = cell_coordinates(board.size)
+        moves.extend(coordinates[index] for index in static_order(board.size) if empty >> index & 1)
+        return moves
@@ -0,0 +1,313 @@
+# File: bit_board.py
+import copy
+from functools import lru_cache
+from typing import Union
+
+from src.game_board import GameBoard, cell_coordinates, winning_lines, lines_through_cells, zobrist_keys
+from src.logger import getLogger
+
+log = getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def cell_win_masks(size: int, win_length: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Return the masks of the winning lines through each cell.
+
+    Cell (row, col) is stored in bit (row * size + col), so the top row of
+    a 3x3 board is 0b000000111. The result is indexed by the bit of the cell.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win.
+
+    Returns:
+        tuple[tuple[int, ...], ...]: The line masks through each cell.
+    """
+
+    cell_lines = lines_through_cells(size, win_length)
+
+    return tuple(
+        tuple(sum(1 << (r * size + c) for r, c in line) for line in cell_lines[(row, col)])
+        for row in range(size) for col in range(size)
+    )
+
+
+def pack_board(board: GameBoard) -> tuple[int, int, bytes, str]:
+    """
+    Return a compact form of a board to send to another process: its moves
+    in the order they were made, one byte per cell (boards up to 16x16).
+
+    Parameters:
+        board (GameBoard): The game board instance.
+
+    Returns:
+        tuple[int, int, bytes, str]: size, win_length, the cell (row * size + col)
+            of each move and the symbol of each move.
+    """
+
+    cells = bytes(row * board.size + col for row, col in board.move_stack)
+    symbols = "".join(board.game_board[row][col] for row, col in board.move_stack)
+    return board.size, board.win_length, cells, symbols
+
+
+def unpack_board(packed: tuple[int, int, bytes, str]) -> "BitBoard":
+    """
+    Rebuild a board packed by pack_board, the moves are made again in order.
+
+    Parameters:
+        packed (tuple[int, int, bytes, str]): The result of pack_board.
+
+    Returns:
+        BitBoard: The board.
+    """
+
+    size, win_length, cells, symbols = packed
+    board = BitBoard(size, win_length)
+    for cell, symbol in zip(cells, symbols):
+        board.make_move(cell // size, cell % size, symbol)
+    return board
+
+
+class _BitBoardRow:
+    """
+    A list-like view of one row of a BitBoard.
+
+    Reading a cell returns "X", "O" or "", exactly like a row of
+    GameBoard.game_board, and writing a cell updates the bitmasks.
+    """
+
+    def __init__(self, board: "BitBoard", row: int):
+        self._board = board
+        self._row = row
+
+    def __getitem__(self, col: int) -> str:
+        return self._board._get_cell(self._row, col)
+
+    def __setitem__(self, col: int, symbol: str) -> None:
+        self._board._set_cell(self._row, col, symbol)
+
+    def __len__(self) -> int:
+        return self._board.size
+
+    def __iter__(self):
+        return (self._board._get_cell(self._row, col) for col in range(self._board.size))
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class BitBoard(GameBoard):
+    """
+    Models the Tic-Tac-Toe game board using one integer bitmask per player.
+    A win check is a handful of AND/compare operations against the masks of
+    the lines through the last move.
+
+    It keeps the GameBoard API (make_move, unmake_move, is_winner, is_full,
+    get_empty_cells, display and __str__), and `game_board` is a list-like
+    view, so code that reads `board.game_board[row][col]` keeps working.
+
+    Example:
+    ========
+        >>> from src.bit_board import BitBoard
+        >>> game = BitBoard()
+        >>> game.make_move(0, 0, "X")
+        >>> game.make_move(1, 1, "O")
+        >>> game.is_winner("X")
+        False
+        >>> game.unmake_move()
+        (1, 1)
+        >>> # 15x15 gomoku
+        >>> game = BitBoard(15, 5)
+    """
+
+    def __init__(self, size: int = 3, win_length: Union[int, None] = None):
+        """
+        Initialize an empty board: no bits set for either player.
+
+        Parameters:
+            size (int): The number of rows (and columns), 3 by default.
+            win_length (int): The number of symbols in a row needed to win,
+                the board size if None.
+        """
+
+        # Don't call GameBoard.__init__, the 2D list is replaced by the bitmasks
+        self.size = size
+        self.win_length = win_length if win_length is not None else size
+        self.lines = winning_lines(self.size, self.win_length)
+        self.cell_lines = lines_through_cells(self.size, self.win_length)
+
+        # The masks of the lines through each cell, and of the whole board
+        self.cell_masks = cell_win_masks(self.size, self.win_length)
+        self.full_mask = (1 << (self.size * self.size)) - 1
+
+        self.masks = {"X": 0, "O": 0}
+
+        # The bits of the moves that completed a line, and the number of such moves per symbol
+        self._winning_bits = 0
+        self._wins = {"X": 0, "O": 0}
+
+        # The number of moves made, and the bits of the empty cells
+        self.cells = cell_coordinates(self.size)
+        self.move_count = 0
+        self.empty_mask = self.full_mask
+
+        # The moves made, last on top, and the Zobrist hashes of the 8 symmetric variants
+        self.move_stack = []
+        self.zobrist_keys = zobrist_keys(self.size)
+        self.hashes = [0] * 8
+        self.evaluation = None
+
+        # The rows are created once, the view never changes
+        self._rows = tuple(_BitBoardRow(self, row) for row in range(self.size))
+
+    @property
+    def game_board(self) -> tuple:
+        """
+        A list-like size x size view of the board, game_board[row][col] is "X", "O" or "".
+        """
+        return self._rows
+
+    def _get_cell(self, row: int, col: int) -> str:
+        """
+        Return the symbol stored at (row, col), or "" for an empty cell.
+        """
+        bit = 1 << (row * self.size + col)
+
+        if self.masks["X"] & bit:
+            return "X"
+        if self.masks["O"] & bit:
+            return "O"
+        return ""
+
+    def _set_cell(self, row: int, col: int, symbol: str) -> None:
+        """
+        Store a symbol at (row, col), an empty string clears the cell.
+        """
+
+        if self._get_cell(row, col):
+            self.undo_move(row, col)
+
+        if symbol:
+            self.make_move(row, col, symbol)
+
+    def make_move(self, row: int, col: int, symbol: str) -> tuple[bool, str]:
+        """
+        Place a symbol (X or O) at the given position if valid.
+
+        Parameters:
+            row (int): Row index (0 to size - 1).
+            col (int): Column index (0 to size - 1).
+            symbol (str): Player symbol ('X' or 'O').
+
+        Returns:
+            tuple[bool, str]: (True, "") if the move was made, (False, message) otherwise.
+        """
+
+        # The same answers as GameBoard.make_move, so the two boards can be swapped
+        symbol = symbol.upper()
+        if symbol not in self.masks:
+            return False, "The symbol must be X or O."
+
+        # Checked before the bit is computed, a cell off the board would be another cell's bit
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return False, "This cell is not on the board."
+
+        index = row * self.size + col
+        bit = 1 << index
+
+        # Doesn't place a symbol if the cell is taken by either player
+        if not self.empty_mask & bit:
+            return False, "This cell is not empty."
+
+        mask = self.masks[symbol] | bit
+        self.masks[symbol] = mask
+        self.empty_mask ^= bit
+        self.move_count += 1
+        self.move_stack.append((row, col))
+        self._update_hashes(index, symbol)
+        if self.evaluation is not None:
+            self.evaluation.on_move(index, symbol)
+
+        # A line through the cell is won when every bit of its mask is set
+        for win_mask in self.cell_masks[index]:
+            if mask & win_mask == win_mask:
+                self._winning_bits |= bit
+                self._wins[symbol] += 1
+                break
+
+        return True, ""
+
+    def _clear_cell(self, row: int, col: int) -> None:
+        """
+        Empty a cell and update the bookkeeping, the move stack is left as it is.
+        """
+
+        index = row * self.size + col
+        bit = 1 << index
+        symbol = "X" if self.masks["X"] & bit else "O"
+
+        self.masks[symbol] &= ~bit
+        self.empty_mask |= bit
+        self.move_count -= 1
+        self._update_hashes(index, symbol)
+        if self.evaluation is not None:
+            self.evaluation.on_unmove(index, symbol)
+
+        # Forgets the win if this move completed a line
+        if self._winning_bits & bit:
+            self._winning_bits &= ~bit
+            self._wins[symbol] -= 1
+
+    def reset(self) -> None:
+        """
+        Empty every cell of the board.
+        """
+        self.masks = {"X": 0, "O": 0}
+        self._winning_bits = 0
+        self._wins = {"X": 0, "O": 0}
+        self.move_count = 0
+        self.empty_mask = self.full_mask
+        self.move_stack = []
+        self.hashes = [0] * 8
+        if self.evaluation is not None:
+            self.evaluation = self.evaluation.for_board(self)
+
+    def copy(self) -> "BitBoard":
+        """
+        Return an independent copy of the board, e.g. for a search running in another thread.
+
+        Returns:
+            BitBoard: The copy.
+        """
+
+        board = copy.copy(self)
+        board.masks = dict(self.masks)
+        board._wins = dict(self._wins)
+        board.move_stack = list(self.move_stack)
+        board.hashes = list(self.hashes)
+        board._rows = tuple(_BitBoardRow(board, row) for row in range(self.size))
+        if self.evaluation is not None:
+            board.evaluation = self.evaluation.for_board(board)
+        return board
+
+    def is_winner(self, symbol: str) -> bool:
+        """
+        Check if the given symbol has won (row, column, diagonal).
+
+        Parameter:
+            symbol (str): The player symbol, i.e "X" or "O"
+
+        Returns:
+            bool: True if the symbol wins, False otherwise.
+        """
+        return self._wins[symbol.upper()] > 0
+
+    def is_full(self) -> bool:
+        """
+        Check if the board is full (no empty spaces).
+
+        Returns:
+            bool: Returns True if there are 0 empty cell, else returns false
+        """
+        return self.empty_mask == 0
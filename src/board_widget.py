@@ -0,0 +1,217 @@
+# File: board_widget.py
+from typing import Union
+
+from PyQt6.QtCore import QPoint, QRect, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QMouseEvent, QPainter, QPaintEvent, QPen
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+from src.game_board import GameBoard
+from src.logger import getLogger
+
+log = getLogger(__name__)
+
+# The colours of the board
+BACKGROUND_COLOR = QColor("#f4f1ea")
+GRID_COLOR = QColor("#5a5a5a")
+WIN_CELL_COLOR = QColor("#f7d774")
+WIN_LINE_COLOR = QColor(200, 40, 40, 170)
+SYMBOL_COLORS = {"X": QColor("#1f4e9c"), "O": QColor("#b8401f")}
+
+# The preferred cell size in pixels, and the smallest one that is still clickable
+CELL_SIZE = 80
+MIN_CELL_SIZE = 16
+
+
+class BoardWidget(QWidget):
+    """
+    Draws the board in one widget, instead of one button per cell.
+
+    The widget reads the cells from the board when it paints, it keeps no
+    copy of them. After a move only the rectangle of that cell is repainted
+    (update_cell), so a move costs the same on a 19x19 board as on a 3x3
+    one. The cells grow and shrink with the widget.
+
+    Example:
+    ========
+    >>> view = BoardWidget(controller.board)
+    >>> view.cell_clicked.connect(self.on_cell_clicked)
+    >>> controller.make_move(7, 7, human)
+    >>> view.update_cell(7, 7)
+    >>> view.set_winning_line(controller.board.winning_line())
+    """
+
+    # (row, col) of a clicked cell
+    cell_clicked = pyqtSignal(int, int)
+
+    def __init__(self, board: GameBoard, parent: Union[QWidget, None] = None):
+        """
+        Create the view of a board.
+
+        Parameters:
+            board (GameBoard): The board to draw.
+            parent (QWidget): The parent widget, if any.
+        """
+
+        super().__init__(parent)
+        self.board = board
+        self.board_size = board.size
+
+        # The cells of the completed line, highlighted when the game is won
+        self.winning_line: tuple[tuple[int, int], ...] = ()
+
+        # Clicks are ignored while locked, e.g. while the AI thinks. Unlike
+        # setEnabled(False) this doesn't repaint the whole board
+        self.locked = False
+
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.setMinimumSize(MIN_CELL_SIZE * self.board_size, MIN_CELL_SIZE * self.board_size)
+
+        # The symbols are redrawn in a new font only when the cell size changes
+        self._font = QFont("Times")
+        self._font_cell_size = 0
+
+    def sizeHint(self) -> QSize:
+        """
+        The preferred size: CELL_SIZE per cell, smaller on big boards so the window fits on the screen.
+        """
+        cell = max(MIN_CELL_SIZE, min(CELL_SIZE, 720 // self.board_size))
+        return QSize(cell * self.board_size, cell * self.board_size)
+
+    def _geometry(self) -> tuple[int, int, int]:
+        """
+        Return the cell size and the top left corner of the board, centred in the widget.
+        """
+
+        cell = max(1, min(self.width(), self.height()) // self.board_size)
+        left = (self.width() - cell * self.board_size) // 2
+        top = (self.height() - cell * self.board_size) // 2
+        return cell, left, top
+
+    def cell_rect(self, row: int, col: int) -> QRect:
+        """
+        Return the rectangle of a cell in widget coordinates.
+
+        Parameters:
+            row (int): Row index (0 to size - 1).
+            col (int): Column index (0 to size - 1).
+
+        Returns:
+            QRect: The cell, its grid lines included.
+        """
+
+        cell, left, top = self._geometry()
+        return QRect(left + col * cell, top + row * cell, cell, cell)
+
+    def cell_at(self, point: QPoint) -> Union[tuple[int, int], None]:
+        """
+        Return the cell under a point, None outside the board.
+
+        Parameters:
+            point (QPoint): A point in widget coordinates.
+
+        Returns:
+            Union[tuple[int, int], None]: (row, col) of the cell.
+        """
+
+        cell, left, top = self._geometry()
+        if point.x() < left or point.y() < top:
+            return None
+
+        row, col = (point.y() - top) // cell, (point.x() - left) // cell
+        if row >= self.board_size or col >= self.board_size:
+            return None
+        return row, col
+
+    def update_cell(self, row: int, col: int) -> None:
+        """
+        Repaint one cell, after a move was made or taken back there.
+
+        Parameters:
+            row (int): Row index (0 to size - 1).
+            col (int): Column index (0 to size - 1).
+        """
+        self.update(self.cell_rect(row, col))
+
+    def set_winning_line(self, cells: Union[tuple[tuple[int, int], ...], None]) -> None:
+        """
+        Highlight the cells of a completed line, None or () removes the highlight.
+
+        Parameters:
+            cells (tuple[tuple[int, int], ...]): The cells of the line, e.g. board.winning_line().
+        """
+
+        # The old and the new line are repainted, nothing else
+        changed = set(self.winning_line) | set(cells or ())
+        self.winning_line = tuple(cells or ())
+
+        for row, col in changed:
+            self.update_cell(row, col)
+
+    def reset(self) -> None:
+        """
+        Remove the highlight and repaint the whole board, e.g. after the board was reset.
+        """
+        self.winning_line = ()
+        self.update()
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        """
+        Send cell_clicked for a left click on a cell, unless the board is locked.
+        """
+
+        if self.locked or event.button() != Qt.MouseButton.LeftButton:
+            return super().mousePressEvent(event)
+
+        cell = self.cell_at(event.position().toPoint())
+        if cell is not None:
+            self.cell_clicked.emit(*cell)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """
+        Paint the cells in the area to repaint, the other cells are left alone.
+        """
+
+        cell, left, top = self._geometry()
+        area = event.rect()
+
+        # The rows and columns touched by the area
+        first_row = max(0, (area.top() - top) // cell)
+        last_row = min(self.board_size - 1, (area.bottom() - top) // cell)
+        first_col = max(0, (area.left() - left) // cell)
+        last_col = min(self.board_size - 1, (area.right() - left) // cell)
+
+        if self._font_cell_size != cell:
+            self._font.setPixelSize(max(6, cell * 3 // 5))
+            self._font_cell_size = cell
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(area, BACKGROUND_COLOR)
+        painter.setFont(self._font)
+
+        cells = self.board.game_board
+        winning = set(self.winning_line)
+        grid_pen = QPen(GRID_COLOR, 1)
+
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                rect = QRect(left + col * cell, top + row * cell, cell, cell)
+
+                if (row, col) in winning:
+                    painter.fillRect(rect, WIN_CELL_COLOR)
+
+                painter.setPen(grid_pen)
+                painter.drawRect(rect.adjusted(0, 0, -1, -1))
+
+                symbol = cells[row][col]
+                if symbol:
+                    painter.setPen(SYMBOL_COLORS.get(symbol, GRID_COLOR))
+                    painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, symbol)
+
+        # A stroke through the line, clipped to the area like everything else
+        if self.winning_line:
+            first, last = self.winning_line[0], self.winning_line[-1]
+            painter.setPen(QPen(WIN_LINE_COLOR, max(2, cell // 10), Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
+            painter.drawLine(self.cell_rect(*first).center(), self.cell_rect(*last).center())
+
+        painter.end()
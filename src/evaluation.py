@@ -0,0 +1,255 @@
+"""
+Evaluations score positions the search can't follow to the end of the game,
+at the depth limit of an iterative deepening search.
+
+An evaluation is attached to a board and told about every move made and
+taken back, so it keeps its counts up to date instead of reading the whole
+board again at each position:
+
+    board.attach_evaluation(LineEvaluation(board))
+    board.make_move(7, 7, "X")      # -> evaluation.on_move(7 * 15 + 7, "X")
+    board.unmake_move()             # -> evaluation.on_unmove(7 * 15 + 7, "X")
+    evaluation.score("X")           # > 0 when the position is good for X
+
+LineEvaluation counts the open lines of each player: the lines of
+win_length cells that hold only its symbols, by the number of symbols. A
+line held by both players can't be won any more and counts for no one. A
+line one symbol short of a win is a threat, two short a two-in-a-row, and
+so on. An open three (a three with both ends free) lies in more open lines
+than a three blocked on one side, so it weighs more, without looking for
+the shape itself.
+"""
+
+# File: evaluation.py
+from functools import lru_cache
+
+from src.game_board import GameBoard, cell_coordinates, lines_through_cells, winning_lines
+
+# The weight of an open line grows this much with each symbol in it
+LINE_WEIGHT_BASE = 10
+
+
+@lru_cache(maxsize=None)
+def cell_line_indexes(size: int, win_length: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Return the indexes (in winning_lines) of the lines through each cell, by cell index.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win.
+
+    Returns:
+        tuple[tuple[int, ...], ...]: For cell row * size + col, the indexes of its lines.
+    """
+
+    line_index = {line: index for index, line in enumerate(winning_lines(size, win_length))}
+    cell_lines = lines_through_cells(size, win_length)
+
+    return tuple(tuple(line_index[line] for line in cell_lines[cell]) for cell in cell_coordinates(size))
+
+
+class Evaluation:
+    """
+    The base class of the evaluations, override the methods to write your own.
+
+    An evaluation belongs to one board. It reads the board once when it is
+    created, after that it only follows the moves it is told about.
+
+    Example:
+    ========
+    >>> class CentreEvaluation(Evaluation):
+    >>>     # Likes the symbols near the centre, recomputed at every position
+    >>>     def score(self, symbol):
+    >>>         ...
+    >>> strategy = MinimaxStrategy(evaluation=CentreEvaluation)
+    """
+
+    def __init__(self, board: GameBoard):
+        """
+        Read the position of the board.
+
+        Parameters:
+            board (GameBoard): The board the evaluation belongs to.
+        """
+        self.board = board
+
+    def on_move(self, index: int, symbol: str) -> None:
+        """
+        Called after a symbol was placed on the board.
+
+        Parameters:
+            index (int): The cell, row * size + col.
+            symbol (str): "X" or "O".
+        """
+
+    def on_unmove(self, index: int, symbol: str) -> None:
+        """
+        Called after a symbol was taken off the board.
+
+        Parameters:
+            index (int): The cell, row * size + col.
+            symbol (str): "X" or "O", the symbol that was there.
+        """
+
+    def score(self, symbol: str) -> float:
+        """
+        Return how good the position is for a player.
+
+        Parameters:
+            symbol (str): "X" or "O".
+
+        Returns:
+            float: Positive when the position is good for the symbol, negative when it is bad.
+        """
+        return 0.0
+
+    def for_board(self, board: GameBoard) -> "Evaluation":
+        """
+        Return an evaluation of the same kind for another board, e.g. a copy of this one.
+
+        Parameters:
+            board (GameBoard): The other board.
+
+        Returns:
+            Evaluation: The new evaluation.
+        """
+        return type(self)(board)
+
+
+class LineEvaluation(Evaluation):
+    """
+    Scores a position by the open lines of each player (see the module docstring).
+
+    An open line with n symbols weighs LINE_WEIGHT_BASE ** (n - 1), so one
+    threat outweighs many lines with fewer symbols. A move only changes the
+    lines through its cell, at most 4 * win_length of them.
+
+    Example:
+    ========
+    >>> board = BitBoard(15, 5)
+    >>> evaluation = LineEvaluation(board)
+    >>> board.attach_evaluation(evaluation)
+    >>> board.make_move(7, 7, "X")
+    >>> evaluation.open_lines["X"][1]
+    20
+    """
+
+    def __init__(self, board: GameBoard):
+        """
+        Count the open lines of the board.
+
+        Parameters:
+            board (GameBoard): The board the evaluation belongs to.
+        """
+
+        super().__init__(board)
+        self.win_length = board.win_length
+        self.weights = (0,) + tuple(LINE_WEIGHT_BASE ** (n - 1) for n in range(1, self.win_length + 1))
+        self.cell_lines = cell_line_indexes(board.size, board.win_length)
+
+        # The symbols of each player in each line
+        self.counts = {"X": [0] * len(board.lines), "O": [0] * len(board.lines)}
+
+        # open_lines[symbol][n]: the lines holding n symbols of the player and none of the other
+        self.open_lines = {"X": [0] * (self.win_length + 1), "O": [0] * (self.win_length + 1)}
+        self.open_lines["X"][0] = self.open_lines["O"][0] = len(board.lines)
+
+        for row, col in board.cells:
+            symbol = board.game_board[row][col]
+            if symbol:
+                self.on_move(row * board.size + col, symbol)
+
+    def on_move(self, index: int, symbol: str) -> None:
+        """
+        Add a symbol to the lines through its cell.
+
+        Parameters:
+            index (int): The cell, row * size + col.
+            symbol (str): "X" or "O".
+        """
+
+        other_symbol = "O" if symbol == "X" else "X"
+        own = self.counts[symbol]
+        other = self.counts[other_symbol]
+        own_open = self.open_lines[symbol]
+        other_open = self.open_lines[other_symbol]
+
+        for line in self.cell_lines[index]:
+            n = own[line]
+            own[line] = n + 1
+            m = other[line]
+
+            if m == 0:
+                # Still open for us, with one symbol more (an empty line was open for both)
+                own_open[n] -= 1
+                own_open[n + 1] += 1
+                if n == 0:
+                    other_open[0] -= 1
+            elif n == 0:
+                # The other player can't win this line any more
+                other_open[m] -= 1
+
+    def on_unmove(self, index: int, symbol: str) -> None:
+        """
+        Take a symbol out of the lines through its cell.
+
+        Parameters:
+            index (int): The cell, row * size + col.
+            symbol (str): "X" or "O", the symbol that was there.
+        """
+
+        other_symbol = "O" if symbol == "X" else "X"
+        own = self.counts[symbol]
+        other = self.counts[other_symbol]
+        own_open = self.open_lines[symbol]
+        other_open = self.open_lines[other_symbol]
+
+        for line in self.cell_lines[index]:
+            n = own[line] - 1
+            own[line] = n
+            m = other[line]
+
+            if m == 0:
+                own_open[n + 1] -= 1
+                own_open[n] += 1
+                if n == 0:
+                    other_open[0] += 1
+            elif n == 0:
+                # The line is open for the other player again
+                other_open[m] += 1
+
+    def threats(self, symbol: str) -> int:
+        """
+        Return the open lines a player completes with one more symbol.
+
+        Parameters:
+            symbol (str): "X" or "O".
+
+        Returns:
+            int: The number of lines one symbol short of a win.
+        """
+        return self.open_lines[symbol][self.win_length - 1]
+
+    def line_score(self, symbol: str) -> int:
+        """
+        Return the weighted open lines of one player.
+
+        Parameters:
+            symbol (str): "X" or "O".
+
+        Returns:
+            int: The sum of the weights of the player's open lines.
+        """
+        return sum(weight * lines for weight, lines in zip(self.weights, self.open_lines[symbol]))
+
+    def score(self, symbol: str) -> float:
+        """
+        Return the weighted open lines of a player minus those of the other.
+
+        Parameters:
+            symbol (str): "X" or "O".
+
+        Returns:
+            float: Positive when the player has the stronger lines.
+        """
+        return float(self.line_score(symbol) - self.line_score("O" if symbol == "X" else "X"))
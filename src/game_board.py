@@ -1,68 +1,284 @@
 # File: game_board.py
-import email.message
+import copy
+import random
+from functools import lru_cache
 from typing import Annotated, Union, List
 from src.logger import getLogger
 
 log = getLogger(__name__)
 
+# The directions a line can run in: row, column, diagonal and anti-diagonal
+LINE_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+@lru_cache(maxsize=None)
+def winning_lines(size: int, win_length: int) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """
+    Return every line of `win_length` cells on a size x size board.
+
+    The result is cached, so all the boards of one variant share it.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win.
+
+    Returns:
+        tuple[tuple[tuple[int, int], ...], ...]: The lines, each a tuple of (row, col) cells.
+    """
+
+    if size < 1 or not 1 <= win_length <= size:
+        raise ValueError(f"Can't win with {win_length} in a row on a {size}x{size} board.")
+
+    lines = []
+    for row in range(size):
+        for col in range(size):
+            for d_row, d_col in LINE_DIRECTIONS:
+                # Only keep the line if its last cell is still on the board
+                end_row = row + d_row * (win_length - 1)
+                end_col = col + d_col * (win_length - 1)
+                if 0 <= end_row < size and 0 <= end_col < size:
+                    lines.append(tuple((row + d_row * i, col + d_col * i) for i in range(win_length)))
+
+    return tuple(lines)
+
+
+@lru_cache(maxsize=None)
+def lines_through_cells(size: int, win_length: int) -> dict[tuple[int, int], tuple]:
+    """
+    Return the winning lines through each cell, indexed by (row, col).
+
+    A move can only complete a line that passes through its cell, so a win
+    check after a move only has to look at these lines. The dict is cached
+    and shared, it must not be modified.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win.
+
+    Returns:
+        dict[tuple[int, int], tuple]: The lines through each cell.
+    """
+
+    cell_lines = {(row, col): [] for row in range(size) for col in range(size)}
+    for line in winning_lines(size, win_length):
+        for cell in line:
+            cell_lines[cell].append(line)
+
+    return {cell: tuple(lines) for cell, lines in cell_lines.items()}
+
+
+@lru_cache(maxsize=None)
+def symmetries(size: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Return the 8 rotations and reflections of a size x size board.
+
+    Each symmetry is a tuple of cell indexes (row * size + col): the cell
+    found at position i of the transformed board is cell symmetry[i] of
+    the original board.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board.
+
+    Returns:
+        tuple[tuple[int, ...], ...]: The 8 index permutations, identity first.
+    """
+
+    last = size - 1
+    transforms = (
+        lambda r, c: (r, c),                # Identity
+        lambda r, c: (c, last - r),         # Rotate 90
+        lambda r, c: (last - r, last - c),  # Rotate 180
+        lambda r, c: (last - c, r),         # Rotate 270
+        lambda r, c: (r, last - c),         # Mirror left <--> right
+        lambda r, c: (last - r, c),         # Mirror top <--> bottom
+        lambda r, c: (c, r),                # Mirror on the diagonal
+        lambda r, c: (last - c, last - r),  # Mirror on the anti-diagonal
+    )
+
+    return tuple(
+        tuple(src_r * size + src_c for src_r, src_c in (t(r, c) for r in range(size) for c in range(size)))
+        for t in transforms
+    )
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size: int) -> dict[str, tuple[tuple[int, ...], ...]]:
+    """
+    Return the Zobrist keys of a size x size board.
+
+    A position hash is the XOR of the keys of its symbols, so a move updates
+    it with one XOR. Every (cell, symbol) has 8 keys, one per symmetry: key
+    s is the key of the cell the symmetry moves it to. The hash of symmetry
+    s is then the hash of the rotated or reflected board, and all the
+    symmetric variants of a position share the same 8 hashes.
+
+    The keys come from a fixed seed, so hashes are the same in every run
+    and every process.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board.
+
+    Returns:
+        dict[str, tuple[tuple[int, ...], ...]]: For "X" and "O", the 8 keys of each cell.
+    """
+
+    rng = random.Random(f"zobrist-{size}")
+    cells = size * size
+    base = {symbol: [rng.getrandbits(64) for _ in range(cells)] for symbol in ("X", "O")}
+
+    # The cell that symmetry s moves each cell to
+    targets = []
+    for symmetry in symmetries(size):
+        target = [0] * cells
+        for index, cell in enumerate(symmetry):
+            target[cell] = index
+        targets.append(target)
+
+    return {
+        symbol: tuple(tuple(base[symbol][target[cell]] for target in targets) for cell in range(cells))
+        for symbol in ("X", "O")
+    }
+
+
+@lru_cache(maxsize=None)
+def cell_coordinates(size: int) -> tuple[tuple[int, int], ...]:
+    """
+    Return the (row, col) of every cell, indexed by its bit (row * size + col).
+
+    The tuples are created once and shared, so iterating over empty cells
+    doesn't allocate a tuple per cell.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board.
+
+    Returns:
+        tuple[tuple[int, int], ...]: The cells in row-major order.
+    """
+    return tuple((row, col) for row in range(size) for col in range(size))
+
 
 class GameBoard:
     """
-    Models the Tic-Tac-Toe 3x3 game board using a 2D array.
+    Models the Tic-Tac-Toe game board using a 2D array.
+    The board is size x size (3x3 by default) and a player wins with
+    win_length symbols in a row (the board size by default).
     Handles moves, win checks, and board state.
 
+    Moves must be made with make_move and undone with undo_move, so the board
+    can keep track of wins: a move only checks the lines through its own cell.
+    It also keeps the number of moves made and a bitmask of the empty cells,
+    bit (row * size + col), so is_full is O(1) and iter_empty_cells doesn't
+    have to scan the board.
+
+    The moves are kept on a stack, unmake_move() takes the last one back.
+    Every move also updates 64-bit Zobrist hashes of the position:
+    zobrist_hash is the hash of the board, canonical_hash() the same for a
+    position and all its rotations and reflections.
+
     Example:
     ========
         >>> from src.game_board import GameBoard
         >>> game = GameBoard()
         >>> # Add X and O to the game board
-        >>> game.game_board[0][0] = "X"
-        >>> game.game_board[0][1] = "O"
-        >>> game.game_board[1][0] = "X"
-        >>> game.game_board[1][1] = "O"
-        >>> game.game_board[2][0] = "X"
-        >>> game.game_board[2][1] = "O"
+        >>> game.make_move(0, 0, "X")
+        >>> game.make_move(0, 1, "O")
+        >>> game.make_move(1, 0, "X")
+        >>> game.make_move(1, 1, "O")
+        >>> game.make_move(2, 0, "X")
+        >>> game.unmake_move()
+        (2, 0)
         >>> # Get any empty cells
         >>> print("\\nEmpty cells: ", end="")
         >>> print(game.get_empty_cells(), end="\\n\\n")
         >>> # Display the game board
         >>> game.display()
+        >>> # 4x4 with 4 in a row, and gomoku
+        >>> game = GameBoard(4)
+        >>> game = GameBoard(15, 5)
 
     """
     game_board = Annotated[List, "The GameBoard"]
 
-    def __init__(self):
+    def __init__(self, size: int = 3, win_length: Union[int, None] = None):
         """
-        Initialize an empty 3x3 board as a 2D list.
+        Initialize an empty size x size board as a 2D list.
 
-        Example:
-        =======
-        >>> from src.game_board import GameBoard
-        >>> game = GameBoard()
-        >>> # Add X and O to the game board
-        >>> game.game_board[0][0] = "X"
-        >>> game.game_board[0][1] = "O"
-        >>> game.game_board[1][0] = "X"
-        >>> game.game_board[1][1] = "O"
-        >>> game.game_board[2][0] = "X"
-        >>> game.game_board[2][1] = "O"
-        >>> # Get any empty cells
-        >>> print("\\nEmpty cells: ", end="")
-        >>> print(game.get_empty_cells(), end="\\n\\n")
-        >>> # Display the game board
-        >>> game.display()
-"""
+        Parameters:
+            size (int): The number of rows (and columns), 3 by default.
+            win_length (int): The number of symbols in a row needed to win,
+                the board size if None.
+        """
+
+        self.size = size
+        self.win_length = win_length if win_length is not None else size
+
+        # The lines of the board, and the lines through each cell
+        self.lines = winning_lines(self.size, self.win_length)
+        self.cell_lines = lines_through_cells(self.size, self.win_length)
+
+        # Initializes the board as a size by size 2D list
+        self.game_board = [["" for _ in range(self.size)] for _ in range(self.size)]
+
+        # The cells whose move completed a line, and the number of such moves per symbol
+        self._winning_cells = set()
+        self._wins = {"X": 0, "O": 0}
+
+        # The number of moves made, and the bits of the empty cells
+        self.cells = cell_coordinates(self.size)
+        self.move_count = 0
+        self.empty_mask = (1 << (self.size * self.size)) - 1
+
+        # The moves made, last on top, and the Zobrist hashes of the 8 symmetric variants
+        self.move_stack = []
+        self.zobrist_keys = zobrist_keys(self.size)
+        self.hashes = [0] * 8
+
+        # The evaluation told about every move, None if nothing is attached
+        self.evaluation = None
 
-        # Initializes the board as a 3 by 3 2D list
-        self.game_board = [["" for _ in range(3)] for _ in range(3)]
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        The 64-bit Zobrist hash of the position.
+        """
+        return self.hashes[0]
+
+    def canonical_hash(self) -> int:
+        """
+        Return the smallest hash of the 8 symmetric variants of the position,
+        the same for a position and all its rotations and reflections.
+
+        Returns:
+            int: The canonical 64-bit hash.
+        """
+        return min(self.hashes)
+
+    def attach_evaluation(self, evaluation) -> None:
+        """
+        Attach an evaluation, it is told about every move made and taken back
+        from now on. None detaches it.
+
+        Parameters:
+            evaluation (Evaluation): The evaluation, created for this board.
+        """
+        self.evaluation = evaluation
+
+    def _update_hashes(self, index: int, symbol: str) -> None:
+        """
+        Add or remove (XOR) a symbol at cell index in the 8 hashes.
+        """
+        keys = self.zobrist_keys[symbol][index]
+        hashes = self.hashes
+        for s in range(8):
+            hashes[s] ^= keys[s]
 
     def make_move(self, row: int, col: int, symbol: str) -> tuple[bool, str]:
         """
         Place a symbol (X or O) at the given position if valid.
 
         Parameters:
-            row (int): Row index (0-2).
-            col (int): Column index (0-2).
+            row (int): Row index (0 to size - 1).
+            col (int): Column index (0 to size - 1).
             symbol (str): Player symbol ('X' or 'O').
 
         Returns:
@@ -74,183 +290,179 @@ class GameBoard:
             # Convert symbol to uppercase for convention
             symbol = symbol.upper()
 
+            # Checked before anything changes, the keys and lines only know X and O
+            if symbol not in ("X", "O"):
+                raise ValueError("The symbol must be X or O.")
+
+            # Checked before anything changes, a negative index would wrap around the rows
+            if not (0 <= row < self.size and 0 <= col < self.size):
+                raise ValueError("This cell is not on the board.")
+
             # Raise an exception, and doesn't place a symbol if a cell is not empty
             if len(self.game_board[row][col]) != 0:
                 # Displays an error message
                 raise ValueError("This cell is not empty.")
             # Otherwise places the symbol in a cell if a cell is empty
             self.game_board[row][col] = symbol
+            index = row * self.size + col
+            self.empty_mask &= ~(1 << index)
+            self.move_count += 1
+            self.move_stack.append((row, col))
+            self._update_hashes(index, symbol)
+            if self.evaluation is not None:
+                self.evaluation.on_move(index, symbol)
+
+            # Remembers the move if it completed a line
+            if self._is_winning_move(row, col, symbol):
+                self._winning_cells.add((row, col))
+                self._wins[symbol] = self._wins.get(symbol, 0) + 1
+
             # Returns true
             return True, ""
 
-        # Raises a ValueError if a human player places a symbol in a none empty cell
+        # Raises a ValueError if a human player places a symbol in a none empty cell, or off the board
         except ValueError as e:
             # Return False and displays the Error message: "This cell is not empty."
             return False, e.args[0]
 
-    def is_winner(self, symbol: str) -> bool:
+    def unmake_move(self) -> tuple[int, int]:
         """
-        Check if the given symbol has won (row, column, diagonal).
-        Domains: rows, columns, diagonal (left --> right) and anti-diagonal (left <-- right)
-
-        The gameboard (2D Array):
-            [
-            [X, X, 0]   # Row 1, Index 0, contains a list with 3 Columns
-            [O, O, O]   # Row 2, Index 1, contains a list with 3 Columns
-            [X, X, X]   # Row 3, Index 2, contains a list with 3 Columns
-            ]
-
-        Parameter:
-            symbol (str): The player symbol, i.e "X" or "O"
+        Take the last move back.
 
         Returns:
-            bool: True if the symbol wins, False otherwise.
+            tuple[int, int]: (row, col) of the move taken back.
         """
 
-        # Symbol must always be uppercase, so make sure to change to uppercase
-        symbol = symbol.upper()
-
-        # Check if you have a row win and return before resetting the variable
-        if self._row_win(symbol):
-            return True
+        row, col = self.move_stack.pop()
+        self._clear_cell(row, col)
+        return row, col
 
-        # Check the rows and columns to see if we find a winning row
-        if self._col_win(symbol):
-            return True
+    def undo_move(self, row: int, col: int) -> None:
+        """
+        Undo the move made at (row, col). Wins are only tracked right if moves
+        are undone last made first, use unmake_move() for that.
 
-        # Checks diagonal for a winner
-        if self._diag_win(symbol):
-            return True
+        Parameters:
+            row (int): Row index (0 to size - 1).
+            col (int): Column index (0 to size - 1).
+        """
 
-        # Check the anti-diagonal for a winner
-        if self._anti_diag_win(symbol):
-            return True
+        self.move_stack.remove((row, col))
+        self._clear_cell(row, col)
 
-        return False
+    def _clear_cell(self, row: int, col: int) -> None:
+        """
+        Empty a cell and update the bookkeeping, the move stack is left as it is.
+        """
 
-    def _anti_diag_win(self, symbol: str):
+        symbol = self.game_board[row][col]
+        self.game_board[row][col] = ""
+        index = row * self.size + col
+        self.empty_mask |= 1 << index
+        self.move_count -= 1
+        self._update_hashes(index, symbol)
+        if self.evaluation is not None:
+            self.evaluation.on_unmove(index, symbol)
+
+        # Forgets the win if this move completed a line
+        if (row, col) in self._winning_cells:
+            self._winning_cells.remove((row, col))
+            self._wins[symbol] -= 1
+
+    def reset(self) -> None:
+        """
+        Empty every cell of the board.
         """
-        Represents an anti-diagonal win.
 
-        Parameters:
-            symbol (str): A Player symbol('X' or 'O')
+        for row in range(self.size):
+            for col in range(self.size):
+                self.game_board[row][col] = ""
 
+        self._winning_cells.clear()
+        self._wins = {"X": 0, "O": 0}
+        self.move_count = 0
+        self.empty_mask = (1 << (self.size * self.size)) - 1
+        self.move_stack = []
+        self.hashes = [0] * 8
+        if self.evaluation is not None:
+            self.evaluation = self.evaluation.for_board(self)
 
-        Returns:
-            bool: Returns True if an anti-diagonal cell == a symbol, Return False otherwise.
+    def copy(self) -> "GameBoard":
         """
-        # Symbol must always be uppercase, so make sure to change to uppercase
-        symbol = symbol.upper()
-        # Capture the row and column sizes
-        rows = len(self.game_board)
-        cols = len(self.game_board[0]) - 1
+        Return an independent copy of the board, e.g. for a search running in another thread.
 
-        # This inner for loop checks each anti-diagonal for a winner
-        for row in range(rows):
-            # log.info(f"({row},{cols}) => {self.game_board[row][cols]}")
+        Returns:
+            GameBoard: The copy.
+        """
 
-            if self.game_board[row][cols] != symbol:
-                # log.info(f"Found a false: ({row}, {cols})")
-                return False
-            cols -= 1
-        return True
+        board = copy.copy(self)
+        board.game_board = [list(row) for row in self.game_board]
+        board._winning_cells = set(self._winning_cells)
+        board._wins = dict(self._wins)
+        board.move_stack = list(self.move_stack)
+        board.hashes = list(self.hashes)
+        if self.evaluation is not None:
+            board.evaluation = self.evaluation.for_board(board)
+        return board
 
-    def _diag_win(self, symbol: str):
+    def is_winner(self, symbol: str) -> bool:
         """
-        Represents a diagonal win.
+        Check if the given symbol has won (row, column, diagonal).
+        Domains: rows, columns, diagonal (left --> right) and anti-diagonal (left <-- right)
 
-        Parameters:
-            symbol (str): A Player symbol('X' or 'O')
+        Every move already checked the lines through its cell, so this only
+        looks up whether one of the symbol's moves completed a line.
 
+        Parameter:
+            symbol (str): The player symbol, i.e "X" or "O"
 
         Returns:
-            bool: Returns True if a diagonal cell == a symbol, Return False otherwise.
+            bool: True if the symbol wins, False otherwise.
         """
-        # Symbol must always be uppercase, so make sure to change to uppercase
-        symbol = symbol.upper()
-
-        # Capture the gameboard size
-        indexes = len(self.game_board)
 
-        # Check the diagonal in a single pass
-        for index in range(indexes):
-            if self.game_board[index][index] != symbol:
-                return False
-
-        return True
+        # Symbol must always be uppercase, so make sure to change to uppercase
+        return self._wins.get(symbol.upper(), 0) > 0
 
-    def _col_win(self, symbol: str):
+    def winning_line(self) -> Union[tuple[tuple[int, int], ...], None]:
         """
-        Represents a column win.
-
-        Parameters:
-            symbol (str): A Player symbol('X' or 'O')
+        Return the cells of a completed line, e.g. to highlight it.
 
+        The moves are looked at last made first, so on a finished game this is
+        the line the last move completed.
 
         Returns:
-            bool: Returns True if a column cell == a symbol, Return False otherwise.
+            Union[tuple[tuple[int, int], ...], None]: The (row, col) of the line's cells, None if no line is complete.
         """
 
-        # Symbol must always be uppercase, so make sure to change to uppercase
-        symbol = symbol.upper()
+        if not (self.is_winner("X") or self.is_winner("O")):
+            return None
 
-        # Capture the row and column sizes
-        rows = len(self.game_board)
-        cols = len(self.game_board[0])
+        cells = self.game_board
+        for row, col in reversed(self.move_stack):
+            symbol = cells[row][col]
+            for line in self.cell_lines[(row, col)]:
+                if all(cells[r][c] == symbol for r, c in line):
+                    return line
 
-        # Check the columns to see if we find a winning column
-        for row in range(rows):
-            # Set column win to true and check for a false state (a non-matching symbol)
-            # Define sentinels
-            col_win = True
-
-            # This inner for loop checks each column for a winner
-            # log.info("\n\nChecking Columns: ")
-            # log.info(f"Rows: [0, 1, 2], Col: {row}")
-            for col in range(cols):
-                # Test the columns
-                # log.info(f"Col: {row}, Row: {col}")
-                # log.info(f"{self.gameboard[col][row]}", end="\n")
-                if self.game_board[col][row] != symbol:
-                    col_win = False
-
-            # Check if you have a column win and return before resetting the variable
-            if col_win:
-                return True
-
-        return False
+        return None
 
-    def _row_win(self, symbol: str):
+    def _is_winning_move(self, row: int, col: int, symbol: str) -> bool:
         """
-        Represents a row win.
+        Check if the symbol at (row, col) completes a line.
+        Only the lines through the cell are checked, so this is O(win_length)
+        per line instead of a scan of the whole board.
 
         Parameters:
+            row (int): Row index of the move.
+            col (int): Column index of the move.
             symbol (str): A Player symbol('X' or 'O')
 
-
         Returns:
-            bool: Returns True if a row cell == a symbol, Return False otherwise.
+            bool: Returns True if every cell of a line through (row, col) == the symbol.
         """
 
-        # Symbol must always be uppercase, so make sure to change to uppercase
-        symbol = symbol.upper()
-        # Capture the row and column sizes
-        rows = len(self.game_board)
-        cols = len(self.game_board[0])
-
-        # Check the rows to see if we find a winning row
-        for row in range(rows):
-            # Set row win to true and check for a false state (a non-matching symbol)
-            # Define sentinels
-            row_win = True
-
-            # This inner for loop checks each row for a winner
-            for col in range(cols):
-                if self.game_board[row][col] != symbol:
-                    row_win = False
-
-            # Check if you have a row win and return before resetting the variable
-            if row_win:
+        for line in self.cell_lines[(row, col)]:
+            if all(self.game_board[r][c] == symbol for r, c in line):
                 return True
 
         return False
@@ -259,41 +471,42 @@ class GameBoard:
         """
         Check if the board is full (no empty spaces).
 
-
         Returns:
             bool: Returns True if there are 0 empty cell, else returns false
         """
 
-        # If there are 0 empty cells in the board return True
-        if len(self.get_empty_cells()) == 0:
-            return True
-
-        # Else if there are empty cells return False
-        else:
-            return False
+        # No bit left means no empty cell
+        return self.empty_mask == 0
 
     def get_empty_cells(self) -> list[tuple[int, int]]:
         """
-        Return a list of (row, col) tuples for empty cells.
+        Return a list of (row, col) tuples for empty cells, in row-major order.
 
         Returns:
             list[tuple[int, int]]: List of empty cell coordinates.
-            example: [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 0)]
+            example: [(0, 0), (0, 1), (0, 2), (1, 2), (2, 0), (2, 2)]
         """
+        return list(self.iter_empty_cells())
 
-        # Empty tuple
-        empty_cells = []
+    def iter_empty_cells(self):
+        """
+        Iterate over the empty cells in row-major order, without building a list.
 
-        # Iterates through the rows in self.gameboard
-        for row in range(len(self.game_board)):
-            # Iterates through the columns in self.gameboard
-            for col in range(len(self.game_board[row])):
-                # If a cell in self.gameboard is empty add it to the empty cell tuple
-                if len(self.game_board[row][col]) == 0:
-                    empty_cells.append((row, col))
+        The empty cells are taken when the iteration starts, so moves can be
+        made and undone on the board while iterating, like a search does.
 
-        # Return the tuple containing a list of empty cells
-        return empty_cells
+        Returns:
+            Iterator[tuple[int, int]]: The (row, col) of each empty cell.
+        """
+
+        cells = self.cells
+        mask = self.empty_mask
+
+        # Takes the lowest set bit until none is left
+        while mask:
+            low_bit = mask & -mask
+            yield cells[low_bit.bit_length() - 1]
+            mask ^= low_bit
 
     def display(self) -> None:
         """
@@ -305,9 +518,9 @@ class GameBoard:
 
         print()
         for row in self.game_board:
-            # Newline sentinel used to parse and format the 3X3 2D array
-            # so it is stacked 3X3.
-            newline = 3
+            # Newline sentinel used to parse and format the 2D array
+            # so it is stacked size x size.
+            newline = self.size
 
             # Starts a new row
             print("[ ", end="")
@@ -335,30 +548,13 @@ class GameBoard:
         Returns:
             board (str): the game board
         """
-        # get the size of the game boards rows and column
-        rows = len(self.game_board)
+        # get the size of the game boards columns
         cols = len(self.game_board[0])
 
-        # create a string variable container to hold the game board
-        board: str = "\n"
-
-        # construct the game board using a loop
-        for row in range(rows):  # row => [0, 1, 2]
-            for col in range(cols):  # columns => [0, 1, 2]
+        # The row separator, i.e. "--+---+--" for a 3x3 board, including a newline
+        # symbol at the beginning and end of the row separator
+        separator = "\n" + "+".join(["--"] + ["---"] * (cols - 2) + ["--"]) + "\n" if cols > 1 else "\n-\n"
 
-                # append the board with the symbol and a vertical bar if not
-                # last column
-                if col != 2:
-                    board += f"{self.game_board[row][col]} | "
-
-                # else if it's the last column then just append with the symbol
-                else:
-                    board += f"{self.game_board[row][col]}"
-
-            # If it's not the last row, add the row separator after each row
-            # has been added to the game board container, including a newline symbol to
-            # the beginning and end of the row separator.
-            if row != 2:
-                board += "\n--+---+--\n"
-
-        return board
+        # Each row is its symbols joined by vertical bars, and the rows are joined
+        # by the separator, so the string is built in one go instead of with +=
+        return "\n" + separator.join(" | ".join(row) for row in self.game_board)
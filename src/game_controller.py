@@ -1,8 +1,13 @@
 # File: game_controller.py
+from typing import Union
+
 from src.ai_player import AIPlayer
 from src.game_board import GameBoard
+from src.game_record import GameRecordWriter, UNFINISHED, board_result
 from src.human_player import HumanPlayer
 from src.logger import getLogger
+from src.player import Player
+from src.search_report import SearchReport
 
 log = getLogger(__name__)
 
@@ -25,7 +30,7 @@ class GameController:
     >>>     log.info(f"Its the {player} turn!")
     """
 
-    def __init__(self, human: HumanPlayer, ai: AIPlayer, board: GameBoard):
+    def __init__(self, human: HumanPlayer, ai: AIPlayer, board: GameBoard, time_limit: Union[float, None] = None):
         """
         Initialize the game with players and a board.
 
@@ -33,12 +38,85 @@ class GameController:
             human (HumanPlayer): The human player.
             AI (AIPlayer): The AI player.
             board (GameBoard): The game board instance.
+            time_limit (float): The time budget of each AI move in seconds, None for no limit.
         """
 
         self.human = human
         self.ai = ai
         self.board = board
         self.current_player = human
+        self.time_limit = time_limit
+
+        # The search reports of the AI moves of the current game
+        self.search_reports: list[SearchReport] = []
+
+        # Writes the moves to a game record as they are made, see attach_recorder
+        self.recorder: Union[GameRecordWriter, None] = None
+        self._game_recorded = False
+
+    def reset(self) -> None:
+        """
+        Start a new game: empty the board, give the turn to the human player
+        and forget the search reports of the last game.
+        """
+
+        # A game left before its end is recorded as unfinished
+        if self.recorder is not None and self.recorder.moves_in_game:
+            self.recorder.end_game(UNFINISHED)
+        self._game_recorded = False
+
+        self.board.reset()
+        self.current_player = self.human
+        self.search_reports = []
+
+    def attach_recorder(self, recorder: Union[GameRecordWriter, None]) -> None:
+        """
+        Record the games played from now on, every move made with make_move
+        is written as it is made and the result at the end of the game.
+        The moves already on the board are written first.
+
+        Parameters:
+            recorder (GameRecordWriter): The record file writer, None to stop recording.
+        """
+
+        self.recorder = recorder
+        self._game_recorded = False
+        if recorder is not None:
+            for row, col in self.board.move_stack:
+                recorder.write_move(row, col)
+            self._record_result()
+
+    def make_move(self, row: int, col: int, player: Player) -> tuple[bool, str]:
+        """
+        Place the player's symbol on the board, and record the move.
+
+        Parameters:
+            row (int): Row index (0 to size - 1).
+            col (int): Column index (0 to size - 1).
+            player (Player): The player making the move.
+
+        Returns:
+            tuple[bool, str]: (True, "") if the move was made, (False, message) otherwise.
+        """
+
+        moved, message = self.board.make_move(row, col, player.symbol)
+
+        # Moves made after the end of the game are not part of it
+        if moved and self.recorder is not None and not self._game_recorded:
+            self.recorder.write_move(row, col)
+            self._record_result()
+
+        return moved, message
+
+    def _record_result(self) -> None:
+        """
+        Write the result to the recorder if the game is over.
+        """
+
+        result = board_result(self.board)
+        if result is not None and self.recorder.moves_in_game:
+            self.recorder.end_game(result)
+            self._game_recorded = True
 
     def switch_player(self) -> None:
         """
@@ -84,12 +162,51 @@ class GameController:
         else:
             return False, ""
 
-    def find_best_ai_move(self):
+    def find_best_ai_move(self, time_limit: Union[float, None] = None):
         """
         Returns the best AI move.
 
+        Parameters:
+            time_limit (float): The time budget in seconds, the controller's time_limit if None.
+
         Returns:
         ========
         tuple[int, int]: The best move
         """
-        return self.ai.find_best_move(self.board)
+        move = self.ai.find_best_move(self.board, time_limit if time_limit is not None else self.time_limit)
+        self.add_search_report(self.ai.strategy.last_report)
+        return move
+
+    def add_search_report(self, report: Union[SearchReport, None]) -> None:
+        """
+        Keep the report of an AI search, strategies that don't report give None.
+
+        Parameters:
+            report (SearchReport): The report of the search.
+        """
+
+        if report is not None:
+            self.search_reports.append(report)
+
+    def search_summary(self) -> dict:
+        """
+        Add up the search reports of the current game.
+
+        Returns:
+            dict: The searches, nodes, TT hits, cutoffs, total and slowest search time,
+                and nodes per second.
+        """
+
+        reports = self.search_reports
+        elapsed = sum(report.elapsed for report in reports)
+        nodes = sum(report.nodes for report in reports)
+
+        return {
+            "searches": len(reports),
+            "nodes": nodes,
+            "tt_hits": sum(report.tt_hits for report in reports),
+            "cutoffs": sum(report.cutoffs for report in reports),
+            "elapsed": elapsed,
+            "slowest": max((report.elapsed for report in reports), default=0.0),
+            "nodes_per_second": nodes / elapsed if elapsed > 0 else 0.0,
+        }
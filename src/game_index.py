@@ -0,0 +1,542 @@
+"""
+A game index answers "which archived games passed through this position,
+and how did they end?" with a binary search in a memory-mapped file,
+instead of replaying the archive.
+
+The index is built in bulk from game record files (src/game_record.py),
+with an external sort: sorted runs of a chunk of games each are written to
+temporary files and merged, so the memory used doesn't grow with the
+archive. Games are numbered in the order they are read, the files one after the
+other. Positions are keyed by their canonical Zobrist hash
+(GameBoard.canonical_hash), so a position and its rotations and
+reflections are one entry; the hashes are computed with NumPy for a whole
+chunk of games at once, one move of every game at a time.
+
+It also answers opening-line (prefix) queries: the games whose first moves
+are exactly the given moves, in that order.
+
+File layout (little-endian, every section starts on an 8-byte boundary):
+
+    header:     magic "TTTI", version, size, win_length,
+                games, positions, postings, move bytes        4s u8 u8 u8 x u64 u64 u64 u64
+    keys:       uint64 per position, sorted
+    positions:  per position: start and count of its games in postings,
+                and its draws, X wins, O wins, unfinished      u64 u32 u32 * 4
+    postings:   uint32 game ids, grouped by position, ascending in each group
+    games:      per game: offset in moves, length, result       u64 u8 u8
+    openings:   uint32 game ids sorted by their moves
+    moves:      the moves of every game, one byte per move
+
+Build and query an index with:
+
+    python -m src.game_index build archive.idx selfplay.rec
+    python -m src.game_index query archive.idx 1,1 0,0
+"""
+
+# File: game_index.py
+import argparse
+import bisect
+import itertools
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, Union
+
+import numpy as np
+
+from src.bit_board import BitBoard
+from src.game_board import GameBoard, zobrist_keys
+from src.game_record import GameRecord, read_record_header, read_records
+from src.logger import configure_logging, getLogger
+
+log = getLogger(__name__)
+
+# --------------------------------------------------------------
+# File format
+# --------------------------------------------------------------
+MAGIC = b"TTTI"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBxQQQQ")
+
+POSITION = np.dtype([("start", "<u8"), ("count", "<u4"), ("results", "<u4", (4,))])
+GAME = np.dtype([("offset", "<u8"), ("length", "u1"), ("result", "u1")])
+
+# Positions hashed and sorted in memory at a time while building
+CHUNK_MOVES = 1 << 22
+
+# The memory of the run blocks while merging them
+MERGE_MEMORY = 64 << 20
+
+# The buffer of the copies of the sections into the index
+COPY_BUFFER = 1 << 20
+
+
+class PositionStats(NamedTuple):
+    """
+    The games found by a lookup.
+
+    Attributes:
+        games (np.ndarray): The ids of the games, ascending (None if not asked for).
+        draws (int): How many of them were drawn.
+        x_wins (int): How many X won.
+        o_wins (int): How many O won.
+        unfinished (int): How many were stopped before their end.
+    """
+    games: Union[np.ndarray, None]
+    draws: int
+    x_wins: int
+    o_wins: int
+    unfinished: int
+
+    @property
+    def total(self) -> int:
+        """
+        The number of games found.
+        """
+        return self.draws + self.x_wins + self.o_wins + self.unfinished
+
+
+def _aligned(offset: int) -> int:
+    """
+    Round a file offset up to a multiple of 8.
+    """
+    return (offset + 7) & ~7
+
+
+def _chunks(records: Iterator[GameRecord], max_moves: int) -> Iterator[list[GameRecord]]:
+    """
+    Group records into lists holding about max_moves positions (moves plus the empty board) each.
+    """
+
+    chunk = []
+    positions = 0
+    for record in records:
+        chunk.append(record)
+        positions += len(record.moves) + 1
+        if positions >= max_moves:
+            yield chunk
+            chunk = []
+            positions = 0
+    if chunk:
+        yield chunk
+
+
+def _write_run(entries: np.ndarray, directory: str, name: str) -> np.ndarray:
+    """
+    Sort the entries of a chunk by their key and write them as a run file.
+
+    The sort is stable, so entries with the same key keep their order.
+
+    Returns:
+        np.ndarray: The run, memory-mapped read-only.
+    """
+
+    path = os.path.join(directory, name)
+    entries[np.argsort(entries["key"], kind="stable")].tofile(path)
+    return np.memmap(path, dtype=entries.dtype, mode="r") if len(entries) else entries[:0]
+
+
+def _merge_runs(runs: list[np.ndarray], memory: int) -> Iterator[np.ndarray]:
+    """
+    Merge runs sorted by their "key" field, a block of each run at a time.
+
+    The batches come out in key order, every entry of a key in the same
+    batch, and entries with equal keys in the order of the runs (then in
+    their order in the run).
+
+    Parameters:
+        runs (list[np.ndarray]): The sorted runs, of the same dtype.
+        memory (int): About the bytes the blocks of the runs may take together.
+
+    Returns:
+        Iterator[np.ndarray]: The sorted batches.
+    """
+
+    if not runs:
+        return
+
+    block = max(1024, memory // (len(runs) * runs[0].dtype.itemsize))
+    windows = [run[:0] for run in runs]
+    loaded = [0] * len(runs)
+
+    def load(i: int) -> None:
+        # Reads the next block of run i after what is left of its window
+        data = np.array(runs[i][loaded[i]:loaded[i] + block])
+        windows[i] = np.concatenate((windows[i], data)) if len(windows[i]) else data
+        loaded[i] += len(data)
+
+    while True:
+        for i in range(len(runs)):
+            if not len(windows[i]) and loaded[i] < len(runs[i]):
+                load(i)
+
+        # The runs not read to the end, the entries still in them can't be smaller than their window's last key
+        pending = [i for i in range(len(runs)) if loaded[i] < len(runs[i])]
+        if pending:
+            bound = min(windows[i]["key"][-1] for i in pending)
+            cuts = [int(np.searchsorted(window["key"], bound, "left")) for window in windows]
+            if not any(cuts):
+                # Every window starts at the bound, the runs ending on it are read further
+                for i in pending:
+                    if windows[i]["key"][-1] == bound:
+                        load(i)
+                continue
+        else:
+            cuts = [len(window) for window in windows]
+            if not any(cuts):
+                return
+
+        batch = np.concatenate([window[:cut] for window, cut in zip(windows, cuts)])
+        windows = [window[cut:] for window, cut in zip(windows, cuts)]
+        yield batch[np.argsort(batch["key"], kind="stable")]
+
+
+def _copy_section(file: BinaryIO, path: str) -> None:
+    """
+    Append a section file to the index, on an 8-byte boundary.
+    """
+
+    file.write(b"\0" * (_aligned(file.tell()) - file.tell()))
+    with open(path, "rb") as section:
+        shutil.copyfileobj(section, file, COPY_BUFFER)
+
+
+def build_index(record_paths: Union[str, Iterable[str]],
+                index_path: str,
+                chunk_moves: int = CHUNK_MOVES,
+                merge_memory: int = MERGE_MEMORY) -> int:
+    """
+    Index every position of the games of record files.
+
+    The index is sorted on disk, so archives far bigger than the memory can
+    be indexed. The games are read chunk_moves positions at a time, each
+    chunk is hashed and sorted in memory (about 40 bytes per position) and
+    written to a temporary run file next to the index, then the runs are
+    merged a block at a time into the sections of the index.
+
+    Parameters:
+        record_paths (Union[str, Iterable[str]]): The record files, of the same board.
+        index_path (str): The index file to write.
+        chunk_moves (int): The positions hashed and sorted at a time.
+        merge_memory (int): About the bytes the blocks of the runs take while they are merged.
+
+    Returns:
+        int: The number of games indexed.
+    """
+
+    paths = [record_paths] if isinstance(record_paths, str) else list(record_paths)
+    boards = {read_record_header(path)[:2] for path in paths}
+    if len(boards) != 1:
+        raise ValueError(f"The record files hold games of different boards: {sorted(boards)}.")
+    size, win_length = boards.pop()
+
+    # (2, cells, 8): the 8 symmetric keys of each cell, X then O
+    keys_table = np.array([zobrist_keys(size)["X"], zobrist_keys(size)["O"]], dtype=np.uint64)
+
+    # The run entries: a position reached by a game, and a game keyed by its padded moves
+    # as one string (NumPy compares them like bytes, so a shorter game sorts first)
+    posting_dtype = np.dtype([("key", "<u8"), ("game", "<u4"), ("result", "u1")])
+    opening_dtype = np.dtype([("key", f"S{size * size}"), ("game", "<u4")])
+
+    index_directory = os.path.dirname(os.path.abspath(index_path))
+    os.makedirs(index_directory, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=index_directory, prefix=".index-") as directory:
+        position_runs, opening_runs = [], []
+        games = 0
+        move_bytes = 0
+
+        with open(os.path.join(directory, "games"), "wb") as games_file, \
+                open(os.path.join(directory, "moves"), "wb") as moves_file:
+
+            records = itertools.chain.from_iterable(read_records(path) for path in paths)
+            for chunk in _chunks(records, chunk_moves):
+                count = len(chunk)
+                ids = np.arange(games, games + count, dtype=np.uint32)
+                lengths = np.fromiter((len(record.moves) for record in chunk), dtype=np.int64, count=count)
+                results = np.fromiter((record.result for record in chunk), dtype=np.uint8, count=count)
+                flat = np.frombuffer(b"".join(record.moves for record in chunk), dtype=np.uint8)
+
+                # One row per game, the cell + 1 of each move, 0 after the last move
+                padded = np.zeros((count, size * size), dtype=np.uint8)
+                starts = np.cumsum(lengths) - lengths
+                padded[np.repeat(np.arange(count), lengths), np.arange(len(flat)) - np.repeat(starts, lengths)] = flat + 1
+
+                # Every game passes through the empty board, its hash is 0
+                hashes = np.zeros((count, 8), dtype=np.uint64)
+                key_parts = [np.zeros(count, dtype=np.uint64)]
+                id_parts = [ids]
+
+                for ply in range(int(lengths.max(initial=0))):
+                    playing = lengths > ply
+                    cells = padded[playing, ply].astype(np.intp) - 1
+                    hashes[playing] ^= keys_table[ply % 2, cells]
+                    key_parts.append(hashes[playing].min(axis=1))
+                    id_parts.append(ids[playing])
+
+                # A position is reached at one ply only, so the stable sort keeps its games ascending
+                postings = np.empty(sum(len(part) for part in key_parts), dtype=posting_dtype)
+                postings["key"] = np.concatenate(key_parts)
+                postings["game"] = np.concatenate(id_parts)
+                postings["result"] = results[postings["game"] - games]
+                del key_parts, id_parts
+                position_runs.append(_write_run(postings, directory, f"positions-{len(position_runs)}"))
+                del postings
+
+                openings = np.empty(count, dtype=opening_dtype)
+                openings["key"] = padded.view(opening_dtype["key"]).ravel()
+                openings["game"] = ids
+                opening_runs.append(_write_run(openings, directory, f"openings-{len(opening_runs)}"))
+                del openings, padded, hashes
+
+                game_table = np.zeros(count, dtype=GAME)
+                game_table["offset"] = move_bytes + starts
+                game_table["length"] = lengths
+                game_table["result"] = results
+                game_table.tofile(games_file)
+                moves_file.write(flat.tobytes())
+
+                games += count
+                move_bytes += len(flat)
+                log.debug(f"Hashed {games} games")
+
+        # The positions: games of a key are in ascending order, the earlier runs hold the lower ids
+        position_count = posting_count = 0
+        with open(os.path.join(directory, "keys"), "wb") as keys_file, \
+                open(os.path.join(directory, "positions"), "wb") as positions_file, \
+                open(os.path.join(directory, "postings"), "wb") as postings_file:
+
+            for batch in _merge_runs(position_runs, merge_memory):
+                keys = batch["key"]
+
+                # A position starts where its key differs from the one before
+                first = np.ones(len(keys), dtype=bool)
+                first[1:] = keys[1:] != keys[:-1]
+                starts = np.flatnonzero(first)
+
+                positions = np.zeros(len(starts), dtype=POSITION)
+                positions["start"] = posting_count + starts
+                positions["count"] = np.diff(starts, append=len(keys))
+                for result in range(4):
+                    positions["results"][:, result] = np.add.reduceat((batch["result"] == result).astype(np.uint32),
+                                                                      starts)
+
+                keys[starts].astype("<u8").tofile(keys_file)
+                positions.tofile(positions_file)
+                batch["game"].astype("<u4").tofile(postings_file)
+                position_count += len(starts)
+                posting_count += len(keys)
+
+        # The openings: the games sorted by their moves, the first move first
+        with open(os.path.join(directory, "openings"), "wb") as openings_file:
+            for batch in _merge_runs(opening_runs, merge_memory):
+                batch["game"].astype("<u4").tofile(openings_file)
+
+        del position_runs, opening_runs
+
+        with open(index_path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, size, win_length, games, position_count, posting_count, move_bytes))
+            for name in ("keys", "positions", "postings", "games", "openings", "moves"):
+                _copy_section(file, os.path.join(directory, name))
+
+    log.info(f"Indexed {position_count} positions of {games} games in {index_path}")
+    return games
+
+
+class _Openings:
+    """
+    The games of an index in opening order, each read as its first moves
+    when bisect looks at it, so nothing is loaded up front.
+    """
+
+    def __init__(self, index: "GameIndex", length: int):
+        self.index = index
+        self.length = length
+
+    def __len__(self) -> int:
+        return len(self.index._openings)
+
+    def __getitem__(self, position: int) -> bytes:
+        return self.index._game_moves(int(self.index._openings[position]))[:self.length]
+
+
+class GameIndex:
+    """
+    A memory-mapped game index: lookups binary-search the file, nothing is
+    loaded up front.
+
+    Example:
+    ========
+    >>> from src.game_index import GameIndex
+    >>> index = GameIndex("archive.idx")
+    >>> # The games through the position on the board, whoever reached it how
+    >>> stats = index.lookup(board)
+    >>> stats.total, stats.x_wins
+    >>> # The games that opened with the centre, then a corner
+    >>> index.opening([(1, 1), (0, 0)]).games
+    """
+
+    def __init__(self, path: str):
+        """
+        Open and map an index file.
+
+        Parameters:
+            path (str): The index file, build it with build_index.
+        """
+
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.size, self.win_length, self.games, positions, postings, move_bytes = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} game index.")
+
+        # Views of the sections, straight on the mapped file
+        offset = HEADER.size
+        sections = []
+        for dtype, count in ((np.dtype("<u8"), positions), (POSITION, positions), (np.dtype("<u4"), postings),
+                             (GAME, self.games), (np.dtype("<u4"), self.games)):
+            offset = _aligned(offset)
+            sections.append(np.frombuffer(self._map, dtype=dtype, count=count, offset=offset))
+            offset += dtype.itemsize * count
+        self._keys, self._positions, self._postings, self._games, self._openings = sections
+        self._moves_offset = _aligned(offset)
+
+    def __len__(self) -> int:
+        """
+        The number of positions in the index.
+        """
+        return len(self._keys)
+
+    def position_key(self, position: Union[GameBoard, list[tuple[int, int]]]) -> int:
+        """
+        Return the key of a position.
+
+        Parameters:
+            position (Union[GameBoard, list[tuple[int, int]]]): A board, or the moves from
+                the empty board (X first).
+
+        Returns:
+            int: The canonical hash of the position.
+        """
+
+        if isinstance(position, GameBoard):
+            return position.canonical_hash()
+
+        board = BitBoard(self.size, self.win_length)
+        for ply, (row, col) in enumerate(position):
+            board.make_move(row, col, "X" if ply % 2 == 0 else "O")
+        return board.canonical_hash()
+
+    def lookup(self, position: Union[GameBoard, list[tuple[int, int]], int], with_games: bool = True) -> PositionStats:
+        """
+        Find the games that passed through a position, or one of its rotations and reflections.
+
+        Parameters:
+            position (Union[GameBoard, list[tuple[int, int]], int]): A board, the moves from
+                the empty board, or a key from position_key.
+            with_games (bool): Also return the game ids, not just the counts.
+
+        Returns:
+            PositionStats: The games and how they ended, all 0 if the position isn't in the index.
+        """
+
+        key = position if isinstance(position, int) else self.position_key(position)
+        found = int(np.searchsorted(self._keys, np.uint64(key)))
+        if found == len(self._keys) or int(self._keys[found]) != key:
+            return PositionStats(np.zeros(0, dtype=np.uint32) if with_games else None, 0, 0, 0, 0)
+
+        record = self._positions[found]
+        start, count = int(record["start"]), int(record["count"])
+        # A copy, so the index can be closed while the ids are still used
+        games = np.array(self._postings[start:start + count]) if with_games else None
+        return PositionStats(games, *(int(result) for result in record["results"]))
+
+    def opening(self, moves: list[tuple[int, int]], with_games: bool = True) -> PositionStats:
+        """
+        Find the games whose first moves are exactly these moves, in this order.
+
+        Parameters:
+            moves (list[tuple[int, int]]): The opening moves, X first.
+            with_games (bool): Also return the game ids, not just the counts.
+
+        Returns:
+            PositionStats: The games and how they ended.
+        """
+
+        prefix = bytes(row * self.size + col for row, col in moves)
+
+        # The sorted games, read as their first moves (bisect has no key= before Python 3.10)
+        openings = _Openings(self, len(prefix))
+        low = bisect.bisect_left(openings, prefix)
+        high = bisect.bisect_right(openings, prefix, lo=low)
+
+        games = np.sort(self._openings[low:high])
+        results = np.bincount(self._games["result"][games], minlength=4)
+        return PositionStats(games if with_games else None, *(int(result) for result in results[:4]))
+
+    def game(self, game_id: int) -> GameRecord:
+        """
+        Return an indexed game.
+
+        Parameters:
+            game_id (int): The id of the game.
+
+        Returns:
+            GameRecord: Its moves and result.
+        """
+        return GameRecord(self._game_moves(game_id), int(self._games[game_id]["result"]))
+
+    def _game_moves(self, game_id: int) -> bytes:
+        """
+        Return the moves of a game, one cell per byte.
+        """
+
+        record = self._games[game_id]
+        start = self._moves_offset + int(record["offset"])
+        return self._map[start:start + int(record["length"])]
+
+    def close(self) -> None:
+        """
+        Unmap the file.
+        """
+
+        # The views must go before the map can be closed
+        self._keys = self._positions = self._postings = self._games = self._openings = None
+        self._map.close()
+
+    def __enter__(self) -> "GameIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query an index of the positions of archived games.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="index game record files")
+    build.add_argument("index", help="the index file to write")
+    build.add_argument("records", nargs="+", help="the game record files, of the same board")
+
+    query = commands.add_parser("query", help="look a position and an opening up")
+    query.add_argument("index", help="the index file")
+    query.add_argument("moves", nargs="*", help="the moves from the empty board as row,col, X first")
+    args = parser.parse_args()
+
+    configure_logging(log_to_file=False)
+
+    if args.command == "build":
+        build_index(args.records, args.index)
+    else:
+        line = [tuple(int(part) for part in move.split(",")) for move in args.moves]
+        with GameIndex(args.index) as index:
+            for name, stats in (("Position", index.lookup(line, with_games=False)),
+                                ("Opening", index.opening(line))):
+                print(f"{name}: {stats.total} games, {stats.x_wins} X wins, {stats.o_wins} O wins, "
+                      f"{stats.draws} draws, {stats.unfinished} unfinished")
@@ -0,0 +1,349 @@
+"""
+Game records store played games compactly, one byte per move, so archives
+of millions of games stay small and are read back fast.
+
+Record file layout (append-only):
+
+    header:  magic "TTTR", version, size, win_length      4s u8 u8 u8
+             X player, O player (e.g. the strategy)       u8 length + UTF-8 each
+    games:   one after the other
+             moves     u8 per move, the cell (row * size + col), X moves first
+             result    u8, RESULT_BASE + DRAW, X_WINS, O_WINS or UNFINISHED
+
+The cells are below RESULT_BASE (boards up to 15x15), so the result byte
+also ends the game: a game needs no length, its moves can be written as
+they are played, and a 3x3 game takes at most 10 bytes.
+
+Example:
+========
+>>> with GameRecordWriter("games.rec", 3, 3, "human", "AlphaBetaStrategy") as writer:
+>>>     writer.write_game([4, 0, 8], DRAW)
+>>> for record in read_records("games.rec"):
+>>>     print(record.coordinates(3), record.result)
+"""
+
+# File: game_record.py
+import os
+import re
+import struct
+from typing import BinaryIO, Iterator, NamedTuple, Union
+
+from src.game_board import GameBoard
+from src.logger import getLogger
+
+log = getLogger(__name__)
+
+# --------------------------------------------------------------
+# File format
+# --------------------------------------------------------------
+MAGIC = b"TTTR"
+VERSION = 1
+HEADER = struct.Struct("<4sBBB")
+
+# A byte at or above RESULT_BASE is a result, below it a move
+RESULT_BASE = 0xF0
+
+# Results of the games
+DRAW = 0
+X_WINS = 1
+O_WINS = 2
+# The game was stopped before its end (reset, closed window)
+UNFINISHED = 3
+
+# Finds the result bytes, the ends of the games
+_RESULT_BYTE = re.compile(rb"[\xf0-\xff]")
+
+# Bytes read at a time
+READ_CHUNK = 1 << 20
+
+
+class RecordHeader(NamedTuple):
+    """
+    The header of a record file.
+
+    Attributes:
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win.
+        x_player (str): Who played X, e.g. "human" or a strategy name.
+        o_player (str): Who played O.
+    """
+    size: int
+    win_length: int
+    x_player: str
+    o_player: str
+
+
+class GameRecord(NamedTuple):
+    """
+    One recorded game.
+
+    Attributes:
+        moves (bytes): The cell (row * size + col) of each move, X moved first.
+        result (int): DRAW, X_WINS, O_WINS or UNFINISHED.
+    """
+    moves: bytes
+    result: int
+
+    def coordinates(self, size: int) -> list[tuple[int, int]]:
+        """
+        Return the moves as (row, col).
+
+        Parameters:
+            size (int): The number of rows (and columns) of the board.
+
+        Returns:
+            list[tuple[int, int]]: The moves.
+        """
+        return [divmod(cell, size) for cell in self.moves]
+
+
+def board_result(board: GameBoard) -> Union[int, None]:
+    """
+    Return the result of a finished game, None if it isn't over.
+
+    Parameters:
+        board (GameBoard): The game board instance.
+
+    Returns:
+        int: DRAW, X_WINS or O_WINS, None if the game goes on.
+    """
+
+    if board.is_winner("X"):
+        return X_WINS
+    if board.is_winner("O"):
+        return O_WINS
+    if board.is_full():
+        return DRAW
+    return None
+
+
+def encode_game(moves: Union[list[int], bytes], result: int) -> bytes:
+    """
+    Encode one game as it is stored in a record file.
+
+    Parameters:
+        moves (list[int]): The cells of the moves.
+        result (int): DRAW, X_WINS, O_WINS or UNFINISHED.
+
+    Returns:
+        bytes: The moves followed by the result byte.
+    """
+    return bytes(moves) + bytes((RESULT_BASE + result,))
+
+
+def _encode_name(name: str) -> bytes:
+    """
+    Encode a player name of the header, its length first.
+    """
+
+    data = name.encode()[:255]
+    return bytes((len(data),)) + data
+
+
+def _read_name(file: BinaryIO) -> str:
+    """
+    Read a player name of the header.
+    """
+
+    length = file.read(1)
+    if not length:
+        raise ValueError("The record header is cut off.")
+    return file.read(length[0]).decode(errors="replace")
+
+
+def _read_header(file: BinaryIO, path: str) -> RecordHeader:
+    """
+    Read the header at the start of an open record file, the file is left after it.
+    """
+
+    data = file.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a game record file.")
+
+    magic, version, size, win_length = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} game record file.")
+
+    return RecordHeader(size, win_length, _read_name(file), _read_name(file))
+
+
+def read_record_header(path: str) -> RecordHeader:
+    """
+    Read the header of a record file.
+
+    Parameters:
+        path (str): The record file.
+
+    Returns:
+        RecordHeader: The board and players of the games.
+    """
+
+    with open(path, "rb") as file:
+        return _read_header(file, path)
+
+
+def read_records(path: str, chunk_size: int = READ_CHUNK) -> Iterator[GameRecord]:
+    """
+    Read the games of a record file one at a time, in the order they were written.
+
+    The file is read chunk_size bytes at a time, so files of any size are
+    read in constant memory. Moves after the last result byte (a game cut
+    off when the writer stopped) come out as an UNFINISHED game.
+
+    Parameters:
+        path (str): The record file.
+        chunk_size (int): The bytes read at a time.
+
+    Returns:
+        Iterator[GameRecord]: The games.
+    """
+
+    with open(path, "rb") as file:
+        _read_header(file, path)
+        pending = b""
+
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+
+            buffer = pending + chunk if pending else chunk
+            start = 0
+            for match in _RESULT_BYTE.finditer(buffer):
+                end = match.start()
+                yield GameRecord(buffer[start:end], buffer[end] - RESULT_BASE)
+                start = end + 1
+
+            # The start of a game continued in the next chunk
+            pending = buffer[start:]
+
+        if pending:
+            yield GameRecord(pending, UNFINISHED)
+
+
+class GameRecordWriter:
+    """
+    Appends games to a record file, the header is written when the file is new.
+
+    Moves can be written one at a time as they are played (write_move, then
+    end_game), or a whole game at once (write_game). The file is flushed at
+    the end of every game.
+
+    Example:
+    ========
+    >>> writer = GameRecordWriter("games.rec", 3, 3, "human", "MinimaxStrategy")
+    >>> controller.attach_recorder(writer)
+    >>> # ... the games are played ...
+    >>> writer.close()
+    """
+
+    def __init__(self, path: str, size: int, win_length: int, x_player: str = "", o_player: str = ""):
+        """
+        Open a record file for appending.
+
+        Parameters:
+            path (str): The record file, created if missing.
+            size (int): The number of rows (and columns) of the board.
+            win_length (int): The number of symbols in a row needed to win.
+            x_player (str): Who plays X, e.g. "human" or a strategy name.
+            o_player (str): Who plays O.
+        """
+
+        # A move is stored in one byte below the result bytes
+        if size * size > RESULT_BASE:
+            raise ValueError(f"A game record can't store moves of a {size}x{size} board.")
+
+        self.path = path
+        self.size = size
+        self.header = RecordHeader(size, win_length, x_player, o_player)
+
+        # The moves written since the last result
+        self.moves_in_game = 0
+        self.games = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, "ab")
+
+        # Appending to an existing file is only allowed for the same board and players
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION, size, win_length)
+                            + _encode_name(x_player) + _encode_name(o_player))
+        else:
+            header = read_record_header(path)
+            if header != self.header:
+                self.file.close()
+                raise ValueError(f"{path} holds games of {header}, not {self.header}.")
+
+            # A writer stopped in the middle of a game left moves without a result
+            # byte, the game is ended here so the next one isn't joined to it
+            header_size = HEADER.size + len(_encode_name(x_player)) + len(_encode_name(o_player))
+            if self.file.tell() > header_size:
+                with open(path, "rb") as file:
+                    file.seek(-1, os.SEEK_END)
+                    last_byte = file.read(1)[0]
+                if last_byte < RESULT_BASE:
+                    log.info(f"{path} ends in an unfinished game, it is recorded as UNFINISHED")
+                    self.file.write(bytes((RESULT_BASE + UNFINISHED,)))
+                    self.file.flush()
+
+    def write_move(self, row: int, col: int) -> None:
+        """
+        Append a move of the current game.
+
+        Parameters:
+            row (int): Row index (0 to size - 1).
+            col (int): Column index (0 to size - 1).
+        """
+        self.file.write(bytes((row * self.size + col,)))
+        self.moves_in_game += 1
+
+    def end_game(self, result: int) -> None:
+        """
+        End the current game with its result, and flush the file.
+
+        Parameters:
+            result (int): DRAW, X_WINS, O_WINS or UNFINISHED.
+        """
+        self.file.write(bytes((RESULT_BASE + result,)))
+        self.file.flush()
+        self.moves_in_game = 0
+        self.games += 1
+
+    def write_game(self, moves: Union[list[int], bytes], result: int) -> None:
+        """
+        Append a whole game.
+
+        Parameters:
+            moves (list[int]): The cells of the moves.
+            result (int): DRAW, X_WINS, O_WINS or UNFINISHED.
+        """
+        self.file.write(encode_game(moves, result))
+        self.games += 1
+
+    def write_encoded(self, data: bytes, games: int = 0) -> None:
+        """
+        Append games already encoded with encode_game.
+
+        Parameters:
+            data (bytes): The encoded games.
+            games (int): The number of games in data, for the games count.
+        """
+        self.file.write(data)
+        self.games += games
+
+    def close(self) -> None:
+        """
+        End a game still being written as UNFINISHED, then flush and close the file.
+        """
+
+        if self.file.closed:
+            return
+        if self.moves_in_game:
+            self.end_game(UNFINISHED)
+        self.file.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,595 @@
+"""
+An asyncio TCP server hosting many games at once, each session with its own
+GameController. The human side is played by the client, the server plays
+the AI.
+
+Protocol: one JSON object per line, each request gets one response line.
+Requests may carry an "id", which is sent back with the response.
+
+    {"op": "new", "size": 3, "win_length": 3, "human": "X"}
+        -> {"ok": true, "session": 1, "board": ["...", "...", "..."], "ai_move": null, "over": false}
+    {"op": "move", "session": 1, "row": 1, "col": 1}
+        -> {"ok": true, "session": 1, "board": ["O..", ".X.", "..."], "ai_move": [0, 0], "over": false}
+    {"op": "state", "session": 1}
+    {"op": "close", "session": 1}
+    {"op": "stats"}
+
+    Errors: {"ok": false, "error": "..."}
+
+When the game is over the response also holds "result" (the GameController
+message) and "winner" ("X", "O" or null). The human moves first as X,
+unless "human" is "O", then the AI's first move comes with the "new" response.
+
+A session belongs to the connection that created it and ends with it.
+Requests of one connection are answered in order, and only one line is read
+ahead of the one being answered, so a client that sends faster than it reads
+is slowed down by TCP itself. The read-ahead also notices a client that
+goes away while its AI move is searched: the search is cancelled, like the
+search of a session that is closed. The AI searches run in a bounded
+thread pool: when every worker is busy, up to max_queue searches wait for
+one, beyond that the server answers "busy".
+
+Minimax and alpha-beta only finish on boards above 3x3 with a time limit,
+so a server without one refuses bigger boards for them.
+
+Minimax and alpha-beta keep their results in a search cache of cache_bytes
+per board variant, so the memory of a long-running server stays capped.
+An MCTS session keeps its tree from one move to the next, of tree_nodes
+positions at most, and drops it when its game is over or it ends.
+With a cache_dir the caches are files, and a restarted server doesn't
+search again what it has already searched.
+
+Run it with:
+
+    python server.py --port 8765 --strategy alphabeta --time-limit 0.05
+"""
+
+# File: game_server.py
+import asyncio
+import itertools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+from src.ai_player import AIPlayer
+from src.bit_board import BitBoard
+from src.game_controller import GameController
+from src.human_player import HumanPlayer
+from src.logger import getLogger
+from src.mcts_strategy import MCTSStrategy
+from src.move_strategy import MoveStrategy, SearchCancelled
+from src.search_cache import DEFAULT_MAX_BYTES, SearchCache
+from src.self_play import STRATEGIES
+
+log = getLogger(__name__)
+
+# The largest board a client may ask for
+MAX_BOARD_SIZE = 15
+
+# The longest request line, in bytes
+MAX_LINE = 64 * 1024
+
+# The largest board minimax and alpha-beta search to the end in a sensible
+# time, bigger boards need a time limit
+MAX_UNLIMITED_SIZE = 3
+
+# The most positions in the MCTS tree of a session, about 20 MB on 15x15
+SESSION_TREE_NODES = 10000
+
+
+class RequestError(Exception):
+    """Raised while handling a request, its message is sent back to the client."""
+
+
+def board_rows(controller: GameController) -> list[str]:
+    """
+    Return the board as one string per row, "." for an empty cell.
+
+    Parameters:
+        controller (GameController): The game controller instance.
+
+    Returns:
+        list[str]: The rows, e.g. ["X.O", "...", "..."].
+    """
+    return ["".join(cell or "." for cell in row) for row in controller.board.game_board]
+
+
+class GameServer:
+    """
+    Serves games over TCP with a line-delimited JSON protocol (see the module docstring).
+
+    Example:
+    ========
+    >>> server = GameServer(port=8765, strategy="alphabeta", time_limit=0.05)
+    >>> asyncio.run(server.serve_forever())
+    """
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 8765,
+                 strategy: str = "alphabeta",
+                 time_limit: Union[float, None] = None,
+                 max_sessions: int = 10000,
+                 max_workers: Union[int, None] = None,
+                 max_queue: int = 1000,
+                 idle_timeout: float = 300.0,
+                 cache_dir: Union[str, None] = None,
+                 cache_bytes: int = DEFAULT_MAX_BYTES,
+                 tree_nodes: int = SESSION_TREE_NODES):
+        """
+        Configure the server, start() opens the socket.
+
+        Parameters:
+            host (str): The address to listen on, localhost by default.
+            port (int): The port to listen on, 0 for any free port.
+            strategy (str): The AI strategy, a name of self_play.STRATEGIES.
+            time_limit (float): The time budget of each AI move in seconds, None for no limit
+                (minimax and alpha-beta then only play boards up to 3x3).
+            max_sessions (int): The most sessions open at once, over all connections.
+            max_workers (int): The most AI searches running at once, the number of CPUs if None.
+            max_queue (int): The most AI searches waiting for a worker, more are answered "busy".
+            idle_timeout (float): Seconds without a request before a connection is closed.
+            cache_dir (str): The directory of the search cache files, None to keep the
+                caches in memory only (and lose them on exit).
+            cache_bytes (int): The size of the search cache of each board variant.
+            tree_nodes (int): The most positions in the MCTS tree of each session.
+        """
+
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, use one of {sorted(STRATEGIES)}.")
+
+        self.host = host
+        self.port = port
+        self.strategy = strategy
+        self.time_limit = time_limit
+        self.max_sessions = max_sessions
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count()
+        self.max_queue = max_queue
+        self.idle_timeout = idle_timeout
+        self.cache_dir = cache_dir
+        self.cache_bytes = cache_bytes
+        self.tree_nodes = tree_nodes
+
+        self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="ai-search")
+        self.server: Union[asyncio.AbstractServer, None] = None
+
+        # Only max_workers searches are handed to the pool, the others wait here
+        self._search_slots: Union[asyncio.Semaphore, None] = None
+        self._waiting = 0
+        self._running = 0
+        self.searches = 0
+
+        self._session_ids = itertools.count(1)
+        self.session_count = 0
+        self.connection_count = 0
+
+        # The searches of the same board variant share one table, so what one
+        # session learns speeds up the others
+        self._tables: dict[tuple[int, int], SearchCache] = {}
+        self._shared_strategy: Union[MoveStrategy, None] = None
+
+    async def start(self) -> None:
+        """
+        Open the listening socket, self.port is updated if it was 0.
+        """
+
+        self._search_slots = asyncio.Semaphore(self.max_workers)
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port, limit=MAX_LINE)
+        self.port = self.server.sockets[0].getsockname()[1]
+        log.info(f"Serving {self.strategy} on {self.host}:{self.port} with {self.max_workers} search workers")
+
+    async def serve_forever(self) -> None:
+        """
+        Start the server and serve until cancelled.
+        """
+
+        await self.start()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self._close_caches()
+
+    async def close(self) -> None:
+        """
+        Stop accepting connections and shut the search pool down.
+        """
+
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self._close_caches()
+
+    def _close_caches(self) -> None:
+        """
+        Close the search caches, so their files are written and unlocked and
+        the memory of the others is freed.
+
+        While searches still run in the pool the caches are only flushed, the
+        searches keep using them.
+        """
+
+        for table in self._tables.values():
+            if self._running:
+                table.flush()
+            else:
+                table.close()
+
+    def stats(self) -> dict:
+        """
+        Return the load of the server.
+
+        Returns:
+            dict: Open connections and sessions, running and waiting searches, and searches done.
+        """
+        return {
+            "connections": self.connection_count,
+            "sessions": self.session_count,
+            "searches_running": self._running,
+            "searches_waiting": self._waiting,
+            "searches": self.searches,
+        }
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the requests of one connection, in order, until it closes.
+        """
+
+        # The sessions of this connection, by id
+        sessions: dict[int, GameController] = {}
+        self.connection_count += 1
+
+        # The lines are read one ahead by a task of their own, so the end of
+        # the connection is seen while a search runs for it
+        lines: asyncio.Queue = asyncio.Queue(maxsize=1)
+        closed = asyncio.Event()
+        read_task = asyncio.create_task(self._read_lines(reader, lines, closed))
+
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(lines.get(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+
+                if line is None:
+                    # The line is longer than MAX_LINE, the stream can't be resynchronized
+                    writer.write(self._encode({"ok": False, "error": "request too long"}))
+                    break
+
+                # The client closed the connection
+                if not line:
+                    break
+
+                writer.write(self._encode(await self._handle_request(line, sessions, closed)))
+                # Waits while the client doesn't read its answers
+                await writer.drain()
+
+        except ConnectionError:
+            pass
+
+        finally:
+            read_task.cancel()
+            for controller in sessions.values():
+                self._end_session(controller)
+            self.connection_count -= 1
+            self.session_count -= len(sessions)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read_lines(reader: asyncio.StreamReader, lines: asyncio.Queue, closed: asyncio.Event) -> None:
+        """
+        Put the request lines of a connection in a queue, b"" when the client
+        closed the connection, None for a line longer than MAX_LINE.
+        """
+
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                await lines.put(None)
+                return
+            except ConnectionError:
+                line = b""
+
+            if not line:
+                # A search still running for this connection is cancelled
+                closed.set()
+                await lines.put(line)
+                return
+
+            await lines.put(line)
+
+    def _end_session(self, controller: GameController) -> None:
+        """
+        Cancel the search of a session that is closed or whose connection ended, if one runs.
+        """
+
+        # The shared tablebase answers at once, and serves the other sessions too
+        if controller.ai.strategy is not self._shared_strategy:
+            controller.ai.strategy.cancel()
+        self._drop_tree(controller)
+
+    @staticmethod
+    def _drop_tree(controller: GameController) -> None:
+        """
+        Free the MCTS tree of a session, it is no use once its game is over.
+        """
+
+        if isinstance(controller.ai.strategy, MCTSStrategy):
+            controller.ai.strategy.clear_tree()
+
+    @staticmethod
+    def _encode(response: dict) -> bytes:
+        """
+        Encode a response as one JSON line.
+        """
+        return (json.dumps(response, separators=(",", ":")) + "\n").encode()
+
+    async def _handle_request(self, line: bytes, sessions: dict[int, GameController], closed: asyncio.Event) -> dict:
+        """
+        Answer one request line.
+
+        Parameters:
+            line (bytes): The JSON request.
+            sessions (dict[int, GameController]): The sessions of the connection.
+            closed (asyncio.Event): Set when the client closes the connection.
+
+        Returns:
+            dict: The response.
+        """
+
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise RequestError("invalid JSON")
+            if not isinstance(request, dict):
+                raise RequestError("a request must be a JSON object")
+
+            request_id = request.get("id")
+            op = request.get("op")
+
+            if op == "new":
+                response = await self._new_session(request, sessions, closed)
+            elif op == "move":
+                response = await self._human_move(request, sessions, closed)
+            elif op == "state":
+                session_id, controller = self._session(request, sessions)
+                response = self._state(session_id, controller)
+            elif op == "close":
+                session_id, controller = self._session(request, sessions)
+                del sessions[session_id]
+                self.session_count -= 1
+                self._end_session(controller)
+                response = {"ok": True, "session": session_id}
+            elif op == "stats":
+                response = {"ok": True, **self.stats()}
+            else:
+                raise RequestError(f"unknown op {op!r}")
+
+        except RequestError as e:
+            response = {"ok": False, "error": str(e)}
+
+        except Exception as e:
+            log.exception("Request failed")
+            response = {"ok": False, "error": f"internal error: {e}"}
+
+        if request_id is not None:
+            response["id"] = request_id
+        return response
+
+    def _check_busy(self) -> None:
+        """
+        Refuse a request needing a search when every worker is busy and the
+        queue is full, before the board is touched, so the client can retry.
+        """
+        if self._waiting >= self.max_queue:
+            raise RequestError("busy")
+
+    def _session(self, request: dict, sessions: dict[int, GameController]) -> tuple[int, GameController]:
+        """
+        Return the session a request is about.
+        """
+
+        session_id = request.get("session")
+        if session_id not in sessions:
+            raise RequestError(f"no session {session_id!r} on this connection")
+        return session_id, sessions[session_id]
+
+    def _make_strategy(self, size: int, win_length: int) -> MoveStrategy:
+        """
+        Create the AI strategy of a new session.
+
+        A search strategy keeps per-search state, so every session gets its
+        own; minimax and alpha-beta share the transposition table (or search
+        cache) of their board variant. A tablebase only reads its file, so one is shared by
+        all sessions.
+
+        Raises:
+            RequestError: If the strategy can't play the board variant.
+        """
+
+        if self.strategy == "tablebase":
+            if self._shared_strategy is None:
+                self._shared_strategy = STRATEGIES["tablebase"]()
+
+            # Checked now, rather than failing at every AI move of the game
+            tablebase = self._shared_strategy.tablebase
+            if (size, win_length) != (tablebase.size, tablebase.win_length):
+                raise RequestError(f"the tablebase only plays {tablebase.size}x{tablebase.size} "
+                                   f"with {tablebase.win_length} in a row")
+            return self._shared_strategy
+
+        if self.strategy in ("minimax", "alphabeta"):
+            table = self._tables.get((size, win_length))
+            if table is None:
+                if self.cache_dir is None:
+                    # Bounded like a file, a plain table would grow for as long as the server runs
+                    table = SearchCache(None, self.cache_bytes)
+                else:
+                    # Minimax doesn't read the bounds alpha-beta stores, so each strategy has its own file
+                    path = os.path.join(self.cache_dir, f"{self.strategy}-{size}x{size}-{win_length}.cache")
+                    table = SearchCache(path, self.cache_bytes)
+                self._tables[size, win_length] = table
+            return STRATEGIES[self.strategy](transposition_table=table)
+
+        if self.strategy == "mcts":
+            # Every session has its own tree, so each one is kept small
+            return STRATEGIES["mcts"](max_nodes=self.tree_nodes)
+
+        return STRATEGIES[self.strategy]()
+
+    async def _new_session(self, request: dict, sessions: dict[int, GameController], closed: asyncio.Event) -> dict:
+        """
+        Start a game, the AI moves first if the human plays O.
+        """
+
+        if self.session_count >= self.max_sessions:
+            raise RequestError("too many sessions")
+        self._check_busy()
+
+        size = request.get("size", 3)
+        win_length = request.get("win_length", size)
+        human_symbol = request.get("human", "X")
+
+        if not isinstance(size, int) or not 1 <= size <= MAX_BOARD_SIZE:
+            raise RequestError(f"size must be between 1 and {MAX_BOARD_SIZE}")
+        if not isinstance(win_length, int) or not 1 <= win_length <= size:
+            raise RequestError("win_length must be between 1 and size")
+        if human_symbol not in ("X", "O"):
+            raise RequestError("human must be X or O")
+        if self.time_limit is None and size > MAX_UNLIMITED_SIZE and self.strategy in ("minimax", "alphabeta"):
+            raise RequestError(f"boards above {MAX_UNLIMITED_SIZE}x{MAX_UNLIMITED_SIZE} need a server "
+                               f"time limit with {self.strategy}")
+
+        ai_symbol = "O" if human_symbol == "X" else "X"
+        controller = GameController(HumanPlayer(human_symbol),
+                                    AIPlayer(ai_symbol, self._make_strategy(size, win_length)),
+                                    BitBoard(size, win_length),
+                                    self.time_limit)
+
+        session_id = next(self._session_ids)
+        sessions[session_id] = controller
+        self.session_count += 1
+
+        # X moves first
+        ai_move = None
+        if ai_symbol == "X":
+            controller.current_player = controller.ai
+            try:
+                ai_move = await self._ai_move(controller, closed)
+            except BaseException:
+                # No session is left behind without its first move
+                del sessions[session_id]
+                self.session_count -= 1
+                raise
+
+        return {**self._state(session_id, controller), "ai_move": ai_move}
+
+    async def _human_move(self, request: dict, sessions: dict[int, GameController], closed: asyncio.Event) -> dict:
+        """
+        Make the human move of a request, then the AI answer.
+        """
+
+        session_id, controller = self._session(request, sessions)
+        row, col = request.get("row"), request.get("col")
+        size = controller.board.size
+
+        if controller.check_game_over()[0]:
+            raise RequestError("the game is over")
+        if not (isinstance(row, int) and isinstance(col, int) and 0 <= row < size and 0 <= col < size):
+            raise RequestError(f"row and col must be between 0 and {size - 1}")
+        self._check_busy()
+
+        moved, message = controller.make_move(row, col, controller.human)
+        if not moved:
+            raise RequestError(message)
+
+        ai_move = None
+        if not controller.check_game_over()[0]:
+            controller.switch_player()
+            try:
+                ai_move = await self._ai_move(controller, closed)
+            except BaseException:
+                # The session goes back to where it was before the request, so the
+                # human is still to move and may send the move again
+                controller.board.unmake_move()
+                controller.switch_player()
+                raise
+
+        if controller.check_game_over()[0]:
+            self._drop_tree(controller)
+
+        return {**self._state(session_id, controller), "ai_move": ai_move}
+
+    async def _ai_move(self, controller: GameController, closed: asyncio.Event) -> list[int]:
+        """
+        Find the AI move in the search pool and make it.
+
+        The search is cancelled if the client closes the connection before
+        it ends, it then keeps its worker until it stops at its next position.
+
+        Parameters:
+            controller (GameController): The session.
+            closed (asyncio.Event): Set when the client closes the connection.
+
+        Returns:
+            list[int]: [row, col] of the AI move.
+        """
+
+        self._waiting += 1
+        try:
+            await self._search_slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        try:
+            if closed.is_set():
+                raise RequestError("the connection was closed")
+
+            # A cancelled search leaves its moves on the board it searched, so it searches a copy
+            search = asyncio.get_running_loop().run_in_executor(
+                self.executor, controller.ai.find_best_move, controller.board.copy(), controller.time_limit)
+            client_gone = asyncio.ensure_future(closed.wait())
+            try:
+                await asyncio.wait((search, client_gone), return_when=asyncio.FIRST_COMPLETED)
+                if not search.done():
+                    controller.ai.strategy.cancel()
+                row, col = await search
+            except SearchCancelled:
+                raise RequestError("the search was cancelled")
+            finally:
+                client_gone.cancel()
+        finally:
+            self._running -= 1
+            self._search_slots.release()
+
+        self.searches += 1
+        controller.add_search_report(controller.ai.strategy.last_report)
+        controller.make_move(row, col, controller.ai)
+        controller.switch_player()
+        return [row, col]
+
+    def _state(self, session_id: int, controller: GameController) -> dict:
+        """
+        Return the state of a session, as sent to the client.
+        """
+
+        is_over, result_message = controller.check_game_over()
+        state = {"ok": True, "session": session_id, "board": board_rows(controller), "over": is_over}
+
+        if is_over:
+            state["result"] = result_message
+            state["winner"] = next((symbol for symbol in ("X", "O") if controller.board.is_winner(symbol)), None)
+
+        return state
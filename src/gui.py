@@ -1,15 +1,15 @@
 """
-1. Button is clicked
+1. A cell of the board view is clicked
 2. Human player makes move on the board class(human_player.make_move)
 3. Human players make a move on GUI representing the board
-4. Symbol is placed on the Label on the button on the board
+4. The cell of the move is repainted with the symbol
 5. Players are switched
 6. AI player switched(game_controller.switch_players)
 7. AI player finds best move using the game_controller using the find_best_ai_move function
 8. AI player makes move in Gameboard class
-9. Adds to Label of the button
+9. Repaints the cell of the AI move
 10. Check if the game is over
-11. Displays message based on who won
+11. Displays message based on who won, and highlights the winning line
 12. Switch player again and the human player has to click a button
 13. The game repeats until a winner is found or it's a draw
 """
@@ -23,6 +23,8 @@ from PyQt6.QtWidgets import QApplication, QMainWindow, QPushButton, QLabel, \
 from functools import partial
 # Needed to access list of command line arguments
 import sys
+from src.ai_search_worker import AISearchWorker
+from src.board_widget import BoardWidget
 from src.game_controller import GameController
 from src.human_player import HumanPlayer
 from src.ai_player import AIPlayer
@@ -38,8 +40,6 @@ log = getLogger(__name__)
 # Subclass QMainWindow to customize the main window
 class TicTacToeGUI(QMainWindow):
     """PyQt6-based GUI for Tic-Tac-Toe."""
-    # Creates an instance of the app, with command line arguments
-    app = QApplication(sys.argv)
 
     def __init__(self, controller: GameController):
         """
@@ -49,59 +49,52 @@ class TicTacToeGUI(QMainWindow):
             controller (GameController): The game controller instance.
         """
 
+        # Creates the app, with command line arguments, when the first window
+        # is made (a window can't exist without it), not when the module is imported
+        self.app = QApplication.instance() or QApplication(sys.argv)
+
         super().__init__()
         self.controller = controller
 
+        # The number of rows (and columns) of the board
+        self.size = controller.board.size
+
         # Change title of the main window
         self.setWindowTitle("Tic-Tac-Toe")
 
-        # The Fixed size of the window
-        self.setFixedSize(285, 350)
-
-        # Creates a 3x3 grid and Allows you to place widgets in the form of a grid
+        # Allows you to place widgets in the form of a grid
         self.layout = QGridLayout()
 
-        # Create a container for the buttons
-        self.button_container = [[QPushButton("", self) for _ in range(3)] for _ in range(3)]
+        # The board is painted by one widget, however many cells it has, and
+        # scales with the window
+        self.board_view = BoardWidget(controller.board, self)
         self.label = QLabel()
 
+        # The AI searches in a worker thread, each search gets a new id so the
+        # answer of a cancelled search can be recognized and dropped
+        self.search_worker: AISearchWorker = None
+        self.search_id = 0
+
     def setup_ui(self) -> None:
         """
-        Create the 3x3 button grid and status label.
+        Create the board view, the buttons and the status label.
 
         Returns:
             Returns None
         """
-        # Set a button for each cell (r, c) on the gui game board
-        for r in range(3):
-            for c in range(3):
-                # Get the buttons from the container
-                button: QPushButton = self.button_container[r][c]
-
-                # Sets a fixed size for each button
-                button.setFixedSize(80, 75)
-
-                # Set the button font
-                button.setFont(QFont('Times', 48))
-
-                # Add an event action to the button
-                button.clicked.connect(partial(self.button_click, r, c, self.controller.current_player))
+        # A click on a cell is a move of the human player
+        self.board_view.cell_clicked.connect(
+            lambda row, col: self.button_click(row, col, self.controller.human))
 
-                # Add the button to the grid layout
-                self.layout.addWidget(button, r, c)
-
-                # Set the grid layout alignment
-                self.layout.setAlignment(button, Qt.AlignmentFlag.AlignHCenter)
-
-                # Add button to button container
-                self.button_container[r][c] = button
+        # Add the board to the grid layout, over both button columns
+        self.layout.addWidget(self.board_view, 0, 0, 1, 2)
 
         # Set the fixed size for the Label
         self.label.setText("")
         self.label.setWordWrap(True)
 
-        # Add Label to the grid layout
-        self.layout.addWidget(self.label, 4, 0, 2, 3)
+        # Add Label to the grid layout, below the buttons row
+        self.layout.addWidget(self.label, 2, 0, 1, 2)
 
         # Create and exit button
         reset_button = QPushButton("Reset Game", self)
@@ -115,8 +108,8 @@ class TicTacToeGUI(QMainWindow):
         # Set button click event action
         reset_button.clicked.connect(partial(self.reset_gameboard))
 
-        # Add the button to the grid layout
-        self.layout.addWidget(reset_button, 3, 0)
+        # Add the button to the grid layout, below the board
+        self.layout.addWidget(reset_button, 1, 0, Qt.AlignmentFlag.AlignLeft)
 
         # Create and exit button
         exit_button = QPushButton("Exit Game", self)
@@ -127,11 +120,11 @@ class TicTacToeGUI(QMainWindow):
         # Set the fixed size for the button
         exit_button.setFixedSize(80, 50)
 
-        # Add event action to exit button
-        exit_button.clicked.connect(partial(exit, 0))
+        # Add event action to exit button, closing the window also stops the AI search
+        exit_button.clicked.connect(self.close)
 
-        # Add the button to the grid layout
-        self.layout.addWidget(exit_button, 3, 2)
+        # Add the button to the grid layout, below the right side of the board
+        self.layout.addWidget(exit_button, 1, 1, Qt.AlignmentFlag.AlignRight)
 
         # Creates an instance of the QWidget class,
         # which is also a widget used as container for other
@@ -146,27 +139,28 @@ class TicTacToeGUI(QMainWindow):
 
     def button_click(self, row: int, col: int, player: Player) -> None:
         """
-        Handle button clicks for human moves.
+        Handle clicks on the cells of the board for human moves.
 
         Parameters:
-            :param row: Row index (0-2).
-            :param col: Column index (0-2)
+            :param row: Row index (0 to size - 1).
+            :param col: Column index (0 to size - 1)
             :param player: The current player.
         """
         log.info(f"Player: {player.symbol}, clicks at: ({row}, {col})")
 
+        # The board is locked while the AI thinks
+        if self.search_worker is not None:
+            return None
+
         # TODO: step 1:
         #   Check if button cell is not empty on the gui and the
         #   game board, and display a message
         #   to try another button cell or just try again
         #   and return None to stop executing the below code.
-        #   Remember that the gui game board buttons are found in the `self.button_container`.
-
-        # Retrieves a button from the button container
-        button: QPushButton = self.button_container[row][col]
+        #   Remember that the gui game board is painted by `self.board_view` from the game board.
 
-        # If button cell on GUI or game board != "" display a message the says "Try again!"
-        if button.text() != "" and self.controller.board.game_board[row][col] != "":
+        # If the cell on the game board != "" display a message the says "Try again!"
+        if self.controller.board.game_board[row][col] != "":
             self.label.setText("Try again!")
 
             # Return None
@@ -176,12 +170,9 @@ class TicTacToeGUI(QMainWindow):
         #   If the button cell is empty, then place the player symbol
         #   at that (r, c) for the cell and update the game board
 
-        # If button cell on GUI or game board == "" the player makes a move on the
-        # GUI board and the game board, and the board is updated
-        if button.text() == "" and self.controller.board.game_board[row][col] == "":
-            self.controller.board.make_move(row, col, player.symbol)
-            button.setText(player.symbol)
-            self.show()
+        # The player makes a move on the game board, and only its cell is repainted
+        self.controller.make_move(row, col, player)
+        self.board_view.update_cell(row, col)
 
         # TODO: step 3:
         #   Check if the last move made was a winning move;
@@ -197,36 +188,80 @@ class TicTacToeGUI(QMainWindow):
         # the result message of who won, else it switches to the AI player
         if is_over:
             self.label.setText(result_message)
+            self.board_view.set_winning_line(self.controller.board.winning_line())
+            self.log_search_summary()
 
             return None
         else:
             self.controller.switch_player()
-            player = self.controller.current_player
 
         # TODO: step 4:
         #   Find the best move for the AI player using the
-        #   game controller class and make a move on both the
-        #   game board and gui game board
+        #   game controller class, in a worker thread so the window
+        #   keeps responding. The move is made in ai_move_found.
+        self.start_ai_search()
+
+    def start_ai_search(self) -> None:
+        """
+        Start looking for the AI move in a worker thread, and lock the board meanwhile.
+        """
+
+        self.search_id += 1
+        self.set_board_enabled(False)
+        self.label.setText("The AI is thinking...")
+
+        self.search_worker = AISearchWorker(self.controller, self.search_id)
+        self.search_worker.move_found.connect(self.ai_move_found)
+        self.search_worker.search_failed.connect(self.ai_search_failed)
+        self.search_worker.start()
+
+    def stop_ai_search(self) -> None:
+        """
+        Cancel the running AI search, if any, and wait for its thread to end.
+        """
+
+        if self.search_worker is None:
+            return None
+
+        # A new id makes sure an answer already on its way is dropped
+        self.search_id += 1
+        self.search_worker.cancel()
+        self.search_worker.wait()
+        self.search_worker = None
+
+    def ai_move_found(self, search_id: int, row: int, col: int) -> None:
+        """
+        Make the AI move found by the worker thread, this runs in the GUI thread.
+
+        Parameters:
+            :param search_id: The id of the search that found the move.
+            :param row: Row index (0 to size - 1).
+            :param col: Column index (0 to size - 1)
+        """
 
-        # Get the row and col of the best move
-        row, col = self.controller.find_best_ai_move()
+        # The answer of a cancelled search
+        if search_id != self.search_id:
+            return None
 
-        # Retrieves a button from the button container
-        button: QPushButton = self.button_container[row][col]
+        self.search_worker.wait()
+        self.controller.add_search_report(self.search_worker.report)
+        self.search_worker = None
+        self.set_board_enabled(True)
+        self.label.setText("")
 
-        # If button cell on GUI or game board != "" display a message the says "Try again!"
-        if button.text() != "" and self.controller.board.game_board[row][col] != "":
+        player = self.controller.current_player
+
+        # If the cell on the game board != "" display a message the says "Try again!"
+        if self.controller.board.game_board[row][col] != "":
             self.label.setText("Try again!")
 
             # Return None
             return None
 
-        # If button cell on GUI or game board == "" the player makes a move on the
-        # GUI board and the game board, and the board is updated
-        if button.text() == "" and self.controller.board.game_board[row][col] == "":
-            self.controller.board.make_move(row, col, player.symbol)
-            button.setText(player.symbol)
-            self.show()
+        # The AI makes its move on the game board, and only its cell is repainted
+        if self.controller.board.game_board[row][col] == "":
+            self.controller.make_move(row, col, player)
+            self.board_view.update_cell(row, col)
 
             # TODO: step 5:
             #   Check if the last move made was a winning move;
@@ -243,6 +278,8 @@ class TicTacToeGUI(QMainWindow):
             # the result message of who won, else it switches to the AI player
             if is_over:
                 self.label.setText(result_message)
+                self.board_view.set_winning_line(self.controller.board.winning_line())
+                self.log_search_summary()
 
                 # We switch turn back to human player. So the user can start a new game.
                 self.controller.switch_player()
@@ -250,6 +287,33 @@ class TicTacToeGUI(QMainWindow):
             else:
                 self.controller.switch_player()
 
+    def ai_search_failed(self, search_id: int, message: str) -> None:
+        """
+        Show why the AI search failed, and give the board back to the human player.
+
+        Parameters:
+            :param search_id: The id of the search that failed.
+            :param message: The error message.
+        """
+
+        if search_id != self.search_id:
+            return None
+
+        self.search_worker.wait()
+        self.search_worker = None
+        self.set_board_enabled(True)
+        self.controller.switch_player()
+        self.label.setText(f"The AI couldn't move: {message}")
+
+    def set_board_enabled(self, enabled: bool) -> None:
+        """
+        Lock or unlock the board.
+
+        Parameters:
+            :param enabled: False to ignore clicks on the board.
+        """
+        self.board_view.locked = not enabled
+
     def show_result(self) -> None:
         """
         Display the game result.
@@ -260,19 +324,34 @@ class TicTacToeGUI(QMainWindow):
             self.label.setText(result_message)
             return None
 
+    def log_search_summary(self) -> None:
+        """
+        Log where the AI spent its search time in the game that just ended.
+        """
+        if self.controller.search_reports:
+            log.info(f"AI searches this game: {self.controller.search_summary()}")
+
     def reset_gameboard(self):
-        # Kill two birds with one stone!
-        for r in range(3):
-            for c in range(3):
-                # Resets the gui game board
-                button: QPushButton = self.button_container[r][c]
-                button.setText("")
-                # Resets the game board in the GameBoard class
-                self.controller.board.game_board[r][c] = ""
+        # Stops the AI if it is thinking, then empties the board and gives the
+        # turn back to the human player
+        self.stop_ai_search()
+        self.controller.reset()
+        self.set_board_enabled(True)
+        self.label.setText("")
+
+        # Repaints the gui game board once, empty and without the winning line
+        self.board_view.reset()
+
+    def closeEvent(self, event) -> None:
+        """
+        Stop the AI search before the window closes, so its thread doesn't outlive the window.
+        """
+        self.stop_ai_search()
+        super().closeEvent(event)
 
     def run(self) -> None:
         """Start the GUI application."""
-        # Creates the 3x3 grid
+        # Creates the size x size grid
         self.setup_ui()
 
         # Shows the window
@@ -0,0 +1,183 @@
+"""
+A load generator for the game server (src/game_server.py): many clients
+play random human moves at once and the time from sending a move to
+receiving the AI answer is measured.
+
+Run it against a server started with python server.py:
+
+    python loadtest.py --clients 200 --games 20
+"""
+
+# File: load_client.py
+import asyncio
+import json
+import random
+import time
+from typing import Union
+
+from src.logger import getLogger
+
+log = getLogger(__name__)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Return the q-th percentile of values (nearest rank), 0 if there are none.
+
+    Parameters:
+        values (list[float]): The measurements.
+        q (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The value below which q percent of the measurements fall.
+    """
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class LoadClient:
+    """
+    One connection playing games one after the other.
+
+    Example:
+    ========
+    >>> client = LoadClient("127.0.0.1", 8765, random.Random(0))
+    >>> await client.play(games=10)
+    >>> client.latencies
+    """
+
+    def __init__(self, host: str, port: int, rng: random.Random, size: int = 3, win_length: Union[int, None] = None):
+        """
+        Parameters:
+            host (str): The server address.
+            port (int): The server port.
+            rng (random.Random): Picks the human moves.
+            size (int): The number of rows (and columns) of the board.
+            win_length (int): The number of symbols in a row needed to win, the board size if None.
+        """
+
+        self.host = host
+        self.port = port
+        self.rng = rng
+        self.size = size
+        self.win_length = win_length if win_length is not None else size
+
+        # Seconds from sending each move to its answer
+        self.latencies: list[float] = []
+        self.games = 0
+        self.errors = 0
+        self.busy = 0
+
+    async def play(self, games: int) -> None:
+        """
+        Connect and play games with random moves.
+
+        Parameters:
+            games (int): The number of games to play.
+        """
+
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            for _ in range(games):
+                await self._play_game(reader, writer)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    @staticmethod
+    async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: dict) -> dict:
+        """
+        Send one request and wait for its answer.
+        """
+
+        writer.write((json.dumps(request) + "\n").encode())
+        await writer.drain()
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("the server closed the connection")
+        return json.loads(line)
+
+    async def _play_game(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Play one game as X, then close its session.
+        """
+
+        state = await self._request(reader, writer, {"op": "new", "size": self.size, "win_length": self.win_length})
+        if not state["ok"]:
+            self.errors += 1
+            self.busy += state["error"] == "busy"
+            return
+        session = state["session"]
+
+        while not state["over"]:
+            empty = [(row, col) for row, line in enumerate(state["board"]) for col, cell in enumerate(line)
+                     if cell == "."]
+            row, col = self.rng.choice(empty)
+
+            started = time.perf_counter()
+            response = await self._request(reader, writer, {"op": "move", "session": session, "row": row, "col": col})
+            self.latencies.append(time.perf_counter() - started)
+
+            if not response["ok"]:
+                self.errors += 1
+                # The move was refused before it was made, the same position is played again
+                if response["error"] == "busy":
+                    self.busy += 1
+                    continue
+                break
+            state = response
+
+        self.games += 1
+        await self._request(reader, writer, {"op": "close", "session": session})
+
+
+async def run_load(host: str = "127.0.0.1",
+                   port: int = 8765,
+                   clients: int = 100,
+                   games: int = 10,
+                   size: int = 3,
+                   win_length: Union[int, None] = None,
+                   seed: int = 0) -> dict:
+    """
+    Play games from many connections at once and measure the move latency.
+
+    Parameters:
+        host (str): The server address.
+        port (int): The server port.
+        clients (int): The number of connections, each playing its games one at a time.
+        games (int): The number of games per connection.
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win, the board size if None.
+        seed (int): Seed of the random moves.
+
+    Returns:
+        dict: games, moves, errors, busy, elapsed seconds, moves_per_second and
+            p50_ms, p99_ms, max_ms of the move latency.
+    """
+
+    load_clients = [LoadClient(host, port, random.Random(seed + i), size, win_length) for i in range(clients)]
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(client.play(games) for client in load_clients), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    failed = [result for result in results if isinstance(result, BaseException)]
+    for error in failed[:5]:
+        log.warning(f"A client failed: {error!r}")
+
+    latencies = [latency for client in load_clients for latency in client.latencies]
+    return {
+        "games": sum(client.games for client in load_clients),
+        "moves": len(latencies),
+        "errors": sum(client.errors for client in load_clients) + len(failed),
+        "busy": sum(client.busy for client in load_clients),
+        "elapsed": elapsed,
+        "moves_per_second": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+    }
@@ -4,26 +4,47 @@
 import traceback
 import logging
 import logging.config
+import copy
 import os
-from src.__config__ import log_config, LOG_DIR
+from src.__config__ import log_config, LOG_DIR, TRACE
+
+# Register the search tracing level, so it shows as "TRACE" in the logs
+logging.addLevelName(TRACE, "TRACE")
 
 # Flag to track if logging has been configured
 _logging_configured = False
 
 
-def getLogger(name: str = None, level: str = os.getenv("LOG_LEVEL", "DEBUG")):
-    """Create and return a logger with the caller's base filename or a custom name."""
+def configure_logging(log_to_file: bool = True) -> None:
+    """
+    Set up the log handlers, called once by the entry point (main.py, selfplay.py...).
+
+    Importing a module never configures logging, so the engine can be
+    imported without colorlog and without creating a log file. Until this is
+    called, only warnings and errors are printed (Python's default).
+
+    Parameters:
+        log_to_file (bool): Also write a timestamped log file under logs/.
+    """
     global _logging_configured
-    if not _logging_configured:
+    if _logging_configured:
+        return
+
+    config = copy.deepcopy(log_config)
+    if log_to_file:
         # Create the log directory if it doesn't exist
-        if not os.path.exists(LOG_DIR):
-            os.makedirs(LOG_DIR, exist_ok=True)
-            # print(f"Created log directory: {LOG_DIR}")
-        # else:
-        #     print(f"Log directory already exists: {LOG_DIR.split('/')[-1]}")
-        # Configure logging once
-        logging.config.dictConfig(log_config)
-        _logging_configured = True
+        os.makedirs(LOG_DIR, exist_ok=True)
+    else:
+        del config["handlers"]["file_handler"]
+        config["root"]["handlers"].remove("file_handler")
+
+    # Configure logging once
+    logging.config.dictConfig(config)
+    _logging_configured = True
+
+
+def getLogger(name: str = None, level: str = os.getenv("LOG_LEVEL", "DEBUG")):
+    """Create and return a logger with the caller's base filename or a custom name."""
 
     # Use the caller's base filename if no name is provided
     if name is None:
@@ -0,0 +1,491 @@
+"""
+Monte Carlo Tree Search (UCT) plays random games (playouts) from the
+position and grows a tree towards the moves that win most often. It can
+stop at any time and answers with the move tried most, so it scales to
+boards where searching to the end (MinimaxStrategy) is out of reach.
+
+One playout:
+
+1. Selection:   from the root, follow the child with the best UCT value
+                wins / visits + exploration * sqrt(ln(parent visits) / visits)
+                until a position with untried moves.
+2. Expansion:   make one untried move, it becomes a new node.
+3. Rollout:     play random moves until the game is over.
+4. Backup:      every node on the path counts a visit, and a win (1), a
+                draw (0.5) or a loss (0) for the player who moved into it.
+
+The tree is kept after the search: when the next search is for a position
+reached from the old root (the AI's move and the human's answer), that
+subtree becomes the new root and its playouts are not lost. The tree holds
+at most max_nodes positions (a node takes about 2 KB on 15x15): once it is
+full, the playouts go on from its leaves without adding new ones, until
+the next move drops the other branches.
+
+With workers > 1 the playouts run in worker processes (root
+parallelization): each process grows its own tree for the position and the
+visits of the root moves are added up. Every worker gets exactly one task
+per search over its own pipe, so it searches once per move and keeps one
+tree, which it reuses like the serial search does.
+"""
+
+# File: mcts_strategy.py
+import math
+import multiprocessing
+import multiprocessing.connection
+import random
+import time
+from typing import Union
+
+from src.bit_board import pack_board, unpack_board
+from src.game_board import GameBoard
+from src.logger import getLogger
+from src.move_strategy import MoveStrategy, SearchCancelled
+from src.player import Player
+from src.search_report import SearchReport
+
+log = getLogger(__name__)
+
+# The playouts of a search without a time limit or a playouts budget
+DEFAULT_PLAYOUTS = 10000
+
+# The most positions a tree holds, about 400 MB on 15x15
+DEFAULT_MAX_NODES = 200000
+
+# How often (seconds) a parallel search checks for cancel()
+CANCEL_POLL = 0.05
+
+OTHER = {"X": "O", "O": "X"}
+
+
+class _Node:
+    """
+    A position of the search tree.
+
+    Attributes:
+        move (tuple[int, int]): The move that led here, None for the root.
+        symbol (str): The player who made that move, the other player moves next.
+        children (dict): The expanded moves, (row, col) -> _Node.
+        untried (list): The moves not expanded yet, in random order.
+        visits (int): The playouts through this position.
+        wins (float): Their results for `symbol`: 1 per win, 0.5 per draw.
+        terminal (bool): The game is over in this position.
+        winner (str): The winner of a terminal position, None for a draw.
+        size (int): The nodes of the subtree, this one included.
+    """
+    __slots__ = ("move", "symbol", "children", "untried", "visits", "wins", "terminal", "winner", "size")
+
+    def __init__(self, move: Union[tuple[int, int], None], symbol: str, board: GameBoard, rng: random.Random):
+        self.move = move
+        self.symbol = symbol
+        self.children = {}
+        self.visits = 0
+        self.wins = 0.0
+        self.size = 1
+        self.winner = symbol if board.is_winner(symbol) else None
+        self.terminal = self.winner is not None or board.is_full()
+
+        if self.terminal:
+            self.untried = []
+        else:
+            self.untried = list(board.iter_empty_cells())
+            rng.shuffle(self.untried)
+
+
+class MCTSStrategy(MoveStrategy):
+    """
+    Picks moves with Monte Carlo Tree Search (UCT), see the module docstring.
+
+    The search stops after `playouts` playouts or when the time limit is
+    spent, whichever comes first, and plays the root move with the most
+    visits (the lowest row-major cell on a tie).
+
+    Example:
+    ========
+    >>> from src.mcts_strategy import MCTSStrategy
+    >>> ai = AIPlayer("O", MCTSStrategy(playouts=20000))
+    >>> # 7x7 with 4 in a row, half a second per move on 4 cores
+    >>> ai = AIPlayer("O", MCTSStrategy(playouts=None, workers=4))
+    >>> controller = GameController(human, ai, BitBoard(7, 4), time_limit=0.5)
+    """
+
+    def __init__(self,
+                 playouts: Union[int, None] = DEFAULT_PLAYOUTS,
+                 exploration: float = math.sqrt(2),
+                 workers: int = 1,
+                 seed: Union[int, str, None] = None,
+                 reuse_tree: bool = True,
+                 max_nodes: int = DEFAULT_MAX_NODES,
+                 collect_report: bool = False):
+        """
+        Initialize the strategy.
+
+        Parameters:
+            playouts (int): The playouts per move, None to only stop at the time limit
+                (DEFAULT_PLAYOUTS are played when there is no time limit either).
+            exploration (float): The UCT exploration constant, higher tries more moves.
+            workers (int): The processes running playouts, 1 to search in this process.
+            seed (int): Seed of the random playouts, None for a random seed. The
+                seeds of the workers are drawn from it.
+            reuse_tree (bool): Keep the subtree of the position reached for the next search.
+            max_nodes (int): The most positions the tree holds (in each worker).
+            collect_report (bool): Fill last_report with a SearchReport after each search.
+        """
+
+        self.playouts = playouts
+        self.exploration = exploration
+        self.workers = workers
+        self.seed = seed
+        self.reuse_tree = reuse_tree
+        self.max_nodes = max_nodes
+        self.collect_report = collect_report
+        self.rng = random.Random(seed)
+
+        # The tree of the last search, and the board variant and moves of its root
+        self._root: Union[_Node, None] = None
+        self._root_key = None
+
+        # The worker processes and their pipes, started by the first parallel search
+        self._pool: list[tuple[multiprocessing.Process, multiprocessing.connection.Connection]] = []
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle the settings without the tree and the pool, e.g. to send the strategy to a process.
+        """
+        state = self.__dict__.copy()
+        state["_root"] = None
+        state["_root_key"] = None
+        state["_pool"] = []
+        return state
+
+    def close(self) -> None:
+        """
+        Stop the worker processes, if they were started.
+        """
+
+        for process, connection in self._pool:
+            process.terminate()
+            process.join()
+            connection.close()
+        self._pool = []
+
+    def clear_tree(self) -> None:
+        """
+        Drop the tree kept for the next search, e.g. when the game is over.
+        The worker processes keep trees of their own, so they are stopped too.
+        """
+
+        self._root = None
+        self._root_key = None
+        self.close()
+
+    def find_best_move(self,
+                       board: GameBoard,
+                       player: Player,
+                       time_limit: Union[float, None] = None) -> tuple[int, int]:
+        """
+        Search the position with playouts and return the most visited move.
+
+        Parameters:
+            board (GameBoard): The game board instance, it is not changed.
+            player (Player): The AI player instance.
+            time_limit (float): The time budget in seconds, None for no limit.
+
+        Returns:
+            tuple[int, int]: (row, col) of the best move, None if the game is over.
+
+        Raises:
+            SearchCancelled: If cancel() was called during the search.
+        """
+
+        started = time.perf_counter()
+        deadline = started + time_limit if time_limit is not None else None
+        playouts = self.playouts if self.playouts is not None or time_limit is not None else DEFAULT_PLAYOUTS
+
+        if board.is_winner("X") or board.is_winner("O") or board.is_full():
+            return None
+
+        if self.workers > 1:
+            visits, done = self._search_parallel(board, player.symbol, playouts, time_limit)
+            best_move = self._most_visited(visits, board.size)
+            variation = [best_move]
+        else:
+            root = self._search_root(board, player.symbol)
+            done = self._search(root, board.copy(), playouts, deadline)
+            visits = {move: child.visits for move, child in root.children.items()}
+            best_move = self._most_visited(visits, board.size)
+            variation = self._principal_variation(root, board.size)
+
+        elapsed = time.perf_counter() - started
+        log.debug(f"MCTS played {done} playouts in {elapsed:.3f}s, best move {best_move} "
+                  f"with {visits[best_move]} visits")
+
+        if self.collect_report:
+            self.last_report = SearchReport(strategy=type(self).__name__,
+                                            best_move=best_move,
+                                            nodes=done,
+                                            max_depth=len(variation),
+                                            elapsed=elapsed,
+                                            principal_variation=variation)
+
+        return best_move
+
+    @staticmethod
+    def _most_visited(visits: dict, size: int) -> tuple[int, int]:
+        """
+        Return the move with the most visits, the lowest row-major cell on a tie.
+        """
+        return max(visits, key=lambda move: (visits[move], -(move[0] * size + move[1])))
+
+    def _principal_variation(self, root: _Node, size: int) -> list[tuple[int, int]]:
+        """
+        Follow the most visited child from the root.
+        """
+
+        variation = []
+        node = root
+        while node.children:
+            move = self._most_visited({move: child.visits for move, child in node.children.items()}, size)
+            variation.append(move)
+            node = node.children[move]
+        return variation
+
+    def _search_root(self, board: GameBoard, symbol: str) -> _Node:
+        """
+        Return the root of the search: the node of the position in the last
+        tree if it can be reused, a new node otherwise. The tree above it is dropped.
+
+        Parameters:
+            board (GameBoard): The position to search.
+            symbol (str): The player to move.
+
+        Returns:
+            _Node: The root.
+        """
+
+        root = self._reused_node(board, symbol) if self.reuse_tree else None
+        if root is None:
+            root = _Node(None, OTHER[symbol], board, self.rng)
+        else:
+            log.debug(f"MCTS reuses a subtree of {root.visits} playouts")
+
+        if self.reuse_tree:
+            self._root = root
+            self._root_key = (board.size, board.win_length, tuple(board.move_stack))
+        return root
+
+    def _reused_node(self, board: GameBoard, symbol: str) -> Union[_Node, None]:
+        """
+        Find the position in the last tree, following the moves made since its root.
+        """
+
+        if self._root is None:
+            return None
+
+        size, win_length, root_moves = self._root_key
+        moves = board.move_stack
+        if (board.size, board.win_length) != (size, win_length) or tuple(moves[:len(root_moves)]) != root_moves:
+            return None
+
+        node = self._root
+        for move in moves[len(root_moves):]:
+            node = node.children.get(move)
+            if node is None:
+                return None
+
+        # The same moves, but the AI plays the other side
+        if OTHER[node.symbol] != symbol:
+            return None
+        return node
+
+    def _search(self, root: _Node, board: GameBoard, playouts: Union[int, None], deadline: Union[float, None]) -> int:
+        """
+        Run playouts from the root.
+
+        Parameters:
+            root (_Node): The node of the board position.
+            board (GameBoard): The position, moves are made and taken back on it.
+            playouts (int): The most playouts to run, None for no limit.
+            deadline (float): The perf_counter() time to stop at, None for no limit.
+
+        Returns:
+            int: The number of playouts run.
+        """
+
+        rng = self.rng
+        exploration = self.exploration
+        max_nodes = self.max_nodes
+        done = 0
+
+        while playouts is None or done < playouts:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if self.cancel_requested:
+                raise SearchCancelled()
+
+            # 1. Selection: down the tree along the best UCT values
+            node = root
+            path = [root]
+            while not node.untried and node.children:
+                log_visits = math.log(node.visits)
+                node = max(node.children.values(),
+                           key=lambda child: child.wins / child.visits
+                           + exploration * math.sqrt(log_visits / child.visits))
+                board.make_move(node.move[0], node.move[1], node.symbol)
+                path.append(node)
+
+            # 2. Expansion: one new node, unless the tree is full
+            if node.untried and root.size < max_nodes:
+                move = node.untried.pop()
+                symbol = OTHER[node.symbol]
+                board.make_move(move[0], move[1], symbol)
+                child = _Node(move, symbol, board, rng)
+                node.children[move] = child
+                for ancestor in path:
+                    ancestor.size += 1
+                node = child
+                path.append(node)
+
+            # 3. Rollout: random moves to the end, a shuffled list of the empty cells is a random game
+            if node.terminal:
+                winner = node.winner
+            else:
+                winner = None
+                symbol = node.symbol
+                cells = list(board.iter_empty_cells())
+                rng.shuffle(cells)
+                played = 0
+                for row, col in cells:
+                    symbol = OTHER[symbol]
+                    board.make_move(row, col, symbol)
+                    played += 1
+                    if board.is_winner(symbol):
+                        winner = symbol
+                        break
+                for _ in range(played):
+                    board.unmake_move()
+
+            # 4. Backup: the result for the player who moved into each node
+            for node in path:
+                node.visits += 1
+                if winner is None:
+                    node.wins += 0.5
+                elif winner == node.symbol:
+                    node.wins += 1.0
+
+            for _ in range(len(path) - 1):
+                board.unmake_move()
+            done += 1
+
+        return done
+
+    def _search_parallel(self,
+                         board: GameBoard,
+                         symbol: str,
+                         playouts: Union[int, None],
+                         time_limit: Union[float, None]) -> tuple[dict, int]:
+        """
+        Split the playouts over the worker processes and add up the root visits.
+
+        The board is sent as its moves, one byte per cell, so a task stays a
+        few dozen bytes whatever the board size. A cancelled search stops the
+        workers, the next search starts new ones.
+
+        Returns:
+            tuple[dict, int]: The visits of each root move, and the playouts run.
+        """
+
+        if not self._pool:
+            for _ in range(self.workers):
+                connection, worker_connection = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=_worker_loop,
+                                                  args=(worker_connection, self.exploration, self.reuse_tree,
+                                                        self.max_nodes),
+                                                  daemon=True)
+                process.start()
+                worker_connection.close()
+                self._pool.append((process, connection))
+
+        packed = pack_board(board)
+        share = -(-playouts // self.workers) if playouts is not None else None
+
+        # One task per worker, each with its own seed drawn from the strategy's generator
+        for _, connection in self._pool:
+            connection.send((packed, symbol, share, time_limit, self.rng.getrandbits(64)))
+
+        results = []
+        pending = [connection for _, connection in self._pool]
+        while pending:
+            # Waits in short steps, so a cancel() is seen while the workers run
+            if self.cancel_requested:
+                self.close()
+                raise SearchCancelled()
+
+            for connection in multiprocessing.connection.wait(pending, CANCEL_POLL):
+                pending.remove(connection)
+                try:
+                    result = connection.recv()
+                except EOFError:
+                    self.close()
+                    raise RuntimeError("An MCTS worker process died.") from None
+                if isinstance(result, Exception):
+                    self.close()
+                    raise result
+                results.append(result)
+
+        visits = {}
+        done = 0
+        for worker_visits, worker_done in results:
+            done += worker_done
+            for cell, count in worker_visits.items():
+                move = divmod(cell, board.size)
+                visits[move] = visits.get(move, 0) + count
+
+        return visits, done
+
+
+def _worker_loop(connection: multiprocessing.connection.Connection,
+                 exploration: float,
+                 reuse_tree: bool,
+                 max_nodes: int) -> None:
+    """
+    Run the tasks of one worker process until its pipe is closed. The worker
+    keeps its strategy, and so its tree, from one task to the next.
+    """
+
+    strategy = MCTSStrategy(exploration=exploration, reuse_tree=reuse_tree, max_nodes=max_nodes)
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+
+        try:
+            result = _search_task(strategy, task)
+        except Exception as e:
+            # Sent back and raised by the search waiting for it
+            result = e
+        connection.send(result)
+
+
+def _search_task(strategy: MCTSStrategy, task: tuple) -> tuple[dict[int, int], int]:
+    """
+    Run the playouts of one worker.
+
+    Parameters:
+        strategy (MCTSStrategy): The strategy of the worker process.
+        task (tuple): The packed board (see pack_board), the player to move,
+            the playouts and time limit, and the seed.
+
+    Returns:
+        tuple[dict[int, int], int]: The visits of each root move by cell, and the playouts run.
+    """
+
+    packed, symbol, playouts, time_limit, seed = task
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    board = unpack_board(packed)
+
+    strategy.rng.seed(seed)
+    root = strategy._search_root(board, symbol)
+    done = strategy._search(root, board, playouts, deadline)
+
+    return {move[0] * board.size + move[1]: child.visits for move, child in root.children.items()}, done
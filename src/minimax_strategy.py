@@ -8,6 +8,18 @@ If the minimizing player (e.g., O) wins: score = -10 + depth
 If it’s a draw: score = 0
 
 Depth is the number of moves made so far, used to prioritize quicker wins or slower losses.
+
+Before searching, the root looks for forcing moves in the line tables (see
+tactics.py): a winning move is played at once, and a single winning cell of
+the opponent is searched alone, since every other move lets the opponent win
+on the next turn.
+
+A depth-limited search (iterative deepening, with a time limit) stops before
+the end of the game. The positions at the depth limit are scored by an
+evaluation (see evaluation.py), squashed between -1 and 1, so any win or
+loss the search does see still outweighs them. The first iteration (depth
+0) only scores the position after each move of the AI, so even a budget
+too short for the opponent's replies plays an evaluated move.
 Minimax Pseudocode:
 
 minimax(board: Gameboard, depth: int, is_maximizing: bool, player: Player, opponent: Player):
@@ -46,76 +58,542 @@ The AI chooses the move with the highest score when maximizing (X) or the lowest
 """
 
 # File: minimax_strategy.py
+import time
 from typing import Union
 
+from src.evaluation import Evaluation, LineEvaluation
 from src.game_board import GameBoard
-from src.move_strategy import MoveStrategy
+from src.move_strategy import MoveStrategy, SearchCancelled, SearchTimeout
 from src.player import Player
+from src.__config__ import SEARCH_LOG_LEVEL, TRACE
 from src.logger import getLogger
+from src.search_report import SearchHook, SearchReport
+from src.tactics import find_tactics
+from src.transposition_table import EXACT, TranspositionTable
+
+# The search logs per-position messages at TRACE level, see SEARCH_TRACE in __config__
+log = getLogger(__name__, SEARCH_LOG_LEVEL)
+
+# An evaluation e scores e / (|e| + HORIZON_SCALE) at the depth limit, between -1 and 1
+HORIZON_SCALE = 1000
+
+# The score of a root move after which the opponent wins with its next move
+OPPONENT_WINS_NEXT = 10 + 1
+
+
+def tie_order(board: GameBoard, max_depth: Union[int, None]) -> list[tuple[int, int]]:
+    """
+    Return the root moves in the order ties between their scores are broken.
 
-log = getLogger(__name__)
+    A search to the end of the game breaks ties in row-major order. A
+    depth-limited one prefers the cells nearest the centre (then row-major):
+    its evaluation often scores many moves the same on a big board, and a
+    central cell takes part in the most lines.
+
+    Parameters:
+        board (GameBoard): The game board instance.
+        max_depth (int): The depth limit of the search, None for a search to the end.
+
+    Returns:
+        list[tuple[int, int]]: The empty cells, the one winning a tie first.
+    """
+
+    empty_cells = board.get_empty_cells()
+    if max_depth is None:
+        return empty_cells
+
+    centre = (board.size - 1) / 2
+    return sorted(empty_cells, key=lambda cell: abs(cell[0] - centre) + abs(cell[1] - centre))
 
 
 class MinimaxStrategy(MoveStrategy):
-    """Implements the Minimax algorithm for optimal AI moves."""
+    """
+    Implements the Minimax algorithm for optimal AI moves.
+
+    Every searched position is cached in a transposition table keyed by its
+    canonical (symmetry-folded) Zobrist hash, so a position and its rotations and
+    reflections are searched only once. The table is kept across calls to
+    find_best_move, and therefore across games played by the same strategy.
+
+    Example:
+    ========
+    >>> from src.transposition_table import TranspositionTable
+    >>> # Share one table between two strategies
+    >>> table = TranspositionTable()
+    >>> ai_x = AIPlayer("X", MinimaxStrategy(transposition_table=table))
+    >>> ai_o = AIPlayer("O", MinimaxStrategy(transposition_table=table))
+    >>> # See how much work each move costs
+    >>> strategy = MinimaxStrategy(collect_report=True)
+    >>> strategy.find_best_move(board, ai)
+    >>> strategy.last_report.nodes
+    >>> # Depth-limited searches score the open lines at the depth limit
+    >>> strategy = MinimaxStrategy(evaluation=LineEvaluation)
+    """
+
+    def __init__(self,
+                 transposition_table: Union[TranspositionTable, None] = None,
+                 collect_report: bool = False,
+                 evaluation: Union[type[Evaluation], None] = LineEvaluation):
+        """
+        Initialize the strategy.
 
-    def find_best_move(self, board: GameBoard, player: Player) -> tuple[int, int]:
+        Parameters:
+            transposition_table (TranspositionTable): A table to share with other
+                strategies, a new table is created if None.
+            collect_report (bool): Fill last_report with a SearchReport after each search.
+            evaluation (type[Evaluation]): The evaluation of the positions at the depth
+                limit, created for each searched board. None scores them 0, like a draw.
+        """
+        self.transposition_table = transposition_table if transposition_table is not None else TranspositionTable()
+        self.collect_report = collect_report
+        self.evaluation = evaluation
+        self.hooks: list[SearchHook] = []
+
+        # True while a search collects a report or calls hooks, checked once per
+        # node so neither costs anything when it's off
+        self._instrumented = False
+        self._report: Union[SearchReport, None] = None
+
+        # True while a search is traced, checked once per search so the
+        # trace points cost nothing when tracing is off
+        self._trace = False
+
+        # The perf_counter() time the search must stop at, None without a time limit
+        self._deadline = None
+
+        # Set when a depth-limited search stops at its depth limit
+        self._horizon_reached = False
+
+    def find_best_move(self,
+                       board: GameBoard,
+                       player: Player,
+                       time_limit: Union[float, None] = None) -> tuple[int, int]:
         """
         Find the optimal move using Minimax.
 
+        Without a time limit the game tree is searched to the end. With a time
+        limit the search deepens one move at a time (iterative deepening) and
+        returns the best move of the deepest search finished in time.
+
         Parameters:
             board (GameBoard): The game board instance.
             player (Player): The AI player instance.
+            time_limit (float): The time budget in seconds, None to search to the end.
 
         Returns:
             tuple[int, int]: (row, col) of the best move.
-        """
 
-        # Assigns best score to the highest negative int
-        best_score = float("inf")   # Represents the minimizing player best score
+        Raises:
+            SearchCancelled: If cancel() was called during the search.
+
+        Example:
+        ========
+        >>> # Answer within 50 ms on a 4x4 board
+        >>> MinimaxStrategy().find_best_move(BitBoard(4), ai, time_limit=0.05)
+        """
 
-        # Assigns best move to None
-        best_move = None
-        best_moves = []
         # If player symbol == "X" it changes to "O", else it switches to "X"
         opponent = Player("O" if player.symbol == "X" else "X")
 
+        self._trace = log.isEnabledFor(TRACE)
+
+        self._instrumented = self.collect_report or bool(self.hooks)
+        if self._instrumented:
+            self._report = SearchReport(strategy=type(self).__name__)
+            start = time.perf_counter()
+            for hook in self.hooks:
+                hook.on_search_start(board, player)
+
+        if time_limit is not None:
+            # A search stopped by the clock leaves its moves on the board, so a copy is searched
+            search_board = board.copy()
+            self._attach_evaluation(search_board)
+            best_move = self._iterative_deepening(search_board, player, opponent, time_limit)
+        else:
+            best_move, scores = self._search_root(board, player, opponent)
+            if self._instrumented:
+                self._record_result(board, player, opponent, best_move, scores)
+
+        if self._instrumented:
+            self._report.best_move = best_move
+            self._report.elapsed = time.perf_counter() - start
+            self.last_report = self._report
+            for hook in self.hooks:
+                hook.on_search_end(self._report)
+
+        log.debug("Best move for %s: %s", player.symbol, best_move)
+        return best_move
+
+    def add_hook(self, hook: SearchHook) -> None:
+        """
+        Attach a hook, it is called by every following search.
+
+        Parameters:
+            hook (SearchHook): The hook.
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: SearchHook) -> None:
+        """
+        Detach a hook.
+
+        Parameters:
+            hook (SearchHook): The hook.
+        """
+        self.hooks.remove(hook)
+
+    def _attach_evaluation(self, board: GameBoard) -> None:
+        """
+        Attach the evaluation of the strategy to a board a depth-limited search runs on.
+
+        Parameters:
+            board (GameBoard): The board, a copy the search may change.
+        """
+
+        if self.evaluation is not None and not isinstance(board.evaluation, self.evaluation):
+            board.attach_evaluation(self.evaluation(board))
+
+    def _horizon_score(self, board: GameBoard, opponent: Player) -> float:
+        """
+        Score a position at the depth limit with the evaluation attached to the board.
+
+        Parameters:
+            board (GameBoard): The position.
+            opponent (Player): The human player (maximizing).
+
+        Returns:
+            float: Between -1 and 1, positive when the position is good for the opponent, 0 without an evaluation.
+        """
+
+        evaluation = board.evaluation
+        if evaluation is None:
+            return 0
+
+        score = evaluation.score(opponent.symbol)
+        return score / (abs(score) + HORIZON_SCALE)
+
+    def _iterative_deepening(self,
+                             board: GameBoard,
+                             player: Player,
+                             opponent: Player,
+                             time_limit: float) -> tuple[int, int]:
+        """
+        Search 0, 1, 2... moves deep until the time runs out, and return the best
+        move of the deepest search that finished. Depth 0 scores the position
+        after each root move with the evaluation, the replies aren't searched.
+
+        Each search tries the root moves in the order of the scores of the
+        previous one, the last one searches to the end of the game.
+
+        Parameters:
+            board (GameBoard): The game board instance, moves are left on it if the time runs out.
+            player (Player): The AI player (minimizing).
+            opponent (Player): The human player (maximizing).
+            time_limit (float): The time budget in seconds.
+
+        Returns:
+            tuple[int, int]: (row, col) of the best move.
+        """
+
+        empty_cells = board.get_empty_cells()
+
+        # Plays near the centre if not even the first search finishes in time
+        best_move = tie_order(board, 0)[0] if empty_cells else None
+        order = None
+        table = self.transposition_table
+        self._deadline = time.perf_counter() + time_limit
+
+        try:
+            for max_depth in range(len(empty_cells)):
+                # Depth-limited scores are only valid for one depth, so they get a table of their own
+                self.transposition_table = TranspositionTable()
+                self._horizon_reached = False
+
+                best_move, scores = self._search_root(board, player, opponent, max_depth, order)
+                log.debug("Depth %d: best move for %s is %s", max_depth, player.symbol, best_move)
+                if self._instrumented:
+                    self._record_iteration(board, player, opponent, best_move, scores, max_depth)
+
+                # Nothing was cut off by the depth limit, so the result is already exact
+                if not self._horizon_reached:
+                    return best_move
+
+                # The next search tries the best moves of this one first, a forced
+                # block only has its own score, the other moves follow in row-major order
+                order = sorted(empty_cells, key=lambda cell: scores.get(cell, float("inf")))
+
+            # The last search runs to the end of the game and fills the shared table
+            self.transposition_table = table
+            best_move, scores = self._search_root(board, player, opponent, None, order)
+            if self._instrumented:
+                self._record_iteration(board, player, opponent, best_move, scores, None)
+
+        except SearchTimeout:
+            log.debug("Out of time, playing %s", best_move)
+
+        finally:
+            self.transposition_table = table
+            self._deadline = None
+
+        return best_move
+
+    def _record_iteration(self,
+                          board: GameBoard,
+                          player: Player,
+                          opponent: Player,
+                          best_move: tuple[int, int],
+                          scores: dict,
+                          max_depth: Union[int, None]) -> None:
+        """
+        Write the result of a finished iteration to the report, and call the hooks.
+
+        Parameters:
+            board (GameBoard): The game board instance.
+            player (Player): The AI player (minimizing).
+            opponent (Player): The human player (maximizing).
+            best_move (tuple[int, int]): The best move of the iteration.
+            scores (dict): The score of each root move searched.
+            max_depth (int): The depth limit of the iteration, None for the full search.
+        """
+
+        self._record_result(board, player, opponent, best_move, scores, max_depth)
+        self._report.iterations += 1
+
+        depth = max_depth if max_depth is not None else board.size * board.size - board.move_count
+        for hook in self.hooks:
+            hook.on_iteration(depth, best_move, scores, self._report)
+
+    def _record_result(self,
+                       board: GameBoard,
+                       player: Player,
+                       opponent: Player,
+                       best_move: tuple[int, int],
+                       scores: dict,
+                       max_depth: Union[int, None] = None) -> None:
+        """
+        Write the best move, its score and the principal variation to the report.
+
+        Parameters:
+            board (GameBoard): The game board instance.
+            player (Player): The AI player (minimizing).
+            opponent (Player): The human player (maximizing).
+            best_move (tuple[int, int]): The best move found.
+            scores (dict): The score of each root move searched.
+            max_depth (int): The depth limit of the search, None for a full search.
+        """
+
+        self._report.best_move = best_move
+        self._report.score = scores.get(best_move)
+        if best_move is not None:
+            self._report.principal_variation = self._principal_variation(board, player, opponent,
+                                                                         best_move, max_depth)
+
+    def _principal_variation(self,
+                             board: GameBoard,
+                             player: Player,
+                             opponent: Player,
+                             best_move: tuple[int, int],
+                             max_depth: Union[int, None] = None) -> list[tuple[int, int]]:
+        """
+        Follow the best moves from the root through the transposition table.
+
+        At each position the first move whose score equals the score of the
+        position is taken. The walk stops where the table has no exact score,
+        e.g. below an alpha-beta cutoff or at the depth limit.
+
+        Parameters:
+            board (GameBoard): The game board instance, it is left unchanged.
+            player (Player): The AI player (minimizing).
+            opponent (Player): The human player (maximizing).
+            best_move (tuple[int, int]): The move played at the root.
+            max_depth (int): The depth limit of the search, None for a full search.
+
+        Returns:
+            list[tuple[int, int]]: The expected moves, best move first.
+        """
+
+        variation = [best_move]
+        board.make_move(best_move[0], best_move[1], player.symbol)
+        depth = 0
+        is_maximizing_turn = True
+
+        try:
+            while True:
+                score = self._known_score(board, depth, is_maximizing_turn, player, opponent, max_depth)
+                # The game is over, or the table doesn't know the position
+                if score is None or board.is_winner(player.symbol) or board.is_winner(opponent.symbol) \
+                        or board.is_full():
+                    break
+
+                symbol = opponent.symbol if is_maximizing_turn else player.symbol
+                for row, col in board.iter_empty_cells():
+                    board.make_move(row, col, symbol)
+                    if self._known_score(board, depth + 1, not is_maximizing_turn, player, opponent,
+                                         max_depth) == score:
+                        break
+                    board.unmake_move()
+                else:
+                    break
+
+                variation.append((row, col))
+                depth += 1
+                is_maximizing_turn = not is_maximizing_turn
+
+        finally:
+            # Takes the moves back, last made first
+            for _ in variation:
+                board.unmake_move()
+
+        return variation
+
+    def _known_score(self,
+                     board: GameBoard,
+                     depth: int,
+                     is_maximizing_turn: bool,
+                     player: Player,
+                     opponent: Player,
+                     max_depth: Union[int, None]) -> Union[int, None]:
+        """
+        Return the score of a position if the game is over or the table has an exact score, None otherwise.
+        """
+
+        if board.is_winner(opponent.symbol):
+            return 10 + depth
+        if board.is_winner(player.symbol):
+            return 10 - depth
+        if board.is_full():
+            return 0
+
+        entry = self.transposition_table.lookup((board.canonical_hash(), player.symbol, is_maximizing_turn))
+        if entry is None or entry.flag != EXACT or (max_depth is not None and entry.depth != depth):
+            return None
+        return self._score_from_entry(entry, depth, player, opponent)[0]
+
+    def _visit_node(self, board: GameBoard, depth: int) -> None:
+        """
+        Count a visited position in the report and call the node hooks.
+
+        Parameters:
+            board (GameBoard): The position.
+            depth (int): Its depth in the game tree, 0 after the root move.
+        """
+
+        report = self._report
+        report.nodes += 1
+        report.max_depth = max(report.max_depth, depth + 1)
+        if board.is_winner("X") or board.is_winner("O") or board.is_full():
+            report.terminal_nodes += 1
+
+        for hook in self.hooks:
+            hook.on_node(board, depth, report)
+
+    def _search_root(self,
+                     board: GameBoard,
+                     player: Player,
+                     opponent: Player,
+                     max_depth: Union[int, None] = None,
+                     order: Union[list[tuple[int, int]], None] = None) -> tuple[tuple[int, int], dict]:
+        """
+        Score the moves of the AI player and pick the best one.
+
+        Ties go to the first move in the tie order (see tie_order), whatever
+        order the moves are searched in, so the result doesn't depend on the order.
+
+        Parameters:
+            board (GameBoard): The game board instance.
+            player (Player): The AI player (minimizing).
+            opponent (Player): The human player (maximizing).
+            max_depth (int): Stop searching this many moves below the root, None to search to the end.
+            order (list[tuple[int, int]]): The order to search the moves in, row-major if None.
+
+        Returns:
+            tuple[tuple[int, int], dict]: The best move, and the score of each searched move.
+        """
+
+        empty_cells = board.get_empty_cells()
+        tactics = find_tactics(board, player.symbol)
+
+        # A winning move on the next turn is played at once, this represents an
+        # opportunistic player
+        if tactics.wins:
+            return tactics.wins[0], {tactics.wins[0]: 10}
+
+        # With one winning cell for the opponent, every other move scores at least
+        # OPPONENT_WINS_NEXT, so a block scoring less is the best move without
+        # searching the others. A block that only delays a loss falls through to the full search.
+        if len(tactics.blocks) == 1:
+            block = tactics.blocks[0]
+            board.make_move(block[0], block[1], player.symbol)
+            score = self._score_root_move(board, player, opponent, OPPONENT_WINS_NEXT, max_depth)
+            board.unmake_move()
+            if self._trace:
+                log.log(TRACE, "Forced block %s for %s scores %s", block, player.symbol, score)
+            if score < OPPONENT_WINS_NEXT:
+                return block, {block: score}
+
+        # Otherwise every move is searched, the forks first: they tighten the bounds early
+        if order is None and (tactics.forks or tactics.fork_blocks):
+            first = tactics.fork_blocks + [cell for cell in tactics.forks if cell not in tactics.fork_blocks]
+            order = first + [cell for cell in empty_cells if cell not in first]
+
+        # Assigns best score to the highest positive int
+        best_score = float("inf")   # Represents the minimizing player best score
+        best_move = None
+        scores = {}
+        natural_index = {cell: index for index, cell in enumerate(tie_order(board, max_depth))}
+
+        for row, col in order if order is not None else empty_cells:
+            # A move before the best move in the tie order also wins a tie
+            earlier = best_move is not None and natural_index[(row, col)] < natural_index[best_move]
+            bound = best_score + 1 if earlier else best_score
 
-        # Iterates through each row and col in the list of empty cells
-        for row, col in board.get_empty_cells():
             # Player makes a move
             board.make_move(row, col, player.symbol)
-            # Adds each move the maximizing player makes to the score
-            score, winner_player = self.minimax(board, 0, True, player, opponent)
-
+            score = self._score_root_move(board, player, opponent, bound, max_depth)
 
             # Undoes move
-            board.game_board[row][col] = ""
-
-            # Choose the best score and returns the best move
-            if score < best_score or score == 10:
-                # This represents a winning position for the
-                # AI Player on the next move, Since (10 - 0)
-                # represents a win on the next move for the AI Player.
-                # So, this represents an opportunistic player
-                if score == 10 and winner_player == player:
-
-                    return row, col
-                # And, this represents any other condition to block the
-                # human player
-                else:
-                    best_score = score
-                    best_move = row, col
-                    best_moves.append(best_move)
+            board.unmake_move()
+            scores[(row, col)] = score
 
-        return best_move
+            if self._trace:
+                log.log(TRACE, "Root move (%d, %d) for %s scores %s (bound %s)", row, col, player.symbol, score, bound)
+
+            # Choose the best score and the best move
+            if score < best_score or (earlier and score == best_score):
+                best_score = score
+                best_move = row, col
+
+        return best_move, scores
+
+    def _score_root_move(self,
+                         board: GameBoard,
+                         player: Player,
+                         opponent: Player,
+                         bound: float,
+                         max_depth: Union[int, None]) -> int:
+        """
+        Score the position after a move of the AI player.
+
+        Parameters:
+            board (GameBoard): The board, with the move made.
+            player (Player): The AI player (minimizing).
+            opponent (Player): The human player (maximizing).
+            bound (float): Only scores below the bound can change the best move,
+                Minimax searches exactly anyway.
+            max_depth (int): Stop searching this many moves below the root, None to search to the end.
+
+        Returns:
+            int: The score of the move.
+        """
+        return self.minimax(board, 0, True, player, opponent, max_depth)[0]
 
     def minimax(self,
                 board: GameBoard,
                 depth: int,
                 is_maximizing_turn: bool,
                 player: Player,
-                opponent: Player, ) -> tuple[int, Union[Player, None]]:
+                opponent: Player,
+                max_depth: Union[int, None] = None) -> tuple[int, Union[Player, None]]:
         """
         Recursively evaluate board states with Minimax.
 
@@ -125,11 +603,16 @@ class MinimaxStrategy(MoveStrategy):
             is_maximizing_turn (bool): True if maximizing (X), False if minimizing (O).
             player (Player): The AI player (minimizing).
             opponent (Player): The human player (maximizing).
+            max_depth (int): Score the positions this deep with the evaluation, None to search to the end.
 
         Returns:
             int: Score of the board state.
         """
 
+        # Counts the position and calls the hooks, only if asked for
+        if self._instrumented:
+            self._visit_node(board, depth)
+
         # Checks if the player (maximizing) is a winner returns score
         if board.is_winner(opponent.symbol):
             return 10 + depth, opponent
@@ -142,63 +625,119 @@ class MinimaxStrategy(MoveStrategy):
         if board.is_full():
             return 0, None
 
+        # Stops here if the search was cancelled from another thread
+        if self.cancel_requested:
+            raise SearchCancelled()
+
+        # Stops here if the time budget is spent
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        # Stops here at the depth limit, the position is scored by the evaluation
+        if max_depth is not None and depth >= max_depth:
+            self._horizon_reached = True
+            return self._horizon_score(board, opponent), None
+
+        # Looks the position up in the transposition table, the key includes who
+        # is to move and who the AI is, since both change the score
+        key = (board.canonical_hash(), player.symbol, is_maximizing_turn)
+        entry = self.transposition_table.lookup(key)
+        # Bounds stored by an alpha-beta search sharing the table are ignored, and
+        # so are depth-limited scores stored at another depth
+        if entry is not None and entry.flag == EXACT and (max_depth is None or entry.depth == depth):
+            if self._trace:
+                log.log(TRACE, "Depth %d, transposition hit: %s", depth, entry)
+            if self._instrumented:
+                self._report.tt_hits += 1
+            return self._score_from_entry(entry, depth, player, opponent)
+
         if is_maximizing_turn:
             # Assigns best score to the highest negative int
             best_score = -float("inf")
             # Represents the winning player, if any, or None
-            winner_player = None
+            best_winner = None
             # Iterates through each cell(tuple) in the list of empty cells
-            for cell in board.get_empty_cells():
+            for cell in board.iter_empty_cells():
                 # log.info("Maximizing is playing...")
                 # Decomposes each cell
                 row, col = cell
 
-
-
                 # The maximizing player makes a move
                 board.make_move(row, col, opponent.symbol)
 
-
                 # Adds each move the maximizing player makes to the score
-                score, winner_player = self.minimax(board, depth + 1, False, player, opponent)
-
+                score, winner_player = self.minimax(board, depth + 1, False, player, opponent, max_depth)
 
                 # Undoes the move made by the player
-                board.game_board[row][col] = ""
-                log.info(board)
-
-                # Chooses the best score
-                best_score = max(best_score, score)
-
+                board.unmake_move()
 
+                # The board is only formatted if the message is logged
+                if self._trace:
+                    log.log(TRACE, "Depth %d, %s at (%d, %d) scores %s, before the move:%s",
+                            depth, opponent.symbol, row, col, score, board)
 
-            # Returns the best score
-            return best_score, winner_player
+                # Chooses the best score, and remembers who wins with it
+                if score > best_score:
+                    best_score, best_winner = score, winner_player
 
         else:
             # Assigns best score to the highest positive int
             best_score = float("inf")
-            winner_player = None
+            best_winner = None
 
             # Iterates through each cell(tuple) in the list of empty cells
-            for cell in board.get_empty_cells():
+            for cell in board.iter_empty_cells():
 
                 # log.info("Minimizing is playing...")
                 # Decomposes each cell
                 row, col = cell
 
-
                 board.make_move(row, col, player.symbol)
 
-                score, winner_player = self.minimax(board, depth + 1, True, player, opponent)
-
+                score, winner_player = self.minimax(board, depth + 1, True, player, opponent, max_depth)
 
                 # Undoes the move made by the player
-                board.game_board[row][col] = ""
+                board.unmake_move()
+
+                if self._trace:
+                    log.log(TRACE, "Depth %d, %s at (%d, %d) scores %s, before the move:%s",
+                            depth, player.symbol, row, col, score, board)
+
+                # Chooses the best score, and remembers who wins with it
+                if score < best_score:
+                    best_score, best_winner = score, winner_player
+
+        # Stores the result, so this position is never searched again
+        self.transposition_table.store(key, best_score, depth, best_winner.symbol if best_winner else "",
+                                       remaining=board.size * board.size - board.move_count)
 
+        # Returns the best score
+        return best_score, best_winner
+
+    @staticmethod
+    def _score_from_entry(entry, depth: int, player: Player, opponent: Player) -> tuple[int, Union[Player, None]]:
+        """
+        Convert a transposition table entry to the score at the current depth.
+
+        A win found `d` moves below a node scores 10 + depth + d for the opponent
+        or 10 - depth - d for the player, so a stored win is moved by the
+        difference between the current depth and the stored depth.
+
+        Parameters:
+            entry (TTEntry): The stored result.
+            depth (int): The current depth in the game tree.
+            player (Player): The AI player (minimizing).
+            opponent (Player): The human player (maximizing).
+
+        Returns:
+            tuple[int, Union[Player, None]]: The score and the predicted winner.
+        """
 
-                # Chooses the best score
-                best_score = min(best_score, score)
+        if entry.winner == opponent.symbol:
+            return entry.score + (depth - entry.depth), opponent
 
-            return best_score, winner_player
+        if entry.winner == player.symbol:
+            return entry.score - (depth - entry.depth), player
 
+        # A draw, or an evaluation at the depth limit
+        return entry.score, None
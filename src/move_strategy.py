@@ -1,21 +1,59 @@
 # File: move_strategy.py
 from abc import ABC, abstractmethod
+from typing import Union
 from src.game_board import GameBoard
 from src.player import Player
 
 
+class SearchCancelled(Exception):
+    """Raised by find_best_move when the search was cancelled with MoveStrategy.cancel()."""
+
+
+class SearchTimeout(Exception):
+    """Raised inside a search when its time budget is spent, find_best_move catches it."""
+
+
 class MoveStrategy(ABC):
     """Abstract base class for AI move strategies (Strategy Pattern)."""
+
+    # Set by cancel(), possibly from another thread, and read by the search
+    cancel_requested: bool = False
+
+    # The SearchReport of the last search, for strategies that report one
+    last_report = None
+
     @abstractmethod
-    def find_best_move(self, board: GameBoard, player: Player) -> tuple[int, int]:
+    def find_best_move(self,
+                       board: GameBoard,
+                       player: Player,
+                       time_limit: Union[float, None] = None) -> tuple[int, int]:
         """
         Determine the best move for the player.
 
         Parameters:
             board (GameBoard): The game board instance.
             player (Player): The AI player instance.
+            time_limit (float): The time budget in seconds, None for no limit.
+                Strategies that answer at once ignore it.
 
         Returns:
             tuple[int, int]: (row, col) of the best move.
         """
         pass
+
+    def cancel(self) -> None:
+        """
+        Ask a running find_best_move to stop: it raises SearchCancelled at the
+        next position it looks at. Strategies that answer at once ignore it.
+
+        The request stays until reset_cancel() is called, so call that before
+        starting the next search. A cancelled search leaves the moves it was
+        trying on the board, so search a copy (GameBoard.copy) when you may cancel.
+        """
+        self.cancel_requested = True
+
+    def reset_cancel(self) -> None:
+        """
+        Clear a cancel request, so the next search runs to the end.
+        """
+        self.cancel_requested = False
@@ -0,0 +1,449 @@
+"""
+Root-split parallel Minimax: the moves of the AI at the root are scored
+each in a process of a pool, by the same engine (MinimaxStrategy or
+AlphaBetaStrategy) the serial search uses, then combined in this process.
+
+The serial engine picks the move with the lowest score, the first one in
+its tie order on a tie (row-major, nearest the centre first for a
+depth-limited search, see minimax_strategy.tie_order). Minimax scores every root move exactly, so
+combining the scores the same way picks exactly the same move, however the
+work was spread over the pool. Alpha-beta first scores the most promising
+move alone, then all the others at once with the bound it gives them (see
+_score_moves): a move that could beat it still gets its exact score, so the
+same move is picked again.
+
+A single winning cell of the opponent (see tactics.py) is scored alone
+first, like the serial root does: if blocking it doesn't lose, it is the
+best move and nothing else is sent to the pool.
+
+Moves leading to symmetric positions have the same score, so only one of
+each is sent to the pool: on the empty 3x3 board 9 moves are 3 tasks.
+
+Each worker keeps its engine, and its transposition table, between
+searches, so the later moves of a game are mostly table hits. With a
+cache_dir the workers keep their results in search cache files instead,
+one per worker and board variant, so a restarted pool starts warm.
+"""
+
+# File: parallel_minimax_strategy.py
+import itertools
+import multiprocessing
+import os
+import time
+from typing import Union
+
+from src.alpha_beta_strategy import AlphaBetaStrategy
+from src.bit_board import pack_board, unpack_board
+from src.game_board import GameBoard
+from src.logger import getLogger
+from src.minimax_strategy import OPPONENT_WINS_NEXT, MinimaxStrategy, tie_order
+from src.move_strategy import MoveStrategy, SearchCancelled, SearchTimeout
+from src.player import Player
+from src.search_cache import DEFAULT_MAX_BYTES, SearchCache
+from src.search_report import SearchReport
+from src.tactics import find_tactics
+from src.transposition_table import TranspositionTable
+
+log = getLogger(__name__)
+
+# How often (seconds) a search checks for cancel() while the workers run
+CANCEL_POLL = 0.05
+
+# Positions with fewer empty cells are searched in this process, the pool costs more than it saves
+SERIAL_BELOW = 7
+
+# The per-process state of the pool workers
+_worker = {}
+
+
+class ParallelMinimaxStrategy(MoveStrategy):
+    """
+    Scores the root moves in a pool of processes, see the module docstring.
+
+    Without a time limit it picks exactly the move the serial engine picks.
+    With a time limit it deepens one move at a time like the serial engine,
+    each depth scored in parallel, and plays the best move of the deepest
+    depth that finished.
+
+    Example:
+    ========
+    >>> from src.parallel_minimax_strategy import ParallelMinimaxStrategy
+    >>> ai = AIPlayer("O", ParallelMinimaxStrategy(workers=4))
+    >>> # Minimax instead of alpha-beta in the workers
+    >>> ai = AIPlayer("O", ParallelMinimaxStrategy(engine=MinimaxStrategy))
+    """
+
+    def __init__(self,
+                 workers: Union[int, None] = None,
+                 engine: type[MinimaxStrategy] = AlphaBetaStrategy,
+                 serial_below: int = SERIAL_BELOW,
+                 collect_report: bool = False,
+                 cache_dir: Union[str, None] = None,
+                 cache_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the strategy, the pool is started by the first parallel search.
+
+        Parameters:
+            workers (int): The processes of the pool, the number of CPUs if None.
+            engine (type[MinimaxStrategy]): The search run in the workers, MinimaxStrategy or a subclass.
+            serial_below (int): Search positions with fewer empty cells in this process.
+            collect_report (bool): Fill last_report with a SearchReport after each search.
+            cache_dir (str): The directory of the workers' search cache files, None to
+                keep their results in memory only.
+            cache_bytes (int): The size of each search cache file.
+        """
+
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.engine = engine
+        self.serial_below = serial_below
+        self.collect_report = collect_report
+        self.cache_dir = cache_dir
+        self.cache_bytes = cache_bytes
+
+        # The engine used for small positions and the immediate wins, in this process
+        self.serial = engine(collect_report=collect_report)
+        self._pool = None
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle the settings without the pool, e.g. to send the strategy to a process.
+        """
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def close(self) -> None:
+        """
+        Stop the process pool, if one was started.
+        """
+
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def cancel(self) -> None:
+        """
+        Ask a running find_best_move to stop, see MoveStrategy.cancel.
+
+        The pool is stopped with the search, so its workers don't go on with
+        the tasks already sent, and the next search starts a new one (with
+        empty tables).
+        """
+        super().cancel()
+        self.serial.cancel()
+
+    def reset_cancel(self) -> None:
+        """
+        Clear a cancel request, so the next search runs to the end.
+        """
+        super().reset_cancel()
+        self.serial.reset_cancel()
+
+    def find_best_move(self,
+                       board: GameBoard,
+                       player: Player,
+                       time_limit: Union[float, None] = None) -> tuple[int, int]:
+        """
+        Find the best move, scoring the root moves in parallel.
+
+        Parameters:
+            board (GameBoard): The game board instance, it is not changed.
+            player (Player): The AI player instance.
+            time_limit (float): The time budget in seconds, None to search to the end.
+
+        Returns:
+            tuple[int, int]: (row, col) of the best move.
+
+        Raises:
+            SearchCancelled: If cancel() was called during the search.
+        """
+
+        empty_cells = board.get_empty_cells()
+        if len(empty_cells) < max(self.serial_below, 2):
+            best_move = self.serial.find_best_move(board, player, time_limit)
+            self.last_report = self.serial.last_report
+            return best_move
+
+        started = time.perf_counter()
+        report = SearchReport(strategy=type(self).__name__) if self.collect_report else None
+
+        # A winning move is played at once, like the serial engine does
+        tactics = find_tactics(board, player.symbol)
+        best_move = tactics.wins[0] if tactics.wins else None
+        scores = {best_move: 10} if best_move is not None else None
+        block = tactics.blocks[0] if len(tactics.blocks) == 1 else None
+
+        if best_move is None and time_limit is None:
+            best_move, scores, _ = self._score_moves(board, player.symbol, None, None, report, block=block)
+        elif best_move is None:
+            best_move, scores = self._iterative_deepening(board, player.symbol, empty_cells,
+                                                          started + time_limit, report, block)
+
+        if report is not None:
+            report.best_move = best_move
+            report.score = scores.get(best_move) if scores else None
+            report.principal_variation = [best_move]
+            report.elapsed = time.perf_counter() - started
+            self.last_report = report
+
+        log.debug("Best move for %s: %s", player.symbol, best_move)
+        return best_move
+
+    def _iterative_deepening(self,
+                             board: GameBoard,
+                             symbol: str,
+                             empty_cells: list[tuple[int, int]],
+                             deadline: float,
+                             report: Union[SearchReport, None],
+                             block: Union[tuple[int, int], None] = None) -> tuple[tuple[int, int], dict]:
+        """
+        Score the root moves 0, 1, 2... moves deep until the deadline, then to
+        the end of the game, and return the result of the deepest finished depth.
+        Each depth starts with the best move of the one before.
+        """
+
+        # Plays near the centre if not even the first depth finishes in time
+        best_move, scores = tie_order(board, 0)[0], {}
+        reference = None
+
+        for max_depth in list(range(len(empty_cells))) + [None]:
+            result = self._score_moves(board, symbol, max_depth, deadline, report, reference, block)
+            if result is None:
+                log.debug("Out of time, playing %s", best_move)
+                break
+
+            best_move, scores, horizon_reached = result
+            reference = best_move
+            if report is not None:
+                report.iterations += 1
+            log.debug("Depth %s: best move for %s is %s", max_depth, symbol, best_move)
+
+            # Nothing was cut off by the depth limit, so the result is already exact
+            if not horizon_reached:
+                break
+
+        return best_move, scores
+
+    def _score_moves(self,
+                     board: GameBoard,
+                     symbol: str,
+                     max_depth: Union[int, None],
+                     deadline: Union[float, None],
+                     report: Union[SearchReport, None],
+                     reference: Union[tuple[int, int], None] = None,
+                     block: Union[tuple[int, int], None] = None) \
+            -> Union[tuple[tuple[int, int], dict, bool], None]:
+        """
+        Score the root moves in the pool and pick the best one.
+
+        Minimax scores every move exactly, all at once. Alpha-beta first
+        scores one move exactly (the reference: the most promising one), then
+        the others at once with the bound the serial root search would give
+        them after it. A move scoring at or above its bound can't be the best
+        move and only gets a lower bound, like in the serial search.
+
+        Parameters:
+            board (GameBoard): The game board instance.
+            symbol (str): The symbol of the AI player (minimizing).
+            max_depth (int): The depth limit, None to search to the end.
+            deadline (float): The perf_counter() time to stop at, None for no limit.
+            report (SearchReport): The report to add the work of the workers to, or None.
+            reference (tuple[int, int]): The move to score first, picked by the move ordering if None.
+            block (tuple[int, int]): The single winning cell of the opponent, scored alone first.
+
+        Returns:
+            tuple[tuple[int, int], dict, bool]: The best move, the score of each move, and
+                whether the depth limit cut anything off. None if the time ran out.
+        """
+
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers, initializer=_init_worker, initargs=(self.engine, self.cache_dir, self.cache_bytes))
+
+        # One task per symmetry class of the positions after the moves, sent as
+        # its first move in the tie order
+        ties = tie_order(board, max_depth)
+        classes = {}
+        for row, col in ties:
+            board.make_move(row, col, symbol)
+            classes.setdefault(board.canonical_hash(), []).append((row, col))
+            board.unmake_move()
+        class_of = {move: moves for moves in classes.values() for move in moves}
+
+        natural_index = {cell: index for index, cell in enumerate(ties)}
+        packed = pack_board(board)
+        scores = {}
+        pending = list(classes.values())
+        bound = {id(moves): float("inf") for moves in pending}
+
+        # Every other move lets the opponent win next, so a block scoring below that is the best move
+        if block is not None:
+            bound[id(class_of[block])] = OPPONENT_WINS_NEXT
+            result = self._run_tasks([class_of[block]], bound, packed, symbol, max_depth, deadline, report, scores)
+            if result is None:
+                return None
+            if scores[block] < OPPONENT_WINS_NEXT:
+                return block, {block: scores[block]}, result
+
+            # The block loses anyway, everything is scored as usual
+            bound[id(class_of[block])] = float("inf")
+            scores.clear()
+
+        if issubclass(self.engine, AlphaBetaStrategy):
+            if reference is None:
+                reference = AlphaBetaStrategy.order_moves(board, symbol, "O" if symbol == "X" else "X")[0]
+            first = class_of[reference]
+            pending.remove(first)
+
+            result = self._run_tasks([first], bound, packed, symbol, max_depth, deadline, report, scores)
+            if result is None:
+                return None
+            horizon_reached = result
+
+            # A move before the reference in the tie order also wins a tie
+            reference_score, reference_index = scores[first[0]], natural_index[first[0]]
+            for moves in pending:
+                earlier = natural_index[moves[0]] < reference_index
+                bound[id(moves)] = reference_score + 1 if earlier else reference_score
+        else:
+            horizon_reached = False
+
+        result = self._run_tasks(pending, bound, packed, symbol, max_depth, deadline, report, scores)
+        if result is None:
+            return None
+        horizon_reached |= result
+
+        # The lowest score, the first move in the tie order on a tie
+        best_move = min(ties, key=lambda move: scores[move])
+        return best_move, scores, horizon_reached
+
+    def _run_tasks(self,
+                   classes: list[list[tuple[int, int]]],
+                   bound: dict,
+                   packed: tuple,
+                   symbol: str,
+                   max_depth: Union[int, None],
+                   deadline: Union[float, None],
+                   report: Union[SearchReport, None],
+                   scores: dict) -> Union[bool, None]:
+        """
+        Score one move of each class in the pool and give its score to the whole class.
+
+        Returns:
+            bool: Whether the depth limit cut anything off, None if the time ran out.
+        """
+
+        # The deadline itself, not the time left: a task waiting in the queue must not
+        # start a full budget of its own (perf_counter is the same clock in every process)
+        tasks = [(packed, symbol, moves[0], bound[id(moves)], max_depth, deadline, report is not None)
+                 for moves in classes]
+
+        result = self._pool.map_async(_score_task, tasks, chunksize=1)
+        # Waits in short steps, so a cancel() is seen while the workers run
+        while not result.ready():
+            if self.cancel_requested:
+                # The tasks sent would keep the workers busy, the next search starts a new pool
+                self.close()
+                raise SearchCancelled()
+            result.wait(CANCEL_POLL)
+
+        horizon_reached = False
+        for moves, (score, horizon, work) in zip(classes, result.get()):
+            if score is None:
+                return None
+            horizon_reached |= horizon
+            for move in moves:
+                scores[move] = score
+            if report is not None:
+                report.nodes += work.nodes
+                report.terminal_nodes += work.terminal_nodes
+                report.max_depth = max(report.max_depth, work.max_depth)
+                report.tt_hits += work.tt_hits
+                report.cutoffs += work.cutoffs
+
+        return horizon_reached
+
+
+def _init_worker(engine: type[MinimaxStrategy], cache_dir: Union[str, None], cache_bytes: int) -> None:
+    """
+    Create the engine of a worker process, it keeps its table between tasks.
+    """
+    _worker["engine"] = engine()
+    _worker["cache_dir"] = cache_dir
+    _worker["cache_bytes"] = cache_bytes
+    _worker["caches"] = {}
+
+
+def _worker_cache(board: GameBoard) -> SearchCache:
+    """
+    Return the search cache of a board variant in a worker process, opened on first use.
+
+    A cache file is locked by the process that opens it, so each worker takes
+    the first file of the variant no other worker holds: a restarted pool
+    picks up the files of the old one.
+    """
+
+    variant = (board.size, board.win_length)
+    cache = _worker["caches"].get(variant)
+    if cache is None:
+        name = f"{_worker['engine'].__class__.__name__}-{board.size}x{board.size}-{board.win_length}"
+        for number in itertools.count():
+            try:
+                cache = SearchCache(os.path.join(_worker["cache_dir"], f"{name}-{number}.cache"), _worker["cache_bytes"])
+                break
+            except BlockingIOError:
+                continue
+        _worker["caches"][variant] = cache
+    return cache
+
+
+def _score_task(task: tuple) -> tuple[Union[int, None], bool, Union[SearchReport, None]]:
+    """
+    Score one root move in a worker process.
+
+    Parameters:
+        task (tuple): The packed board (see pack_board), the AI symbol, the move, its
+            bound, the depth limit, the perf_counter() time to stop at (None for no
+            limit) and whether to count the work.
+
+    Returns:
+        tuple[Union[int, None], bool, Union[SearchReport, None]]: The score of the move,
+            exact below the bound (None if the time ran out), whether the depth limit
+            cut anything off, and the work done if it was counted.
+    """
+
+    packed, symbol, move, bound, max_depth, deadline, count_work = task
+
+    # Waited in the queue until the time ran out
+    if deadline is not None and time.perf_counter() >= deadline:
+        return None, False, None
+
+    engine = _worker["engine"]
+    board = unpack_board(packed)
+    player = Player(symbol)
+    opponent = Player("O" if symbol == "X" else "X")
+
+    # Depth-limited scores are only valid for one depth, so they get a table of their own
+    table = engine.transposition_table
+    if max_depth is not None:
+        engine.transposition_table = TranspositionTable()
+        engine._attach_evaluation(board)
+    elif _worker["cache_dir"] is not None:
+        engine.transposition_table = _worker_cache(board)
+
+    engine._deadline = deadline
+    engine._horizon_reached = False
+    engine._instrumented = count_work
+    engine._report = SearchReport() if count_work else None
+
+    board.make_move(move[0], move[1], symbol)
+    try:
+        score = engine._score_root_move(board, player, opponent, bound, max_depth)
+    except SearchTimeout:
+        score = None
+    finally:
+        engine.transposition_table = table
+        engine._deadline = None
+        engine._instrumented = False
+
+    return score, engine._horizon_reached, engine._report
@@ -0,0 +1,213 @@
+"""
+The retrograde solver builds a tablebase for small boards (3x3 up to 4x4)
+with NumPy, working backwards from the positions where the game is over
+instead of searching forwards from the empty board.
+
+Positions are indexed like in src/tablebase.py: base-3 digits seen by the
+player to move, 0 empty, 1 the player to move, 2 the other player.
+
+1. Every index is classified at once: positions with impossible symbol
+   counts, or a line for the player to move, can't happen in a game.
+   Positions where the other player has a line are lost, full boards are
+   drawn, the others are kept by number of symbols on the board.
+2. A move adds a symbol, so positions with m symbols only lead to positions
+   with m + 1. The layers are solved from the fullest down: the value of a
+   position is the best of its children seen from the other side.
+
+The child of index i after a move on empty cell c is
+
+    swap(i) + 2 * 3 ** c,   swap(i) = 3 * occupied(i) - i
+
+where swap(i) turns 1 digits into 2 and 2 digits into 1 (the players trade
+places), and occupied(i) has a 1 digit on every taken cell.
+
+Build the 4x4 table (about 86 MB, under a minute) with:
+
+    python -m src.retrograde data/tictactoe_4x4.tb --size 4
+"""
+
+# File: retrograde.py
+import argparse
+import os
+import time
+from typing import Union
+
+import numpy as np
+
+from src.batch_eval import line_cells
+from src.logger import configure_logging, getLogger
+from src.tablebase import DRAW, HEADER, LOSS, MAGIC, MOVES_RECORD, UNREACHABLE, VALUE_RECORD, VERSION, WIN
+
+log = getLogger(__name__)
+
+# The largest board solved, 3 ** 16 positions already take 86 MB
+MAX_SIZE = 4
+
+# Indexes classified at a time
+CHUNK_SIZE = 1 << 19
+
+# A move is ranked by value * RANK_SCALE plus its distance rank
+RANK_SCALE = 512
+
+
+def _digits(indexes: np.ndarray, cells: int) -> np.ndarray:
+    """
+    Return the base-3 digits of position indexes, one column per cell.
+    """
+    powers = 3 ** np.arange(cells, dtype=np.int64)
+    return ((indexes[:, None] // powers) % 3).astype(np.int8)
+
+
+def _rank(values: np.ndarray, distances: np.ndarray) -> np.ndarray:
+    """
+    Rank results like tablebase.solve: a higher value is better, a win or a
+    draw is better sooner, a loss is better later.
+    """
+    distance_rank = np.where(values >= DRAW, 255 - distances.astype(np.int16), distances.astype(np.int16))
+    return values.astype(np.int16) * RANK_SCALE + distance_rank
+
+
+def solve_retrograde(size: int = 3,
+                     win_length: Union[int, None] = None,
+                     with_moves: bool = False) -> tuple[np.ndarray, np.ndarray, Union[np.ndarray, None]]:
+    """
+    Solve every position of a board backwards from the finished games.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board, MAX_SIZE at most.
+        win_length (int): The number of symbols in a row needed to win, the board size if None.
+        with_moves (bool): Also return the best moves of each position.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, Union[np.ndarray, None]]: int8 values, uint8
+            distances and, with_moves, uint16 best move masks, indexed by position.
+    """
+
+    if not 1 <= size <= MAX_SIZE:
+        raise ValueError(f"The retrograde solver handles boards up to {MAX_SIZE}x{MAX_SIZE}.")
+
+    win_length = win_length if win_length is not None else size
+    cells = size * size
+    count = 3 ** cells
+    lines = line_cells(size, win_length)
+    powers = 3 ** np.arange(cells, dtype=np.int64)
+
+    values = np.full(count, UNREACHABLE, dtype=np.int8)
+    distances = np.zeros(count, dtype=np.uint8)
+    moves = np.zeros(count, dtype=np.uint16) if with_moves else None
+
+    # 1. Classify every index, the unsolved ones are kept by number of symbols
+    layers = [[] for _ in range(cells + 1)]
+
+    for start in range(0, count, CHUNK_SIZE):
+        indexes = np.arange(start, min(start + CHUNK_SIZE, count), dtype=np.int64)
+        digits = _digits(indexes, cells)
+        mine = (digits == 1).sum(axis=1)
+        theirs = (digits == 2).sum(axis=1)
+
+        # The player to move has as many symbols as the other (moved first) or one less
+        legal = (theirs == mine) | (theirs == mine + 1)
+        line_digits = digits[:, lines]
+        legal &= ~(line_digits == 1).all(axis=2).any(axis=1)
+
+        lost = legal & (line_digits == 2).all(axis=2).any(axis=1)
+        drawn = legal & ~lost & (mine + theirs == cells)
+        open_ = legal & ~lost & ~drawn
+
+        values[indexes[lost]] = LOSS
+        values[indexes[drawn]] = DRAW
+
+        pieces = (mine + theirs)[open_]
+        for m in np.unique(pieces):
+            layers[m].append(indexes[open_][pieces == m].astype(np.int32))
+
+    # 2. Solve the layers, fullest first: their children are already solved
+    for m in range(cells - 1, -1, -1):
+        if not layers[m]:
+            continue
+
+        indexes = np.concatenate(layers[m]).astype(np.int64)
+        layers[m] = None
+        digits = _digits(indexes, cells)
+        swapped = 3 * ((digits != 0) @ powers) - indexes
+
+        best = np.full(len(indexes), np.iinfo(np.int16).min, dtype=np.int16)
+        ranks = np.empty((cells, len(indexes)), dtype=np.int16) if with_moves else None
+
+        for cell in range(cells):
+            empty = digits[:, cell] == 0
+            children = swapped[empty] + 2 * powers[cell]
+            rank = np.full(len(indexes), np.iinfo(np.int16).min, dtype=np.int16)
+            rank[empty] = _rank(-values[children], distances[children] + 1)
+            np.maximum(best, rank, out=best)
+            if with_moves:
+                ranks[cell] = rank
+
+        # Decodes the best rank back into a value and a distance
+        value = np.floor_divide(best, RANK_SCALE)
+        distance_rank = best - value * RANK_SCALE
+        values[indexes] = value
+        distances[indexes] = np.where(value >= DRAW, 255 - distance_rank, distance_rank)
+
+        if with_moves:
+            bits = (1 << np.arange(cells, dtype=np.int64))[:, None]
+            moves[indexes] = ((ranks == best) * bits).sum(axis=0)
+
+        log.debug(f"Solved {len(indexes)} positions with {m} symbols")
+
+    return values, distances, moves
+
+
+def write_tablebase_arrays(path: str,
+                           size: int,
+                           win_length: int,
+                           values: np.ndarray,
+                           distances: np.ndarray,
+                           moves: Union[np.ndarray, None] = None) -> None:
+    """
+    Write solved arrays to a tablebase file, in the format of src/tablebase.py.
+
+    Parameters:
+        path (str): The output file.
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win.
+        values (np.ndarray): int8 values, indexed by position.
+        distances (np.ndarray): uint8 distances.
+        moves (np.ndarray): uint16 best move masks, None for 2-byte records without moves.
+    """
+
+    if moves is not None:
+        records = np.empty(len(values), dtype=[("value", "<i1"), ("distance", "<u1"), ("moves", "<u2")])
+        records["moves"] = moves
+        record_size = MOVES_RECORD.size
+    else:
+        records = np.empty(len(values), dtype=[("value", "<i1"), ("distance", "<u1")])
+        record_size = VALUE_RECORD.size
+    records["value"] = values
+    records["distance"] = distances
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, size, win_length, record_size, len(values), 0))
+        records.tofile(file)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve every position backwards and write a tablebase.")
+    parser.add_argument("output", help="the tablebase file to write")
+    parser.add_argument("--size", type=int, default=3, help=f"rows (and columns) of the board, {MAX_SIZE} at most")
+    parser.add_argument("--win-length", type=int, default=None, help="symbols in a row needed to win (default: size)")
+    parser.add_argument("--moves", action="store_true", help="store the best moves too (4-byte records)")
+    args = parser.parse_args()
+
+    configure_logging(log_to_file=False)
+
+    board_win_length = args.win_length if args.win_length is not None else args.size
+    started = time.perf_counter()
+    solved_values, solved_distances, solved_moves = solve_retrograde(args.size, board_win_length, args.moves)
+    write_tablebase_arrays(args.output, args.size, board_win_length, solved_values, solved_distances, solved_moves)
+
+    legal = int((solved_values != UNREACHABLE).sum())
+    wins = int((solved_values == WIN).sum())
+    log.info(f"Wrote {legal} positions ({wins} won for the player to move) to {args.output} "
+             f"in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,320 @@
+"""
+A search cache is a transposition table of fixed size, so its memory use is
+capped however long the engine runs, and which can live in a file, so a
+restarted engine or worker process starts with the results of the previous
+runs instead of searching everything again.
+
+Cache file layout (the table itself is memory-mapped):
+
+    header:  magic "TTSC", version, ways, 2 pad bytes     4s u8 u8 xx
+             buckets                                        u64
+    table:   buckets x ways slots, 13 bytes each
+             hash      u64, the canonical hash of the position
+             score     i16
+             depth     u8, the depth the score was computed at
+             remaining u8, the empty cells of the position
+             meta      u8, bit 0 used, bit 1 O to move, bit 2 maximizing turn,
+                       bits 3-4 the flag, bits 5-6 the winner ("", "X", "O")
+
+A position goes to one bucket, picked from its key, and takes any slot of
+it. When the bucket is full the entry with the fewest empty cells is
+replaced: a position with many moves left to play stands for a big
+subtree and saves the most work when it is found again. A bound never
+replaces the exact score of the same position.
+
+Example:
+========
+>>> from src.search_cache import SearchCache
+>>> from src.minimax_strategy import MinimaxStrategy
+>>> with SearchCache("engine.cache", max_bytes=256 << 20) as cache:
+>>>     strategy = MinimaxStrategy(transposition_table=cache)
+>>>     # ... the searches fill the file, the next run starts with them ...
+"""
+
+# File: search_cache.py
+import mmap
+import os
+import struct
+from typing import Union
+
+from src.logger import getLogger
+from src.transposition_table import EXACT, TTEntry
+
+try:
+    import fcntl
+except ImportError:  # Windows, the files are not locked there
+    fcntl = None
+
+log = getLogger(__name__)
+
+# --------------------------------------------------------------
+# File format
+# --------------------------------------------------------------
+MAGIC = b"TTSC"
+VERSION = 2
+HEADER = struct.Struct("<4sBBxxQ")
+
+# Slots of a bucket, a new position may take any of them
+WAYS = 4
+SLOT = struct.Struct("<QhBBB")
+BUCKET = struct.Struct("<" + "QhBBB" * WAYS)
+FIELDS = 5
+
+# Bits of the meta byte
+USED = 1
+O_TO_MOVE = 2
+MAXIMIZING = 4
+# The bits that belong to the key: a slot matches if they and the hash are equal
+KEY_BITS = USED | O_TO_MOVE | MAXIMIZING
+
+WINNERS = ("", "X", "O")
+WINNER_CODES = {"": 0, "X": 1, "O": 2}
+
+# Spreads the variants of a position (player, turn) over different buckets
+_VARIANT_MIX = 0x9E3779B97F4A7C15
+
+# The deepest depth (and most empty cells) a slot can hold, a 15x15 board has at most 225 moves
+MAX_DEPTH = 255
+
+DEFAULT_MAX_BYTES = 64 << 20
+
+# Maps each meta byte to 1 if the slot is used, to count the entries of a file
+_USED_TABLE = bytes(value & USED for value in range(256))
+
+
+class SearchCache:
+    """
+    A transposition table of fixed size, in memory or in a memory-mapped file.
+
+    It works like TranspositionTable (lookup, store, clear, len, hits and
+    misses), so it can be given to any MinimaxStrategy. Keys are the
+    (canonical hash, symbol, maximizing turn) tuples of the searches.
+
+    Without a path the table is kept in memory. With a path the table is the
+    file: the operating system writes the changed pages back and keeps only
+    the pages in use in memory, and an existing file of an earlier run is
+    opened as it is. A file is locked while it is open, so two processes
+    never write to the same cache.
+
+    Example:
+    ========
+    >>> cache = SearchCache("alphabeta-4x4.cache", max_bytes=16 << 20)
+    >>> strategy = AlphaBetaStrategy(transposition_table=cache)
+    >>> # ... play ...
+    >>> cache.close()
+    """
+
+    def __init__(self, path: Union[str, None] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open or create a cache.
+
+        Parameters:
+            path (str): The cache file, created if missing, None to keep the cache in memory.
+            max_bytes (int): The most memory (or file size) the cache may take. An
+                existing file keeps the size it was created with.
+        """
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._file = None
+
+        if path is None:
+            self.buckets = self._buckets_for(max_bytes)
+            self._map = mmap.mmap(-1, HEADER.size + self.buckets * BUCKET.size)
+            HEADER.pack_into(self._map, 0, MAGIC, VERSION, WAYS, self.buckets)
+            self._count = 0
+        else:
+            self._open_file(path, max_bytes)
+
+        # Lower bits of the hash that pick the bucket
+        self._mask = self.buckets - 1
+
+    @staticmethod
+    def _buckets_for(max_bytes: int) -> int:
+        """
+        Return the most buckets (a power of two) that fit in max_bytes, at least 1.
+        """
+
+        buckets = max(1, (max_bytes - HEADER.size) // BUCKET.size)
+        return 1 << (buckets.bit_length() - 1)
+
+    def _open_file(self, path: str, max_bytes: int) -> None:
+        """
+        Open the cache file, or create it with the table size of max_bytes.
+        """
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a+b")
+
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._file.close()
+                raise BlockingIOError(f"{path} is in use by another process.") from None
+
+        self._file.seek(0, os.SEEK_END)
+        file_size = self._file.tell()
+
+        if file_size == 0:
+            # A new file: the header, then the table, zeroed by the file system
+            self.buckets = self._buckets_for(max_bytes)
+            self._file.write(HEADER.pack(MAGIC, VERSION, WAYS, self.buckets))
+            self._file.truncate(HEADER.size + self.buckets * BUCKET.size)
+            self._file.flush()
+        else:
+            self._file.seek(0)
+            data = self._file.read(HEADER.size)
+            magic, version, ways, self.buckets = HEADER.unpack(data) if len(data) == HEADER.size else (b"", 0, 0, 0)
+            if magic != MAGIC or version != VERSION or ways != WAYS \
+                    or file_size != HEADER.size + self.buckets * BUCKET.size:
+                self._file.close()
+                raise ValueError(f"{path} is not a version {VERSION} search cache file.")
+            if self.buckets != self._buckets_for(max_bytes):
+                log.info(f"{path} keeps its size of {file_size >> 20} MiB")
+
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+        # Count the entries left by the earlier runs
+        self._count = self._map[HEADER.size + SLOT.size - 1::SLOT.size].translate(_USED_TABLE).count(1)
+        if self._count:
+            log.info(f"{path}: warm start with {self._count} cached positions")
+
+    @property
+    def capacity(self) -> int:
+        """
+        The number of entries the cache can hold.
+        """
+        return self.buckets * WAYS
+
+    def _locate(self, key: tuple) -> tuple[int, int, int]:
+        """
+        Return the hash, the key bits of the meta byte and the bucket offset of a key.
+        """
+
+        position_hash, symbol, is_maximizing_turn = key
+        key_bits = USED | (O_TO_MOVE if symbol == "O" else 0) | (MAXIMIZING if is_maximizing_turn else 0)
+        bucket = (position_hash ^ (key_bits * _VARIANT_MIX)) & self._mask
+        return position_hash, key_bits, HEADER.size + bucket * BUCKET.size
+
+    def lookup(self, key: tuple) -> Union[TTEntry, None]:
+        """
+        Return the entry stored for a key, or None.
+
+        Parameters:
+            key (tuple): The position key, (canonical hash, symbol, maximizing turn).
+
+        Returns:
+            Union[TTEntry, None]: The stored entry, if any.
+        """
+
+        position_hash, key_bits, offset = self._locate(key)
+        slots = BUCKET.unpack_from(self._map, offset)
+
+        for i in range(0, FIELDS * WAYS, FIELDS):
+            meta = slots[i + 4]
+            if slots[i] == position_hash and meta & KEY_BITS == key_bits:
+                self.hits += 1
+                return TTEntry(slots[i + 1], slots[i + 2], WINNERS[meta >> 5 & 3], meta >> 3 & 3)
+
+        self.misses += 1
+        return None
+
+    def store(self, key: tuple, score: int, depth: int, winner: str, flag: int = EXACT,
+              remaining: int = 0) -> None:
+        """
+        Store the result of a search.
+
+        The entry replaces the one of the same key, unless it is a bound and
+        that one an exact score, else takes a free slot of its bucket, else
+        replaces the entry of the bucket with the fewest empty cells (the
+        smallest subtree, the least work lost).
+
+        Parameters:
+            key (tuple): The position key, (canonical hash, symbol, maximizing turn).
+            score (int): The minimax score.
+            depth (int): The depth the score was computed at.
+            winner (str): The predicted winner's symbol, or "" for a draw.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            remaining (int): The empty cells of the position, the moves left to search.
+        """
+
+        position_hash, key_bits, offset = self._locate(key)
+        slots = BUCKET.unpack_from(self._map, offset)
+
+        free = None
+        smallest = 0
+        smallest_remaining = MAX_DEPTH + 1
+        for way in range(WAYS):
+            slot_hash, _, _, slot_remaining, meta = slots[FIELDS * way:FIELDS * way + FIELDS]
+
+            if slot_hash == position_hash and meta & KEY_BITS == key_bits:
+                # The exact score is worth more than any bound of the same position
+                if flag != EXACT and meta >> 3 & 3 == EXACT:
+                    return
+                victim = way
+                break
+
+            if not meta & USED:
+                if free is None:
+                    free = way
+            elif slot_remaining < smallest_remaining:
+                smallest = way
+                smallest_remaining = slot_remaining
+        else:
+            # A new position: a free slot if there is one, else the least work is thrown away
+            if free is not None:
+                victim = free
+                self._count += 1
+            else:
+                victim = smallest
+
+        meta = key_bits | flag << 3 | WINNER_CODES[winner] << 5
+        SLOT.pack_into(self._map, offset + victim * SLOT.size, position_hash, score, min(depth, MAX_DEPTH),
+                       min(remaining, MAX_DEPTH), meta)
+
+    def clear(self) -> None:
+        """
+        Remove every entry, from the file too, e.g. to start a game cold.
+        """
+
+        # Zeroed a bucket-aligned chunk at a time, a big cache isn't copied in memory
+        chunk = bytes(BUCKET.size * 4096)
+        for start in range(HEADER.size, len(self._map), len(chunk)):
+            end = min(start + len(chunk), len(self._map))
+            self._map[start:end] = chunk[:end - start]
+
+        self._count = 0
+        self.hits = 0
+        self.misses = 0
+
+    def flush(self) -> None:
+        """
+        Write the changed pages of a cache file to the disk now.
+        """
+
+        if self._file is not None and not self._map.closed:
+            self._map.flush()
+
+    def close(self) -> None:
+        """
+        Flush and close the cache file, a memory cache frees its table.
+        """
+
+        if self._map.closed:
+            return
+        self.flush()
+        self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "SearchCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,114 @@
+# File: search_report.py
+from dataclasses import dataclass, field
+from typing import Union
+
+from src.game_board import GameBoard
+from src.player import Player
+
+
+@dataclass
+class SearchReport:
+    """
+    How much work one find_best_move call did.
+
+    Attributes:
+        strategy (str): The class name of the strategy.
+        best_move (tuple[int, int]): The move found.
+        score (float): The score of the best move (the AI is minimizing), an int
+            unless a depth-limited search scored it with an evaluation.
+        nodes (int): Positions visited below the root.
+        terminal_nodes (int): Visited positions where the game is over.
+        max_depth (int): The deepest position visited, in moves below the root.
+        tt_hits (int): Positions answered by the transposition table.
+        cutoffs (int): Alpha-beta cutoffs.
+        iterations (int): Finished iterations of iterative deepening, 0 without a time limit.
+        elapsed (float): Seconds spent in find_best_move.
+        principal_variation (list[tuple[int, int]]): The expected moves, best move first.
+
+    Example:
+    ========
+    >>> strategy = MinimaxStrategy(collect_report=True)
+    >>> strategy.find_best_move(board, ai)
+    >>> strategy.last_report.nodes_per_second
+    """
+    strategy: str = ""
+    best_move: Union[tuple[int, int], None] = None
+    score: Union[float, None] = None
+    nodes: int = 0
+    terminal_nodes: int = 0
+    max_depth: int = 0
+    tt_hits: int = 0
+    cutoffs: int = 0
+    iterations: int = 0
+    elapsed: float = 0.0
+    principal_variation: list[tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def nodes_per_second(self) -> float:
+        """
+        The positions visited per second, 0 if no time was measured.
+        """
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class SearchHook:
+    """
+    Callbacks called during a search, override the ones you need.
+
+    A strategy without hooks (and without collect_report) skips all of
+    this, so hooks cost nothing when none is attached.
+
+    Example:
+    ========
+    >>> class DepthHistogram(SearchHook):
+    >>>     def __init__(self):
+    >>>         self.counts = collections.Counter()
+    >>>
+    >>>     def on_node(self, board, depth, report):
+    >>>         self.counts[depth] += 1
+    >>>
+    >>> strategy = MinimaxStrategy()
+    >>> strategy.add_hook(DepthHistogram())
+    """
+
+    def on_search_start(self, board: GameBoard, player: Player) -> None:
+        """
+        Called when find_best_move starts.
+
+        Parameters:
+            board (GameBoard): The position searched.
+            player (Player): The player to move.
+        """
+        pass
+
+    def on_node(self, board: GameBoard, depth: int, report: SearchReport) -> None:
+        """
+        Called for every position visited below the root.
+
+        Parameters:
+            board (GameBoard): The position, don't change it.
+            depth (int): The depth of the position, 0 after the root move.
+            report (SearchReport): The report so far.
+        """
+        pass
+
+    def on_iteration(self, depth: int, best_move: tuple[int, int], scores: dict, report: SearchReport) -> None:
+        """
+        Called when an iteration of iterative deepening finishes.
+
+        Parameters:
+            depth (int): The depth limit of the iteration.
+            best_move (tuple[int, int]): The best move of the iteration.
+            scores (dict): The score of each root move searched.
+            report (SearchReport): The report so far.
+        """
+        pass
+
+    def on_search_end(self, report: SearchReport) -> None:
+        """
+        Called when find_best_move found its move.
+
+        Parameters:
+            report (SearchReport): The finished report.
+        """
+        pass
@@ -0,0 +1,225 @@
+"""
+Self-play runs AIPlayer-vs-AIPlayer games without the GUI, across a pool of
+processes, and appends every game to a game record file (see
+src/game_record.py), with the X and O strategies in its header.
+
+A 3x3 game takes at most 10 bytes, so a million games fit in about 10 MB.
+Run it with:
+
+    python selfplay.py --games 100000 --x alphabeta --o minimax --random-plies 2
+"""
+
+# File: self_play.py
+import importlib
+import multiprocessing
+import os
+import random
+import time
+from typing import Union
+
+from src.ai_player import AIPlayer
+from src.alpha_beta_strategy import AlphaBetaStrategy
+from src.bit_board import BitBoard
+from src.game_board import GameBoard
+from src.game_record import DRAW, O_WINS, X_WINS, GameRecordWriter, encode_game
+from src.logger import getLogger
+from src.mcts_strategy import MCTSStrategy
+from src.minimax_strategy import MinimaxStrategy
+from src.move_strategy import MoveStrategy
+from src.tablebase_strategy import TablebaseStrategy
+
+log = getLogger(__name__)
+
+# The strategies that can be named on the command line, any other strategy
+# is given as "package.module:ClassName"
+STRATEGIES = {
+    "minimax": MinimaxStrategy,
+    "alphabeta": AlphaBetaStrategy,
+    "tablebase": TablebaseStrategy,
+    "mcts": MCTSStrategy,
+}
+
+
+def make_strategy(spec: str) -> MoveStrategy:
+    """
+    Create a strategy from its name, or from its "package.module:ClassName" path.
+
+    Parameters:
+        spec (str): The strategy name or path.
+
+    Returns:
+        MoveStrategy: A new strategy, created without arguments.
+    """
+
+    if spec in STRATEGIES:
+        return STRATEGIES[spec]()
+
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown strategy {spec!r}, use one of {sorted(STRATEGIES)} or package.module:ClassName.")
+
+    strategy = getattr(importlib.import_module(module_name), class_name)()
+    if not isinstance(strategy, MoveStrategy):
+        raise ValueError(f"{spec} is not a MoveStrategy.")
+    return strategy
+
+
+def play_game(board: GameBoard,
+              x_player: AIPlayer,
+              o_player: AIPlayer,
+              random_plies: int = 0,
+              rng: Union[random.Random, None] = None,
+              time_limit: Union[float, None] = None) -> tuple[list[int], int]:
+    """
+    Play one game from an empty board, X moves first.
+
+    Parameters:
+        board (GameBoard): The board to play on, it is reset first.
+        x_player (AIPlayer): The player with the X symbol.
+        o_player (AIPlayer): The player with the O symbol.
+        random_plies (int): The number of opening moves played at random.
+        rng (random.Random): The random opening moves generator.
+        time_limit (float): The time budget of each move in seconds, None for no limit.
+
+    Returns:
+        tuple[list[int], int]: The cells of the moves, and the result (DRAW, X_WINS or O_WINS).
+    """
+
+    rng = rng if rng is not None else random.Random()
+    board.reset()
+    moves = []
+    current, other = x_player, o_player
+
+    while True:
+        if len(moves) < random_plies:
+            row, col = rng.choice(board.get_empty_cells())
+        else:
+            row, col = current.find_best_move(board, time_limit)
+
+        board.make_move(row, col, current.symbol)
+        moves.append(row * board.size + col)
+
+        if board.is_winner(current.symbol):
+            return moves, X_WINS if current.symbol == "X" else O_WINS
+
+        if board.is_full():
+            return moves, DRAW
+
+        current, other = other, current
+
+
+# --------------------------------------------------------------
+# Process pool
+# --------------------------------------------------------------
+# The board and players of a worker process, created once per process so
+# the strategies keep their transposition tables from game to game
+_worker = {}
+
+
+def _init_worker(config: dict) -> None:
+    """
+    Create the board and players of a worker process.
+
+    Parameters:
+        config (dict): The keyword arguments of run_self_play.
+    """
+
+    _worker["config"] = config
+    _worker["board"] = BitBoard(config["size"], config["win_length"])
+    _worker["x_player"] = AIPlayer("X", make_strategy(config["x_strategy"]))
+    _worker["o_player"] = AIPlayer("O", make_strategy(config["o_strategy"]))
+
+
+def _play_chunk(chunk: tuple[int, int]) -> tuple[bytes, list[int]]:
+    """
+    Play the games first, first + 1, ..., first + count - 1 in a worker process.
+
+    Each game has its own random generator, seeded by the game number, so a
+    game is the same whichever process plays it.
+
+    Parameters:
+        chunk (tuple[int, int]): (first, count) of the games to play.
+
+    Returns:
+        tuple[bytes, list[int]]: The encoded games, and the number of draws, X wins and O wins.
+    """
+
+    first, count = chunk
+    config = _worker["config"]
+    data = bytearray()
+    results = [0, 0, 0]
+
+    for game in range(first, first + count):
+        rng = random.Random(f"{config['seed']}-{game}")
+        moves, result = play_game(_worker["board"], _worker["x_player"], _worker["o_player"],
+                                  config["random_plies"], rng, config["time_limit"])
+        data += encode_game(moves, result)
+        results[result] += 1
+
+    return bytes(data), results
+
+
+def run_self_play(path: str,
+                  games: int,
+                  x_strategy: str = "alphabeta",
+                  o_strategy: str = "alphabeta",
+                  size: int = 3,
+                  win_length: Union[int, None] = None,
+                  random_plies: int = 0,
+                  time_limit: Union[float, None] = None,
+                  workers: Union[int, None] = None,
+                  seed: int = 0,
+                  chunk_size: int = 1000) -> list[int]:
+    """
+    Play games across a pool of processes, and append them to a game record file as they finish.
+
+    Games are written in the order the chunks finish, not in game order.
+
+    Parameters:
+        path (str): The game record file.
+        games (int): The number of games.
+        x_strategy (str): The strategy of the X player (see make_strategy).
+        o_strategy (str): The strategy of the O player.
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win, the board size if None.
+        random_plies (int): The number of opening moves played at random.
+        time_limit (float): The time budget of each move in seconds, None for no limit.
+        workers (int): The number of processes, the number of CPUs if None, 1 to play in this process.
+        seed (int): The seed of the random openings.
+        chunk_size (int): The number of games a worker plays per task.
+
+    Returns:
+        list[int]: The number of draws, X wins and O wins.
+    """
+
+    win_length = win_length if win_length is not None else size
+    workers = workers if workers is not None else os.cpu_count()
+    config = dict(x_strategy=x_strategy, o_strategy=o_strategy, size=size, win_length=win_length,
+                  random_plies=random_plies, time_limit=time_limit, seed=seed)
+
+    chunks = [(first, min(chunk_size, games - first)) for first in range(0, games, chunk_size)]
+    results = [0, 0, 0]
+    start = time.perf_counter()
+
+    with GameRecordWriter(path, size, win_length, x_strategy, o_strategy) as writer:
+        if workers == 1:
+            _init_worker(config)
+            finished = map(_play_chunk, chunks)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(config,))
+            finished = pool.imap_unordered(_play_chunk, chunks)
+
+        try:
+            for data, chunk_results in finished:
+                writer.write_encoded(data, sum(chunk_results))
+                results = [total + count for total, count in zip(results, chunk_results)]
+                log.debug(f"{sum(results)}/{games} games played")
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    elapsed = time.perf_counter() - start
+    log.info(f"{games} games in {elapsed:.1f}s ({games / max(elapsed, 1e-9):.0f} games/s): "
+             f"{results[X_WINS]} X wins, {results[O_WINS]} O wins, {results[DRAW]} draws")
+    return results
@@ -0,0 +1,238 @@
+"""
+A tablebase stores the perfect-play result of every position of a game,
+so the AI can answer with a table lookup instead of a search.
+
+Positions are written from the point of view of the player to move:
+every cell is a base-3 digit, 0 for empty, 1 for the player to move and
+2 for the other player, and cell (row, col) is digit (row * size + col):
+
+    index = sum(digit(cell) * 3 ** cell)
+
+So the same table answers for X and O, whoever moved first.
+
+File layout (little-endian):
+
+    header:  magic "TTTB", version, size, win_length, record size, record count, reserved
+    records: one per index, record size bytes each
+             value     int8    1 win, 0 draw, -1 loss for the player to move,
+                               -128 for positions that can't be reached
+             distance  uint8   moves until the game ends with perfect play
+             moves     uint16  bit (row * size + col) is set for every best move
+                               (only in 4-byte records)
+
+Build the 3x3 table with:
+
+    python -m src.tablebase
+"""
+
+# File: tablebase.py
+import argparse
+import mmap
+import os
+import struct
+from typing import Union
+
+from src.__config__ import TABLEBASE_FILE
+from src.game_board import GameBoard, winning_lines
+from src.logger import configure_logging, getLogger
+
+log = getLogger(__name__)
+
+# --------------------------------------------------------------
+# File format
+# --------------------------------------------------------------
+MAGIC = b"TTTB"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBII")
+
+# Records with and without the best moves
+MOVES_RECORD = struct.Struct("<bBH")
+VALUE_RECORD = struct.Struct("<bB")
+
+# Values of the records
+WIN = 1
+DRAW = 0
+LOSS = -1
+UNREACHABLE = -128
+
+
+def position_index(board: GameBoard, symbol: str) -> int:
+    """
+    Return the tablebase index of a position.
+
+    Parameters:
+        board (GameBoard): The game board instance.
+        symbol (str): The symbol of the player to move.
+
+    Returns:
+        int: The base-3 index of the position, seen by the player to move.
+    """
+
+    symbol = symbol.upper()
+    index = 0
+    power = 1
+
+    for row in board.game_board:
+        for cell in row:
+            if cell:
+                index += power if cell == symbol else 2 * power
+            power *= 3
+
+    return index
+
+
+def solve(size: int = 3, win_length: Union[int, None] = None) -> list[tuple[int, int, int]]:
+    """
+    Solve every reachable position of a board with a memoized negamax search.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win, the board size if None.
+
+    Returns:
+        list[tuple[int, int, int]]: (value, distance, moves mask) for every index.
+    """
+
+    win_length = win_length if win_length is not None else size
+    cells = size * size
+    powers = [3 ** cell for cell in range(cells)]
+
+    # The lines as lists of cell numbers
+    lines = [[row * size + col for row, col in line] for line in winning_lines(size, win_length)]
+
+    records = [(UNREACHABLE, 0, 0)] * (3 ** cells)
+
+    def negamax(digits: list[int], index: int) -> tuple[int, int]:
+        # Already solved, transpositions are common
+        if records[index][0] != UNREACHABLE:
+            return records[index][0], records[index][1]
+
+        # The other player just moved, so only they can have a line
+        if any(all(digits[cell] == 2 for cell in line) for line in lines):
+            records[index] = (LOSS, 0, 0)
+            return LOSS, 0
+
+        empty = [cell for cell in range(cells) if digits[cell] == 0]
+        if not empty:
+            records[index] = (DRAW, 0, 0)
+            return DRAW, 0
+
+        # The child seen by the other player: the pieces swap sides
+        flipped = [(3 - digit) % 3 for digit in digits]
+        flipped_index = sum(digit * power for digit, power in zip(flipped, powers))
+
+        results = {}
+        for cell in empty:
+            flipped[cell] = 2
+            child_value, child_distance = negamax(flipped, flipped_index + 2 * powers[cell])
+            flipped[cell] = 0
+            results[cell] = (-child_value, child_distance + 1)
+
+        # Win as fast as possible, lose as slowly as possible
+        def rank(result: tuple[int, int]) -> tuple[int, int]:
+            value, distance = result
+            return value, -distance if value >= DRAW else distance
+
+        best = max(results.values(), key=rank)
+        moves = sum(1 << cell for cell, result in results.items() if result == best)
+
+        records[index] = (best[0], best[1], moves)
+        return best
+
+    negamax([0] * cells, 0)
+    return records
+
+
+def write_tablebase(path: str, records: list[tuple[int, int, int]], size: int, win_length: int,
+                    with_moves: bool = True) -> None:
+    """
+    Write solved records to a tablebase file.
+
+    Parameters:
+        path (str): The output file.
+        records (list[tuple[int, int, int]]): (value, distance, moves mask) for every index.
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win.
+        with_moves (bool): Store the best moves of each position (4-byte records).
+    """
+
+    record = MOVES_RECORD if with_moves else VALUE_RECORD
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, size, win_length, record.size, len(records), 0))
+        for value, distance, moves in records:
+            file.write(record.pack(value, distance, moves) if with_moves else record.pack(value, distance))
+
+
+class Tablebase:
+    """
+    A memory-mapped tablebase file: lookups read the record straight from
+    the file, nothing is loaded up front.
+
+    Example:
+    ========
+    >>> from src.tablebase import Tablebase, position_index
+    >>> table = Tablebase()
+    >>> value, distance, moves = table.probe(position_index(board, "O"))
+    """
+
+    def __init__(self, path: str = TABLEBASE_FILE):
+        """
+        Open and map a tablebase file.
+
+        Parameters:
+            path (str): The tablebase file.
+        """
+
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.size, self.win_length, self.record_size, self.count, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} tablebase.")
+
+        self.has_moves = self.record_size == MOVES_RECORD.size
+
+    def probe(self, index: int) -> tuple[int, int, int]:
+        """
+        Read the record of a position.
+
+        Parameters:
+            index (int): The position index (see position_index).
+
+        Returns:
+            tuple[int, int, int]: (value, distance, moves mask), the mask is 0 if the file has no moves.
+        """
+
+        offset = HEADER.size + index * self.record_size
+
+        if self.has_moves:
+            return MOVES_RECORD.unpack_from(self._map, offset)
+
+        value, distance = VALUE_RECORD.unpack_from(self._map, offset)
+        return value, distance, 0
+
+    def close(self) -> None:
+        """
+        Unmap the file.
+        """
+        self._map.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve every position and write a tablebase.")
+    parser.add_argument("output", nargs="?", default=TABLEBASE_FILE, help="the tablebase file to write")
+    parser.add_argument("--size", type=int, default=3, help="rows (and columns) of the board")
+    parser.add_argument("--win-length", type=int, default=None, help="symbols in a row needed to win (default: size)")
+    args = parser.parse_args()
+
+    configure_logging(log_to_file=False)
+
+    board_win_length = args.win_length if args.win_length is not None else args.size
+    solved = solve(args.size, board_win_length)
+    write_tablebase(args.output, solved, args.size, board_win_length)
+
+    reachable = sum(1 for value, _, _ in solved if value != UNREACHABLE)
+    log.info(f"Wrote {reachable} positions ({len(solved)} records) to {args.output}")
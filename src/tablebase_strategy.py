@@ -0,0 +1,106 @@
+# File: tablebase_strategy.py
+from typing import Union
+
+from src.__config__ import TABLEBASE_FILE
+from src.game_board import GameBoard
+from src.move_strategy import MoveStrategy
+from src.player import Player
+from src.tablebase import DRAW, Tablebase, UNREACHABLE, position_index
+
+
+class TablebaseStrategy(MoveStrategy):
+    """
+    Plays perfectly by looking every move up in a precomputed tablebase,
+    no search is done at all.
+
+    The AI wins as fast as it can, draws when it can't win, and loses as
+    slowly as it can.
+
+    Tablebases without best moves (2-byte records, e.g. from src.retrograde)
+    are read too: the positions after each move are looked up instead.
+
+    Example:
+    ========
+    >>> from src.tablebase_strategy import TablebaseStrategy
+    >>> ai = AIPlayer("O", TablebaseStrategy())
+    >>> # 4x4, built with: python -m src.retrograde data/tictactoe_4x4.tb --size 4
+    >>> ai = AIPlayer("O", TablebaseStrategy("data/tictactoe_4x4.tb"))
+    """
+
+    def __init__(self, path: str = TABLEBASE_FILE):
+        """
+        Open the tablebase.
+
+        Parameters:
+            path (str): The tablebase file, build it with `python -m src.tablebase`.
+        """
+        self.tablebase = Tablebase(path)
+
+    def find_best_move(self,
+                       board: GameBoard,
+                       player: Player,
+                       time_limit: Union[float, None] = None) -> tuple[int, int]:
+        """
+        Look the best move up in the tablebase.
+
+        Parameters:
+            board (GameBoard): The game board instance.
+            player (Player): The AI player instance.
+            time_limit (float): Ignored, a lookup always answers at once.
+
+        Returns:
+            tuple[int, int]: (row, col) of the best move, None if the game is over.
+        """
+
+        if (board.size, board.win_length) != (self.tablebase.size, self.tablebase.win_length):
+            raise ValueError(f"The tablebase is for {self.tablebase.size}x{self.tablebase.size} "
+                             f"with {self.tablebase.win_length} in a row.")
+
+        index = position_index(board, player.symbol)
+        value, distance, moves = self.tablebase.probe(index)
+        if value == UNREACHABLE:
+            raise ValueError(f"This position can't be reached in a game:{board}")
+
+        if not self.tablebase.has_moves:
+            moves = self._best_moves_from_children(board, index)
+
+        # No best move means the game is already over
+        if moves == 0:
+            return None
+
+        # Plays the first best move, the lowest set bit
+        return divmod((moves & -moves).bit_length() - 1, board.size)
+
+    def _best_moves_from_children(self, board: GameBoard, index: int) -> int:
+        """
+        Find the best moves by looking up the position after each move.
+
+        After a move the other player is to move, so the pieces swap sides in
+        the index, and the new piece is theirs (digit 2).
+
+        Parameters:
+            board (GameBoard): The game board instance.
+            index (int): The index of the position.
+
+        Returns:
+            int: Bit (row * size + col) set for every best move, 0 if the game is over.
+        """
+
+        if board.is_winner("X") or board.is_winner("O") or board.is_full():
+            return 0
+
+        # Turns the 1 digits into 2 and the 2 digits into 1
+        occupied = sum(3 ** (row * board.size + col) for row, col in board.move_stack)
+        swapped = 3 * occupied - index
+
+        ranks = {}
+        for row, col in board.iter_empty_cells():
+            cell = row * board.size + col
+            child_value, child_distance, _ = self.tablebase.probe(swapped + 2 * 3 ** cell)
+            value, distance = -child_value, child_distance + 1
+
+            # Win as fast as possible, lose as slowly as possible
+            ranks[cell] = (value, -distance if value >= DRAW else distance)
+
+        best = max(ranks.values())
+        return sum(1 << cell for cell, rank in ranks.items() if rank == best)
@@ -0,0 +1,206 @@
+"""
+Tactics find the forcing moves of a position straight from the line tables,
+without searching:
+
+    wins         cells that complete a line of the player at once
+    blocks       cells that complete a line of the other player: if there
+                 is just one, every other move loses on the next turn
+    forks        cells that give the player two winning cells at once (a
+                 double threat), only one of which can be blocked
+    fork_blocks  the forks of the other player, the cells to take first
+
+Each line is a bitmask of its cells (cell row * size + col is bit
+row * size + col, like BitBoard), so a line is looked at with a few integer
+operations: a line holds no symbol of the other player when
+`line & other_mask == 0`, and the cells it still needs are `line & ~own_mask`.
+
+Example:
+========
+>>> board = BitBoard(15, 5)
+>>> tactics = find_tactics(board, "O")
+>>> if tactics.wins:
+>>>     return tactics.wins[0]
+"""
+
+# File: tactics.py
+from functools import lru_cache
+from typing import NamedTuple
+
+from src.game_board import GameBoard, cell_coordinates, winning_lines
+
+
+class Tactics(NamedTuple):
+    """
+    The forcing moves of a position for the player to move, each list in row-major order.
+
+    Attributes:
+        wins (list[tuple[int, int]]): The moves that win at once.
+        blocks (list[tuple[int, int]]): The cells where the other player would win at once.
+        forks (list[tuple[int, int]]): The moves that make two winning cells at once.
+        fork_blocks (list[tuple[int, int]]): The cells where the other player would make a fork.
+    """
+    wins: list
+    blocks: list
+    forks: list
+    fork_blocks: list
+
+
+@lru_cache(maxsize=None)
+def line_masks(size: int, win_length: int) -> tuple[int, ...]:
+    """
+    Return the bitmask of every winning line of a board.
+
+    Parameters:
+        size (int): The number of rows (and columns) of the board.
+        win_length (int): The number of symbols in a row needed to win.
+
+    Returns:
+        tuple[int, ...]: The masks, in the order of winning_lines().
+    """
+    return tuple(sum(1 << (row * size + col) for row, col in line) for line in winning_lines(size, win_length))
+
+
+def symbol_mask(board: GameBoard, symbol: str) -> int:
+    """
+    Return the bits of the cells holding a symbol.
+
+    Parameters:
+        board (GameBoard): The game board instance, a BitBoard has the masks already.
+        symbol (str): "X" or "O".
+
+    Returns:
+        int: Bit row * size + col is set for each cell of the symbol.
+    """
+
+    masks = getattr(board, "masks", None)
+    if masks is not None:
+        return masks[symbol]
+
+    cells = board.game_board
+    return sum(1 << index for index, (row, col) in enumerate(board.cells) if cells[row][col] == symbol)
+
+
+def mask_cells(mask: int, size: int) -> list[tuple[int, int]]:
+    """
+    Return the (row, col) of the bits of a mask, in row-major order.
+
+    Parameters:
+        mask (int): Bit row * size + col is set for each cell.
+        size (int): The number of rows (and columns) of the board.
+
+    Returns:
+        list[tuple[int, int]]: The cells of the set bits.
+    """
+
+    coordinates = cell_coordinates(size)
+    cells = []
+    while mask:
+        low_bit = mask & -mask
+        cells.append(coordinates[low_bit.bit_length() - 1])
+        mask ^= low_bit
+    return cells
+
+
+def winning_mask(lines: tuple[int, ...], own: int, other: int) -> int:
+    """
+    Return the cells that complete a line of a player at once, without looking for forks.
+
+    Parameters:
+        lines (tuple[int, ...]): The line masks of the board.
+        own (int): The cells of the player.
+        other (int): The cells of the other player.
+
+    Returns:
+        int: The bits of the winning cells.
+    """
+
+    wins = 0
+    for line in lines:
+        if not line & other:
+            # One cell left, none left is a line already won and adds no bit
+            missing = line & ~own
+            if not missing & (missing - 1):
+                wins |= missing
+    return wins
+
+
+def _wins_and_forks(lines: tuple[int, ...], own: int, other: int) -> tuple[int, int]:
+    """
+    Return the masks of the winning cells and of the fork cells of a player.
+
+    Parameters:
+        lines (tuple[int, ...]): The line masks of the board.
+        own (int): The cells of the player.
+        other (int): The cells of the other player.
+
+    Returns:
+        tuple[int, int]: The cells that win at once, and the cells that make two winning cells.
+    """
+
+    wins = 0
+    # The winning cells each move would make, by the bit of the move
+    threats = {}
+
+    for line in lines:
+        if line & other:
+            continue
+
+        # The cells of the line still empty, the line is open so none is the other player's
+        missing = line & ~own
+        rest = missing & (missing - 1)
+        if not rest:
+            # One cell left (none left is a line already won, which the search never sees)
+            wins |= missing
+        elif not rest & (rest - 1):
+            # Two cells left: playing either one makes the other a winning cell
+            first = missing ^ rest
+            threats[first] = threats.get(first, 0) | rest
+            threats[rest] = threats.get(rest, 0) | first
+
+    # A fork is a move after which two different cells win
+    forks = 0
+    for move, made in threats.items():
+        if made & (made - 1):
+            forks |= move
+
+    return wins, forks
+
+
+def find_tactics(board: GameBoard, symbol: str) -> Tactics:
+    """
+    Find the forcing moves of the player to move.
+
+    Parameters:
+        board (GameBoard): The game board instance, it is not changed.
+        symbol (str): The symbol of the player to move.
+
+    Returns:
+        Tactics: The wins, blocks, forks and fork blocks, each in row-major order.
+    """
+
+    lines = line_masks(board.size, board.win_length)
+    own = symbol_mask(board, symbol)
+    other = symbol_mask(board, "O" if symbol == "X" else "X")
+
+    wins, forks = _wins_and_forks(lines, own, other)
+    blocks, fork_blocks = _wins_and_forks(lines, other, own)
+
+    return Tactics(mask_cells(wins, board.size), mask_cells(blocks, board.size),
+                   mask_cells(forks, board.size), mask_cells(fork_blocks, board.size))
+
+
+def winning_cells(board: GameBoard, symbol: str) -> list[tuple[int, int]]:
+    """
+    Return the cells where a player wins at once.
+
+    Parameters:
+        board (GameBoard): The game board instance.
+        symbol (str): "X" or "O".
+
+    Returns:
+        list[tuple[int, int]]: The winning cells, in row-major order.
+    """
+
+    lines = line_masks(board.size, board.win_length)
+    other = symbol_mask(board, "O" if symbol == "X" else "X")
+    return mask_cells(winning_mask(lines, symbol_mask(board, symbol), other), board.size)
@@ -0,0 +1,122 @@
+# File: transposition_table.py
+from typing import NamedTuple, Union
+
+from src.game_board import GameBoard, symmetries
+
+# --------------------------------------------------------------
+# What a stored score means. Plain minimax only stores exact scores,
+# alpha-beta also stores bounds found when a search was cut off.
+# --------------------------------------------------------------
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+def canonical_key(board: GameBoard) -> str:
+    """
+    Return the canonical key of a position: the smallest of its 8 symmetric variants.
+
+    Every cell is written as "X", "O" or "." in row-major order, so all
+    the rotations and reflections of a position share one key. This is the
+    readable form, the searches use GameBoard.canonical_hash(), which is
+    kept up to date by every move instead of being rebuilt.
+
+    Parameters:
+        board (GameBoard): The game board instance.
+
+    Returns:
+        str: The canonical key, e.g. "X...O...." for a 3x3 board.
+    """
+
+    cells = "".join(cell or "." for row in board.game_board for cell in row)
+
+    return min("".join(cells[i] for i in symmetry) for symmetry in symmetries(len(board.game_board)))
+
+
+class TTEntry(NamedTuple):
+    """
+    A stored search result.
+
+    Attributes:
+        score (int): The minimax score of the position.
+        depth (int): The depth (moves from the search root) the score was computed at.
+        winner (str): The symbol of the player the score predicts will win, or "" for a draw.
+        flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+    """
+    score: int
+    depth: int
+    winner: str
+    flag: int = EXACT
+
+
+class TranspositionTable:
+    """
+    Caches minimax results by canonical position, so each position (and all
+    its rotations and reflections) is searched only once.
+
+    The table can be kept by one MinimaxStrategy across calls and games, or
+    handed to several strategies to share their results.
+
+    Example:
+    ========
+    >>> from src.transposition_table import TranspositionTable
+    >>> from src.minimax_strategy import MinimaxStrategy
+    >>> table = TranspositionTable()
+    >>> strategy = MinimaxStrategy(transposition_table=table)
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty table.
+        """
+        self.entries: dict[tuple, TTEntry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: tuple) -> Union[TTEntry, None]:
+        """
+        Return the entry stored for a key, or None.
+
+        Parameters:
+            key (tuple): The position key.
+
+        Returns:
+            Union[TTEntry, None]: The stored entry, if any.
+        """
+
+        entry = self.entries.get(key)
+
+        # Count the hits and misses, so we can see how well the table is working
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return entry
+
+    def store(self, key: tuple, score: int, depth: int, winner: str, flag: int = EXACT,
+              remaining: int = 0) -> None:
+        """
+        Store the result of a search.
+
+        Parameters:
+            key (tuple): The position key.
+            score (int): The minimax score.
+            depth (int): The depth the score was computed at.
+            winner (str): The predicted winner's symbol, or "" for a draw.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            remaining (int): The empty cells of the position, unused here (every
+                entry is kept), bounded tables replace the smallest subtrees first.
+        """
+        self.entries[key] = TTEntry(score, depth, winner, flag)
+
+    def clear(self) -> None:
+        """
+        Remove every entry, e.g. to start a game cold.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,123 @@
+"""
+Property tests of make_move / unmake_move: random games are played and
+taken back on GameBoard and BitBoard, and after every unmake the board
+must be exactly as it was before the move (hashes, masks, wins, counters
+and the attached line evaluation).
+"""
+
+# File: test_board.py
+import copy
+import random
+
+import pytest
+
+from src.bit_board import BitBoard
+from src.evaluation import LineEvaluation
+from src.game_board import GameBoard
+
+BOARD_CLASSES = (GameBoard, BitBoard)
+VARIANTS = ((3, 3), (4, 3), (4, 4), (5, 4), (6, 4))
+
+
+def snapshot(board: GameBoard) -> dict:
+    """
+    Copy every piece of state a move changes.
+    """
+
+    state = {
+        "cells": [board.game_board[row][col] for row in range(board.size) for col in range(board.size)],
+        "hashes": list(board.hashes),
+        "zobrist_hash": board.zobrist_hash,
+        "canonical_hash": board.canonical_hash(),
+        "empty_mask": board.empty_mask,
+        "move_count": board.move_count,
+        "move_stack": list(board.move_stack),
+        "wins": dict(board._wins),
+        "winners": (board.is_winner("X"), board.is_winner("O")),
+        "full": board.is_full(),
+        "evaluation": copy.deepcopy((board.evaluation.counts, board.evaluation.open_lines)),
+    }
+    if isinstance(board, BitBoard):
+        state["masks"] = dict(board.masks)
+    return state
+
+
+def new_board(board_class: type, size: int, win_length: int) -> GameBoard:
+    """
+    Create a board with a line evaluation attached.
+    """
+
+    board = board_class(size, win_length)
+    board.attach_evaluation(LineEvaluation(board))
+    return board
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+@pytest.mark.parametrize("size, win_length", VARIANTS)
+def test_unmake_restores_every_state(board_class, size, win_length):
+    rng = random.Random(size * 100 + win_length)
+    board = new_board(board_class, size, win_length)
+
+    for _ in range(30):
+        cells = [(row, col) for row in range(size) for col in range(size)]
+        rng.shuffle(cells)
+
+        # Plays until someone wins or the board is full, remembering the state before each move
+        states = []
+        for ply, (row, col) in enumerate(cells):
+            symbol = "X" if ply % 2 == 0 else "O"
+            states.append(snapshot(board))
+            assert board.make_move(row, col, symbol) == (True, "")
+            assert board.move_count == ply + 1
+            if board.is_winner(symbol):
+                break
+
+        while states:
+            board.unmake_move()
+            assert snapshot(board) == states.pop()
+
+        assert board.zobrist_hash == 0
+
+
+@pytest.mark.parametrize("size, win_length", VARIANTS)
+def test_boards_agree(size, win_length):
+    rng = random.Random(size + win_length)
+    boards = [new_board(board_class, size, win_length) for board_class in BOARD_CLASSES]
+
+    cells = [(row, col) for row in range(size) for col in range(size)]
+    rng.shuffle(cells)
+    for ply, (row, col) in enumerate(cells):
+        symbol = "X" if ply % 2 == 0 else "O"
+        for board in boards:
+            board.make_move(row, col, symbol)
+
+        game_board, bit_board = (snapshot(board) for board in boards)
+        del bit_board["masks"]
+        assert game_board == bit_board
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_make_move_rejects_cells_off_the_board(board_class):
+    board = new_board(board_class, 4, 3)
+    before = snapshot(board)
+
+    for row, col in ((4, 0), (0, 4), (-1, 0), (0, -1)):
+        assert board.make_move(row, col, "X") == (False, "This cell is not on the board.")
+        assert snapshot(board) == before
+
+    assert board.make_move(1, 1, "X") == (True, "")
+    assert board.make_move(1, 1, "O") == (False, "This cell is not empty.")
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_make_move_rejects_other_symbols(board_class):
+    board = new_board(board_class, 3, 3)
+    before = snapshot(board)
+
+    for symbol in ("Z", "", "XO"):
+        assert board.make_move(1, 1, symbol) == (False, "The symbol must be X or O.")
+        assert snapshot(board) == before
+
+    # Lowercase symbols are played as uppercase ones
+    assert board.make_move(1, 1, "o") == (True, "")
+    assert board.game_board[1][1] == "O"
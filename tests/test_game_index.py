@@ -0,0 +1,111 @@
+"""
+Tests of the game index file (TTTI): every position and opening lookup
+must find exactly the games a replay of the record files finds, whether
+the index was built from one sorted run or merged from many.
+"""
+
+# File: test_game_index.py
+import random
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from src.bit_board import BitBoard
+from src.game_index import GameIndex, build_index
+from src.game_record import UNFINISHED, GameRecord, GameRecordWriter, board_result
+
+
+def play_random_games(path: str, count: int, size: int, win_length: int, seed: int) -> list[GameRecord]:
+    """
+    Write random games to a record file, some stopped before their end.
+    """
+
+    rng = random.Random(seed)
+    games = []
+    with GameRecordWriter(path, size, win_length) as writer:
+        for _ in range(count):
+            board = BitBoard(size, win_length)
+            cells = rng.sample(range(size * size), size * size)
+            moves = []
+            result = None
+            for ply, cell in enumerate(cells):
+                if rng.random() < 0.05:
+                    result = UNFINISHED
+                    break
+                board.make_move(cell // size, cell % size, "X" if ply % 2 == 0 else "O")
+                moves.append(cell)
+                result = board_result(board)
+                if result is not None:
+                    break
+            writer.write_game(moves, result)
+            games.append(GameRecord(bytes(moves), result))
+    return games
+
+
+def replay(games: list[GameRecord], size: int, win_length: int) -> dict[int, set[int]]:
+    """
+    Map the canonical hash of every position to the games that reached it.
+    """
+
+    positions = defaultdict(set)
+    for game_id, (moves, _) in enumerate(games):
+        board = BitBoard(size, win_length)
+        positions[board.canonical_hash()].add(game_id)
+        for ply, cell in enumerate(moves):
+            board.make_move(cell // size, cell % size, "X" if ply % 2 == 0 else "O")
+            positions[board.canonical_hash()].add(game_id)
+    return positions
+
+
+@pytest.mark.parametrize("size, win_length", ((3, 3), (4, 3)))
+@pytest.mark.parametrize("chunk_moves", (1 << 22, 97))
+def test_lookups_match_a_replay(tmp_path, size, win_length, chunk_moves):
+    paths = [str(tmp_path / "first.rec"), str(tmp_path / "second.rec")]
+    games = play_random_games(paths[0], 300, size, win_length, seed=1)
+    games += play_random_games(paths[1], 200, size, win_length, seed=2)
+
+    index_path = str(tmp_path / "games.idx")
+    assert build_index(paths, index_path, chunk_moves=chunk_moves, merge_memory=4096) == len(games)
+    # Only the index is left behind
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ["first.rec", "games.idx", "second.rec"]
+
+    positions = replay(games, size, win_length)
+    with GameIndex(index_path) as index:
+        assert len(index) == len(positions)
+
+        for key, game_ids in positions.items():
+            stats = index.lookup(key)
+            assert stats.games.tolist() == sorted(game_ids)
+            results = np.bincount([games[game_id].result for game_id in game_ids], minlength=4)
+            assert (stats.draws, stats.x_wins, stats.o_wins, stats.unfinished) == tuple(results)
+
+        for game_id in range(0, len(games), 37):
+            assert index.game(game_id) == games[game_id]
+
+        # Every opening of a few games, and one no game played
+        for moves, _ in games[:20]:
+            for length in range(len(moves) + 1):
+                opening = [divmod(cell, size) for cell in moves[:length]]
+                expected = [game_id for game_id, game in enumerate(games) if game.moves[:length] == moves[:length]]
+                assert index.opening(opening).games.tolist() == expected
+        assert index.lookup(12345).total == 0
+
+
+def test_empty_archive(tmp_path):
+    record_path = str(tmp_path / "empty.rec")
+    GameRecordWriter(record_path, 3, 3).close()
+
+    index_path = str(tmp_path / "empty.idx")
+    assert build_index(record_path, index_path) == 0
+    with GameIndex(index_path) as index:
+        assert len(index) == 0
+        assert index.lookup([(1, 1)]).total == 0
+        assert index.opening([]).total == 0
+
+
+def test_rejects_records_of_different_boards(tmp_path):
+    GameRecordWriter(str(tmp_path / "3x3.rec"), 3, 3).close()
+    GameRecordWriter(str(tmp_path / "4x4.rec"), 4, 3).close()
+    with pytest.raises(ValueError):
+        build_index([str(tmp_path / "3x3.rec"), str(tmp_path / "4x4.rec")], str(tmp_path / "games.idx"))
@@ -0,0 +1,79 @@
+"""
+Tests of the game record file (TTTR): games written a move at a time or
+whole must be read back as they were played, across read chunks, and a
+game cut off by a stopped writer must end as UNFINISHED.
+"""
+
+# File: test_game_record.py
+import random
+
+import pytest
+
+from src.game_record import (DRAW, O_WINS, UNFINISHED, X_WINS, GameRecord, GameRecordWriter, read_record_header,
+                             read_records)
+
+
+def random_games(count: int, cells: int, seed: int) -> list[GameRecord]:
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        moves = rng.sample(range(cells), rng.randint(0, cells))
+        games.append(GameRecord(bytes(moves), rng.choice((DRAW, X_WINS, O_WINS, UNFINISHED))))
+    return games
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "games.rec")
+    games = random_games(500, 16, seed=1)
+
+    with GameRecordWriter(path, 4, 3, "human", "AlphaBetaStrategy") as writer:
+        for moves, result in games[:250]:
+            writer.write_game(list(moves), result)
+        for moves, result in games[250:]:
+            for cell in moves:
+                writer.write_move(cell // 4, cell % 4)
+            writer.end_game(result)
+
+    assert read_record_header(path) == (4, 3, "human", "AlphaBetaStrategy")
+    # Small chunks, so games are split between them
+    assert list(read_records(path, chunk_size=7)) == games
+    assert list(read_records(path)) == games
+
+
+def test_appends_to_an_existing_file(tmp_path):
+    path = str(tmp_path / "games.rec")
+    games = random_games(20, 9, seed=2)
+
+    for start in range(0, len(games), 5):
+        with GameRecordWriter(path, 3, 3) as writer:
+            for moves, result in games[start:start + 5]:
+                writer.write_game(moves, result)
+
+    assert list(read_records(path)) == games
+
+
+def test_cut_off_game_is_ended_before_appending(tmp_path):
+    path = str(tmp_path / "games.rec")
+
+    writer = GameRecordWriter(path, 3, 3)
+    writer.write_game([4, 0, 8], DRAW)
+    writer.write_move(1, 1)
+    writer.write_move(0, 0)
+    # The writer stops without ending its game, e.g. the process is killed
+    writer.file.flush()
+    assert list(read_records(path))[-1] == GameRecord(bytes((4, 0)), UNFINISHED)
+    writer.file.close()
+
+    with GameRecordWriter(path, 3, 3) as writer:
+        writer.write_game([2, 6], X_WINS)
+
+    assert list(read_records(path)) == [GameRecord(bytes((4, 0, 8)), DRAW),
+                                        GameRecord(bytes((4, 0)), UNFINISHED),
+                                        GameRecord(bytes((2, 6)), X_WINS)]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "games.rec"
+    path.write_bytes(b"TTTB" + bytes(8))
+    with pytest.raises(ValueError):
+        list(read_records(str(path)))
@@ -0,0 +1,46 @@
+"""
+Tests of the MCTS tree bound: however many playouts and moves, the tree
+kept between moves never holds more than max_nodes positions, and it can
+be dropped.
+"""
+
+# File: test_mcts_strategy.py
+from src.bit_board import BitBoard
+from src.mcts_strategy import MCTSStrategy, _Node
+from src.player import Player
+
+
+def count_nodes(node: _Node) -> int:
+    return 1 + sum(count_nodes(child) for child in node.children.values())
+
+
+def test_tree_stays_within_max_nodes():
+    board = BitBoard(7, 4)
+    board.make_move(3, 3, "X")
+    strategy = MCTSStrategy(playouts=2000, seed=1, max_nodes=300)
+
+    for _ in range(3):
+        row, col = strategy.find_best_move(board, Player("O"))
+        assert strategy._root.size == count_nodes(strategy._root) <= 300
+
+        # The human answers, the next search starts from that subtree
+        board.make_move(row, col, "O")
+        board.make_move(*board.get_empty_cells()[0], "X")
+
+
+def test_full_tree_still_plays_playouts():
+    strategy = MCTSStrategy(playouts=500, seed=2, max_nodes=10, collect_report=True)
+    row, col = strategy.find_best_move(BitBoard(), Player("X"))
+
+    assert strategy.last_report.nodes == 500
+    assert strategy._root.size == 10
+    assert BitBoard().game_board[row][col] == ""
+
+
+def test_clear_tree():
+    strategy = MCTSStrategy(playouts=200, seed=3)
+    strategy.find_best_move(BitBoard(), Player("X"))
+    assert strategy._root is not None
+
+    strategy.clear_tree()
+    assert strategy._root is None
@@ -0,0 +1,46 @@
+"""
+Tests of the time limit of MinimaxStrategy and AlphaBetaStrategy: a
+budget too short to search the replies on a big board must still play an
+evaluated move next to the game, in time.
+"""
+
+# File: test_minimax_strategy.py
+import time
+
+import pytest
+
+from src.alpha_beta_strategy import AlphaBetaStrategy
+from src.bit_board import BitBoard
+from src.minimax_strategy import MinimaxStrategy
+from src.player import Player
+
+# The time a search may take past its limit
+SLACK = 0.05
+
+
+@pytest.mark.parametrize("strategy_class", (MinimaxStrategy, AlphaBetaStrategy))
+@pytest.mark.parametrize("time_limit", (1e-6, 0.05))
+def test_short_budget_on_a_big_board(strategy_class, time_limit):
+    board = BitBoard(15, 5)
+    board.make_move(7, 7, "X")
+    strategy = strategy_class(collect_report=True)
+
+    started = time.perf_counter()
+    row, col = strategy.find_best_move(board, Player("O"), time_limit)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < time_limit + SLACK
+    # Next to the X, not in a corner far from the game
+    assert (row, col) != (7, 7)
+    assert max(abs(row - 7), abs(col - 7)) <= 1
+
+
+@pytest.mark.parametrize("strategy_class", (MinimaxStrategy, AlphaBetaStrategy))
+def test_short_budget_blocks_an_open_line(strategy_class):
+    board = BitBoard(15, 5)
+    for row, col, symbol in ((7, 7, "X"), (0, 0, "O"), (7, 8, "X"), (0, 14, "O"), (7, 9, "X"), (14, 0, "O")):
+        board.make_move(row, col, symbol)
+
+    # X has an open three, even a search that only gets a depth or two must close one of its ends
+    strategy = strategy_class(collect_report=True)
+    assert strategy.find_best_move(board, Player("O"), 0.05) in ((7, 6), (7, 10))
@@ -0,0 +1,66 @@
+"""
+Tests of ParallelMinimaxStrategy: a time limit must hold with more root
+moves than workers, and a cancel must stop the workers too, not just the
+search waiting for them.
+"""
+
+# File: test_parallel_minimax_strategy.py
+import threading
+import time
+
+import pytest
+
+from src.bit_board import BitBoard
+from src.move_strategy import SearchCancelled
+from src.parallel_minimax_strategy import ParallelMinimaxStrategy
+from src.player import Player
+
+# The time a search may take past its limit: the last node, collecting the results
+SLACK = 0.25
+
+
+@pytest.fixture
+def strategy():
+    strategy = ParallelMinimaxStrategy(workers=2)
+    yield strategy
+    strategy.close()
+
+
+def open_7x7() -> BitBoard:
+    # No symmetry left, so every empty cell is a task of its own
+    board = BitBoard(7, 4)
+    for row, col, symbol in ((3, 3, "X"), (0, 1, "O"), (2, 2, "X")):
+        board.make_move(row, col, symbol)
+    return board
+
+
+@pytest.mark.parametrize("time_limit", (0.3, 0.6))
+def test_time_limit_holds_with_more_tasks_than_workers(strategy, time_limit):
+    board = open_7x7()
+    # Starts the pool, its start-up isn't part of the budget being tested
+    strategy.find_best_move(board, Player("O"), 0.1)
+
+    started = time.perf_counter()
+    row, col = strategy.find_best_move(board, Player("O"), time_limit)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < time_limit + SLACK
+    assert board.game_board[row][col] == ""
+
+
+def test_cancel_stops_the_workers(strategy):
+    board = open_7x7()
+    strategy.find_best_move(board, Player("O"), 0.1)
+    processes = list(strategy._pool._pool)
+
+    threading.Timer(0.2, strategy.cancel).start()
+    with pytest.raises(SearchCancelled):
+        strategy.find_best_move(board, Player("O"), 10.0)
+
+    assert strategy._pool is None
+    assert not any(process.is_alive() for process in processes)
+
+    # The next search starts a new pool
+    strategy.reset_cancel()
+    row, col = strategy.find_best_move(board, Player("O"), 0.1)
+    assert board.game_board[row][col] == ""
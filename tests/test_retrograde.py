@@ -0,0 +1,55 @@
+"""
+Tests of the retrograde solver: it must agree with the memoized solver of
+src/tablebase.py on every reachable position, and write tablebase files
+that answer like the ones of src/tablebase.py.
+"""
+
+# File: test_retrograde.py
+import numpy as np
+import pytest
+
+from src.bit_board import BitBoard
+from src.retrograde import MAX_SIZE, solve_retrograde, write_tablebase_arrays
+from src.tablebase import UNREACHABLE, Tablebase, position_index, solve, write_tablebase
+
+
+@pytest.fixture(scope="module")
+def solved_3x3():
+    return solve(3)
+
+
+@pytest.mark.parametrize("size, win_length", ((2, 2), (3, 2), (3, 3)))
+def test_retrograde_matches_solve(size, win_length):
+    records = solve(size, win_length)
+    values, distances, moves = solve_retrograde(size, win_length, with_moves=True)
+
+    expected = np.array(records, dtype=np.int64)
+    reachable = expected[:, 0] != UNREACHABLE
+
+    # The retrograde solver also solves positions no game reaches, the others must match
+    assert np.array_equal(values[reachable], expected[reachable, 0])
+    assert np.array_equal(distances[reachable], expected[reachable, 1])
+    assert np.array_equal(moves[reachable], expected[reachable, 2])
+
+
+def test_retrograde_file_matches_solve_file(tmp_path, solved_3x3):
+    write_tablebase(str(tmp_path / "solve.tb"), solved_3x3, 3, 3)
+    write_tablebase_arrays(str(tmp_path / "retrograde.tb"), 3, 3, *solve_retrograde(3, 3, with_moves=True))
+
+    # The unreachable records differ, so the files are compared position by position
+    solved, retrograde = Tablebase(str(tmp_path / "solve.tb")), Tablebase(str(tmp_path / "retrograde.tb"))
+    try:
+        board = BitBoard()
+        for cell, symbol in ((4, "X"), (0, "O"), (8, "X")):
+            board.make_move(cell // 3, cell % 3, symbol)
+            to_move = "O" if symbol == "X" else "X"
+            index = position_index(board, to_move)
+            assert retrograde.probe(index) == solved.probe(index)
+    finally:
+        solved.close()
+        retrograde.close()
+
+
+def test_rejects_big_boards():
+    with pytest.raises(ValueError):
+        solve_retrograde(MAX_SIZE + 1)
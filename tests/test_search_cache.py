@@ -0,0 +1,104 @@
+"""
+Tests of the search cache (TTSC): entries must survive closing and
+reopening the file, a full bucket must give up the entry with the fewest
+empty cells, and a bound must never replace an exact score.
+"""
+
+# File: test_search_cache.py
+import pytest
+
+from src.alpha_beta_strategy import AlphaBetaStrategy
+from src.bit_board import BitBoard
+from src.player import Player
+from src.search_cache import WAYS, SearchCache
+from src.transposition_table import EXACT, LOWER_BOUND, UPPER_BOUND, TTEntry
+
+
+def key(position_hash: int, symbol: str = "X", is_maximizing_turn: bool = True) -> tuple:
+    return position_hash, symbol, is_maximizing_turn
+
+
+def test_store_and_lookup():
+    cache = SearchCache(None, 1 << 16)
+    cache.store(key(7), -3, 4, "O", UPPER_BOUND, 5)
+
+    assert cache.lookup(key(7)) == TTEntry(-3, 4, "O", UPPER_BOUND)
+    # The symbol and the turn are part of the key
+    assert cache.lookup(key(7, "O")) is None
+    assert cache.lookup(key(7, "X", False)) is None
+    assert (len(cache), cache.hits, cache.misses) == (1, 1, 2)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.lookup(key(7)) is None
+
+
+def test_file_round_trip(tmp_path):
+    path = str(tmp_path / "engine.cache")
+    entries = {key(position_hash * 0x9E3779B1, "XO"[position_hash % 2]): (position_hash % 100 - 50, position_hash % 9)
+               for position_hash in range(200)}
+
+    with SearchCache(path, 1 << 16) as cache:
+        for entry_key, (score, depth) in entries.items():
+            cache.store(entry_key, score, depth, "X", EXACT, 9 - depth)
+        stored = len(cache)
+
+    # Reopened with another size, the file keeps its own
+    with SearchCache(path, 1 << 20) as cache:
+        assert len(cache) == stored == len(entries)
+        for entry_key, (score, depth) in entries.items():
+            assert cache.lookup(entry_key) == TTEntry(score, depth, "X", EXACT)
+
+
+def test_file_is_locked(tmp_path):
+    path = str(tmp_path / "engine.cache")
+    with SearchCache(path, 1 << 16):
+        with pytest.raises(BlockingIOError):
+            SearchCache(path, 1 << 16)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "engine.cache"
+    path.write_bytes(b"TTTI" + bytes(60))
+    with pytest.raises(ValueError):
+        SearchCache(str(path))
+
+
+def test_full_bucket_replaces_the_fewest_empty_cells():
+    # The smallest cache has a single bucket
+    cache = SearchCache(None, 0)
+    for position_hash, remaining in enumerate((7, 2, 9, 5), start=1):
+        cache.store(key(position_hash), 0, 9 - remaining, "", EXACT, remaining)
+    assert len(cache) == WAYS
+
+    cache.store(key(5), 0, 0, "", EXACT, 8)
+
+    assert len(cache) == WAYS
+    assert cache.lookup(key(2)) is None
+    assert all(cache.lookup(key(position_hash)) is not None for position_hash in (1, 3, 4, 5))
+
+
+@pytest.mark.parametrize("bound", (LOWER_BOUND, UPPER_BOUND))
+def test_bound_keeps_an_exact_score(bound):
+    cache = SearchCache(None, 1 << 16)
+    cache.store(key(1), 4, 2, "X", EXACT, 6)
+
+    cache.store(key(1), 9, 1, "", bound, 6)
+    assert cache.lookup(key(1)) == TTEntry(4, 2, "X", EXACT)
+
+    # An exact score, or a bound over a bound, replaces the entry
+    cache.store(key(1), 5, 1, "O", EXACT, 6)
+    assert cache.lookup(key(1)) == TTEntry(5, 1, "O", EXACT)
+    cache.store(key(2), 1, 3, "", LOWER_BOUND, 4)
+    cache.store(key(2), 2, 3, "", UPPER_BOUND, 4)
+    assert cache.lookup(key(2)) == TTEntry(2, 3, "", UPPER_BOUND)
+
+
+def test_small_cache_finds_the_same_moves():
+    # A cache too small for the search must only cost time, never change a move
+    board = BitBoard()
+    board.make_move(0, 0, "X")
+    player = Player("O")
+
+    expected = AlphaBetaStrategy().find_best_move(board, player)
+    assert AlphaBetaStrategy(transposition_table=SearchCache(None, 1024)).find_best_move(board, player) == expected
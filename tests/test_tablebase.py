@@ -0,0 +1,46 @@
+"""
+Tests of the tablebase file (TTTB): the solved 3x3 game must be a draw,
+and a table read back from its file must give the records it was written
+with.
+"""
+
+# File: test_tablebase.py
+import pytest
+
+from src.tablebase import DRAW, Tablebase, solve, write_tablebase
+
+
+@pytest.fixture(scope="module")
+def solved_3x3():
+    return solve(3)
+
+
+def test_empty_3x3_board_is_a_draw(solved_3x3):
+    value, distance, moves = solved_3x3[0]
+    assert value == DRAW
+    assert distance == 9
+    # Every first move draws
+    assert moves == (1 << 9) - 1
+
+
+@pytest.mark.parametrize("with_moves", (True, False))
+def test_file_round_trip(tmp_path, solved_3x3, with_moves):
+    path = tmp_path / "tictactoe.tb"
+    write_tablebase(str(path), solved_3x3, 3, 3, with_moves)
+
+    table = Tablebase(str(path))
+    try:
+        assert (table.size, table.win_length, table.count) == (3, 3, len(solved_3x3))
+        assert table.has_moves == with_moves
+        for index in range(0, len(solved_3x3), 7):
+            value, distance, moves = solved_3x3[index]
+            assert table.probe(index) == (value, distance, moves if with_moves else 0)
+    finally:
+        table.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.tb"
+    path.write_bytes(b"TTTR" + bytes(16))
+    with pytest.raises(ValueError):
+        Tablebase(str(path))